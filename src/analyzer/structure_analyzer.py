@@ -4,14 +4,109 @@
 GPT-4를 활용하여 PDF 구조를 분석하는 클래스
 """
 
+import asyncio
 import logging
 import json
-from typing import Dict, List, Any, Optional
-from openai import OpenAI
+from typing import Dict, List, Any, NamedTuple, Optional
+import numpy as np
+from openai import AsyncOpenAI, OpenAI
 import time
 
 logger = logging.getLogger(__name__)
 
+# 프롬프트에 포함할 요소 설명 템플릿
+ELEMENT_PROMPT_TEMPLATE = (
+    "Element {idx}:\n"
+    "- Type: {type}\n"
+    "- Text: {text}\n"
+    "- Font size: {size}pt\n"
+    "- Font: {font}\n"
+    "- Bold: {bold}\n"
+    "- Position: Page {page}, BBox ({x0:.1f}, {y0:.1f}, {x1:.1f}, {y1:.1f})"
+)
+
+# Fallback 분류 코드별 태그/레벨 (코드 = 튜플 인덱스)
+FALLBACK_TAGS = ("P", "H1", "H2", "H3", "Figure", "Table")
+FALLBACK_LEVELS = (0, 1, 2, 3, 0, 0)
+
+
+def _classify_fallback_tags(
+    sizes: np.ndarray,
+    is_bold: np.ndarray,
+    ys: np.ndarray,
+    is_image: np.ndarray,
+    is_table: np.ndarray
+) -> np.ndarray:
+    """
+    규칙 기반 태그 분류 (벡터 연산)
+    
+    Args:
+        sizes: 폰트 크기 배열
+        is_bold: 굵기 여부 배열
+        ys: 상단 Y 좌표 배열
+        is_image: 이미지 요소 여부 배열
+        is_table: 표 요소 여부 배열
+        
+    Returns:
+        FALLBACK_TAGS 인덱스(int8) 배열
+    """
+    codes = np.zeros(len(sizes), dtype=np.int8)
+    bold_text = is_bold & ~(is_image | is_table)
+    
+    # 약한 규칙부터 적용하고 강한 규칙이 덮어씀
+    codes[bold_text & (sizes >= 14)] = 3
+    codes[bold_text & (sizes >= 16)] = 2
+    
+    # H1은 조건을 만족하는 첫 번째 요소에만 부여 (이후 후보는 H2로 남음)
+    h1_candidates = np.flatnonzero(bold_text & (sizes >= 20) & (ys < 200))
+    if h1_candidates.size:
+        codes[h1_candidates[0]] = 1
+    
+    codes[is_image] = 4
+    codes[is_table] = 5
+    return codes
+
+
+class ElementFeatures(NamedTuple):
+    """
+    구조 분석에 사용하는 요소 속성
+    
+    요소 리스트를 한 번만 순회해 열 단위로 보관합니다.
+    값이 없는 항목은 None으로 두고, 사용하는 쪽에서 기본값을 적용합니다.
+    """
+    types: List[Optional[str]]
+    contents: List[str]
+    fonts: List[str]
+    sizes: List[Optional[float]]
+    is_bold: List[bool]
+    pages: List[int]
+    bboxes: List[List[float]]
+    
+    @classmethod
+    def from_elements(cls, elements: List[Dict[str, Any]]) -> "ElementFeatures":
+        """
+        요소 리스트에서 속성 추출
+        
+        Args:
+            elements: PDFParser에서 추출한 요소 리스트
+            
+        Returns:
+            ElementFeatures
+        """
+        types, contents, fonts, sizes, is_bold, pages, bboxes = [], [], [], [], [], [], []
+        
+        for elem in elements:
+            font_info = elem.get("font_info", {})
+            types.append(elem.get("type"))
+            contents.append(elem.get("content", ""))
+            fonts.append(font_info.get("font", ""))
+            sizes.append(font_info.get("size"))
+            is_bold.append(bool(font_info.get("flags", 0) & 16))  # PyMuPDF bold flag
+            pages.append(elem.get("page", 0))
+            bboxes.append(elem.get("bbox", [0, 0, 0, 0]))
+        
+        return cls(types, contents, fonts, sizes, is_bold, pages, bboxes)
+
 
 class StructureAnalyzer:
     """
@@ -35,10 +130,34 @@ class StructureAnalyzer:
             max_tokens: 최대 토큰 수 (기본: 4000)
         """
         self.client = OpenAI(api_key=api_key)
+        self.api_key = api_key
+        # AsyncOpenAI의 연결 풀은 처음 사용한 이벤트 루프에 묶이므로 루프마다 새로 생성
+        self._aclient: Optional[AsyncOpenAI] = None
+        self._aclient_loop: Optional[asyncio.AbstractEventLoop] = None
         self.model = model
         self.temperature = temperature
         self.max_tokens = max_tokens
     
+    def _get_aclient(self) -> AsyncOpenAI:
+        """
+        현재 이벤트 루프용 AsyncOpenAI 클라이언트 반환
+        
+        asyncio.run으로 실행할 때마다 루프가 바뀌므로, 닫힌 루프에 묶인 연결을
+        재사용하지 않도록 루프가 바뀌면 클라이언트를 새로 만듭니다.
+        """
+        loop = asyncio.get_running_loop()
+        if self._aclient is None or self._aclient_loop is not loop:
+            self._aclient = AsyncOpenAI(api_key=self.api_key)
+            self._aclient_loop = loop
+        return self._aclient
+    
+    async def aclose(self) -> None:
+        """현재 이벤트 루프의 비동기 클라이언트 연결 정리"""
+        if self._aclient is not None and self._aclient_loop is asyncio.get_running_loop():
+            await self._aclient.close()
+        self._aclient = None
+        self._aclient_loop = None
+    
     def analyze_structure(self, elements: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
         PDF 요소들의 구조를 분석
@@ -61,16 +180,17 @@ class StructureAnalyzer:
             }
         """
         logger.info(f"구조 분석 시작: {len(elements)}개 요소")
+        features = ElementFeatures.from_elements(elements)
         
         try:
             # 프롬프트 생성
-            prompt = self._create_analysis_prompt(elements)
+            prompt = self._create_analysis_prompt(elements, features)
             
             # GPT-4 호출
             response = self._call_gpt4(prompt)
             
             # 응답 파싱
-            structure = self._parse_gpt_response(response, elements)
+            structure = self._parse_gpt_response(response, elements, features)
             
             logger.info(f"구조 분석 완료: 문서 유형={structure.get('document_type', 'unknown')}")
             return structure
@@ -78,14 +198,70 @@ class StructureAnalyzer:
         except Exception as e:
             logger.error(f"구조 분석 실패: {e}", exc_info=True)
             # Fallback: 규칙 기반 기본 구조 반환
-            return self._fallback_structure(elements)
+            return self._fallback_structure(elements, features)
+    
+    async def analyze_structure_async(self, elements: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        PDF 요소들의 구조를 비동기로 분석
+        
+        analyze_structure와 같은 결과를 반환하며, AsyncOpenAI 클라이언트를
+        사용하므로 여러 문서의 분석 요청을 동시에 보낼 수 있습니다.
+        
+        Args:
+            elements: PDFParser에서 추출한 요소 리스트
+            
+        Returns:
+            analyze_structure와 동일한 구조 딕셔너리
+        """
+        logger.info(f"구조 분석 시작 (async): {len(elements)}개 요소")
+        features = ElementFeatures.from_elements(elements)
+        
+        try:
+            prompt = self._create_analysis_prompt(elements, features)
+            response = await self._call_gpt4_async(prompt)
+            structure = self._parse_gpt_response(response, elements, features)
+            
+            logger.info(f"구조 분석 완료: 문서 유형={structure.get('document_type', 'unknown')}")
+            return structure
+            
+        except Exception as e:
+            logger.error(f"구조 분석 실패: {e}", exc_info=True)
+            return self._fallback_structure(elements, features)
     
-    def _create_analysis_prompt(self, elements: List[Dict[str, Any]]) -> str:
+    async def analyze_structure_batch(
+        self,
+        element_lists: List[List[Dict[str, Any]]],
+        concurrency: int = 8
+    ) -> List[Dict[str, Any]]:
+        """
+        여러 문서의 구조를 동시에 분석
+        
+        Args:
+            element_lists: 문서별 요소 리스트
+            concurrency: 동시에 진행할 최대 API 요청 수 (기본: 8)
+            
+        Returns:
+            입력 순서와 같은 순서의 구조 딕셔너리 리스트
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        
+        async def _analyze(elements: List[Dict[str, Any]]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.analyze_structure_async(elements)
+        
+        return list(await asyncio.gather(*(_analyze(e) for e in element_lists)))
+    
+    def _create_analysis_prompt(
+        self,
+        elements: List[Dict[str, Any]],
+        features: Optional[ElementFeatures] = None
+    ) -> str:
         """
         GPT-4용 프롬프트 생성
         
         Args:
             elements: PDF 요소 리스트
+            features: 미리 추출한 요소 속성 (없으면 elements에서 추출)
             
         Returns:
             프롬프트 문자열
@@ -124,30 +300,52 @@ JSON 형식으로만 응답하세요:
 }"""
 
         # 사용자 프롬프트: 요소 정보 구성
+        if features is None:
+            features = ElementFeatures.from_elements(elements[:50])
+        
+        template = ELEMENT_PROMPT_TEMPLATE.format
         elements_text = []
-        for idx, elem in enumerate(elements[:50]):  # 최대 50개 요소로 제한
-            elem_type = elem.get("type", "unknown")
-            content = elem.get("content", "")[:200]  # 내용 길이 제한
-            font_info = elem.get("font_info", {})
-            font_size = font_info.get("size", 0)
-            font_name = font_info.get("font", "")
-            flags = font_info.get("flags", 0)
-            is_bold = bool(flags & 16)  # PyMuPDF bold flag
-            bbox = elem.get("bbox", [0, 0, 0, 0])
-            page = elem.get("page", 0)
+        for idx in range(min(len(features.types), 50)):  # 최대 50개 요소로 제한
+            elem_type = features.types[idx]
+            font_size = features.sizes[idx]
+            bbox = features.bboxes[idx]
             
-            elements_text.append(f"""Element {idx}:
-- Type: {elem_type}
-- Text: {content}
-- Font size: {font_size}pt
-- Font: {font_name}
-- Bold: {is_bold}
-- Position: Page {page}, BBox ({bbox[0]:.1f}, {bbox[1]:.1f}, {bbox[2]:.1f}, {bbox[3]:.1f})""")
+            elements_text.append(template(
+                idx=idx,
+                type=elem_type if elem_type is not None else "unknown",
+                text=features.contents[idx][:200],  # 내용 길이 제한
+                size=font_size if font_size is not None else 0,
+                font=features.fonts[idx],
+                bold=features.is_bold[idx],
+                page=features.pages[idx],
+                x0=bbox[0], y0=bbox[1], x1=bbox[2], y1=bbox[3]
+            ))
         
         user_prompt = "다음은 PDF에서 추출한 텍스트 블록입니다:\n\n" + "\n\n".join(elements_text) + "\n\n각 요소에 적절한 태그를 할당하고, 계층 구조를 JSON으로 반환하세요."
         
         return f"{system_prompt}\n\n{user_prompt}"
     
+    def _build_request(self, prompt: str) -> Dict[str, Any]:
+        """
+        Chat Completions 요청 파라미터 생성 (동기/비동기 공통)
+        
+        Args:
+            prompt: 프롬프트
+            
+        Returns:
+            chat.completions.create 인자 딕셔너리
+        """
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": "당신은 문서 구조 분석 전문가입니다. JSON 형식으로만 응답하세요."},
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": self.temperature,
+            "max_tokens": self.max_tokens,
+            "response_format": {"type": "json_object"}
+        }
+    
     def _call_gpt4(self, prompt: str, max_retries: int = 3) -> str:
         """
         GPT-4 API 호출 (재시도 로직 포함)
@@ -161,16 +359,7 @@ JSON 형식으로만 응답하세요:
         """
         for attempt in range(max_retries):
             try:
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {"role": "system", "content": "당신은 문서 구조 분석 전문가입니다. JSON 형식으로만 응답하세요."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=self.temperature,
-                    max_tokens=self.max_tokens,
-                    response_format={"type": "json_object"}
-                )
+                response = self.client.chat.completions.create(**self._build_request(prompt))
                 
                 return response.choices[0].message.content
                 
@@ -183,13 +372,45 @@ JSON 형식으로만 응답하세요:
                     logger.error(f"GPT-4 API 호출 최종 실패: {e}")
                     raise
     
-    def _parse_gpt_response(self, response: str, elements: List[Dict[str, Any]]) -> Dict[str, Any]:
+    async def _call_gpt4_async(self, prompt: str, max_retries: int = 3) -> str:
+        """
+        GPT-4 API 비동기 호출 (재시도 로직 포함)
+        
+        Args:
+            prompt: 프롬프트
+            max_retries: 최대 재시도 횟수
+            
+        Returns:
+            응답 텍스트
+        """
+        for attempt in range(max_retries):
+            try:
+                response = await self._get_aclient().chat.completions.create(**self._build_request(prompt))
+                
+                return response.choices[0].message.content
+                
+            except Exception as e:
+                if attempt < max_retries - 1:
+                    wait_time = (2 ** attempt)  # Exponential backoff
+                    logger.warning(f"GPT-4 API 호출 실패 (시도 {attempt + 1}/{max_retries}): {e}. {wait_time}초 후 재시도...")
+                    await asyncio.sleep(wait_time)
+                else:
+                    logger.error(f"GPT-4 API 호출 최종 실패: {e}")
+                    raise
+    
+    def _parse_gpt_response(
+        self,
+        response: str,
+        elements: List[Dict[str, Any]],
+        features: Optional[ElementFeatures] = None
+    ) -> Dict[str, Any]:
         """
         GPT-4 응답 파싱
         
         Args:
             response: GPT-4 응답 텍스트
             elements: 원본 요소 리스트
+            features: 미리 추출한 요소 속성 (Fallback에 재사용)
             
         Returns:
             구조화된 딕셔너리
@@ -212,59 +433,46 @@ JSON 형식으로만 응답하세요:
             
         except json.JSONDecodeError as e:
             logger.warning(f"GPT-4 응답 JSON 파싱 실패: {e}. Fallback 구조 사용")
-            return self._fallback_structure(elements)
+            return self._fallback_structure(elements, features)
     
-    def _fallback_structure(self, elements: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _fallback_structure(
+        self,
+        elements: List[Dict[str, Any]],
+        features: Optional[ElementFeatures] = None
+    ) -> Dict[str, Any]:
         """
         규칙 기반 Fallback 구조 생성
         
         Args:
             elements: PDF 요소 리스트
+            features: 미리 추출한 요소 속성 (없으면 elements에서 추출)
             
         Returns:
             기본 구조 딕셔너리
         """
+        if features is None:
+            features = ElementFeatures.from_elements(elements)
+        
+        count = len(features.types)
+        
+        # 규칙 판단에 필요한 값을 배열로 변환
+        sizes = np.fromiter((11 if size is None else size for size in features.sizes), dtype=np.float64, count=count)
+        ys = np.fromiter((b[1] if len(b) > 1 else 0 for b in features.bboxes), dtype=np.float64, count=count)
+        is_bold = np.fromiter(features.is_bold, dtype=bool, count=count)
+        is_image = np.fromiter((t == "image" for t in features.types), dtype=bool, count=count)
+        is_table = np.fromiter((t == "table" for t in features.types), dtype=bool, count=count)
+        
+        codes = _classify_fallback_tags(sizes, is_bold, ys, is_image, is_table)
+        
         hierarchy = {}
         reading_order = []
         
-        h1_found = False
-        
-        for idx, elem in enumerate(elements):
+        for idx, code in enumerate(codes.tolist()):
             elem_id = f"element_{idx}"
             reading_order.append(elem_id)
-            
-            elem_type = elem.get("type", "text")
-            font_info = elem.get("font_info", {})
-            font_size = font_info.get("size", 11)
-            flags = font_info.get("flags", 0)
-            is_bold = bool(flags & 16)
-            bbox = elem.get("bbox", [0, 0, 0, 0])
-            y_pos = bbox[1] if len(bbox) > 1 else 0
-            
-            # 태그 결정 (규칙 기반)
-            if elem_type == "image":
-                tag = "Figure"
-                level = 0
-            elif elem_type == "table":
-                tag = "Table"
-                level = 0
-            elif not h1_found and font_size >= 20 and is_bold and y_pos < 200:
-                tag = "H1"
-                level = 1
-                h1_found = True
-            elif font_size >= 16 and is_bold:
-                tag = "H2"
-                level = 2
-            elif font_size >= 14 and is_bold:
-                tag = "H3"
-                level = 3
-            else:
-                tag = "P"
-                level = 0
-            
             hierarchy[elem_id] = {
-                "tag": tag,
-                "level": level,
+                "tag": FALLBACK_TAGS[code],
+                "level": FALLBACK_LEVELS[code],
                 "parent": None,
                 "children": []
             }
@@ -11,6 +11,8 @@ from pypdf import PdfReader, PdfWriter
 from pypdf.generic import DictionaryObject, ArrayObject, NameObject, NumberObject, TextStringObject, BooleanObject
 from pypdf.constants import CatalogAttributes
 
+from src.parser.content_extractor import ContentExtractor
+
 logger = logging.getLogger(__name__)
 
 
@@ -49,13 +51,10 @@ class TaggedPDFGenerator:
         logger.info(f"태그된 PDF 생성 시작: {original_pdf}")
         
         try:
-            # 원본 PDF 읽기
-            reader = PdfReader(original_pdf)
-            writer = PdfWriter()
-            
-            # 모든 페이지 복사
-            for page in reader.pages:
-                writer.add_page(page)
+            # 원본 PDF 읽기 후 문서 전체를 한 번에 복제
+            # (페이지별 add_page 대신 카탈로그/아웃라인/폼 필드까지 일괄 복사)
+            reader = PdfReader(original_pdf, strict=False)
+            writer = PdfWriter(clone_from=reader)
             
             # 메타데이터 설정
             self._set_metadata(writer, metadata)
@@ -218,14 +217,7 @@ class TaggedPDFGenerator:
         Returns:
             재정렬된 요소 리스트
         """
-        def sort_key(element: Dict[str, Any]) -> tuple:
-            bbox = element.get("bbox", [0, 0, 0, 0])
-            page = element.get("page", 0)
-            y = bbox[1] if len(bbox) > 1 else 0
-            x = bbox[0] if len(bbox) > 0 else 0
-            return (page, y, x)
-        
-        sorted_elements = sorted(tagged_elements, key=sort_key)
+        sorted_elements = ContentExtractor.sort_by_position(tagged_elements)
         
         for idx, element in enumerate(sorted_elements):
             element["reading_order"] = idx
@@ -4,11 +4,14 @@ AI-Powered PDF Auto-Tagging System
 메인 파이프라인
 """
 
+import asyncio
 import logging
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, Optional
+from statistics import fmean
+from typing import Dict, Any, List, Optional, Tuple
 
 # Click을 사용한 CLI (선택적)
 try:
@@ -31,6 +34,19 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def _parse_pdf(pdf_path: str) -> Dict[str, Any]:
+    """
+    배치 처리용 워커 함수: PDF 하나를 순차 파싱
+    
+    파일 단위로 이미 병렬화되므로 워커 내부에서는 페이지 병렬 파싱을 쓰지 않습니다.
+    """
+    parser = PDFParser(pdf_path)
+    try:
+        return parser.parse(workers=1)
+    finally:
+        parser.close()
+
+
 class PDFAutoTagger:
     """PDF 자동 태깅 파이프라인"""
     
@@ -45,6 +61,7 @@ class PDFAutoTagger:
             config: 설정 딕셔너리
         """
         self.config = config or {}
+        self.api_key = openai_api_key
         
         # 컴포넌트 초기화
         self.analyzer = StructureAnalyzer(
@@ -60,10 +77,53 @@ class PDFAutoTagger:
         self,
         input_pdf: str,
         output_pdf: str
+    ) -> Dict[str, Any]:
+        """
+        PDF 자동 태깅 전체 프로세스 (process_async의 동기 래퍼)
+        
+        호출할 때마다 새 이벤트 루프에서 process_async를 실행합니다.
+        
+        Args:
+            input_pdf: 입력 PDF 파일 경로
+            output_pdf: 출력 PDF 파일 경로
+            
+        Returns:
+            처리 결과 딕셔너리
+            
+        Raises:
+            RuntimeError: 이미 실행 중인 이벤트 루프(Jupyter 노트북, 비동기 서버 등)에서
+                호출한 경우. 이때는 await process_async(...)를 사용하세요.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            raise RuntimeError(
+                "실행 중인 이벤트 루프에서는 process()를 호출할 수 없습니다. "
+                "대신 await process_async(input_pdf, output_pdf)를 사용하세요."
+            )
+        
+        async def _run() -> Dict[str, Any]:
+            try:
+                return await self.process_async(input_pdf, output_pdf)
+            finally:
+                # 이 루프는 곧 닫히므로 구조 분석 클라이언트 연결도 함께 정리
+                await self.analyzer.aclose()
+        
+        return asyncio.run(_run())
+    
+    async def process_async(
+        self,
+        input_pdf: str,
+        output_pdf: str
     ) -> Dict[str, Any]:
         """
         PDF 자동 태깅 전체 프로세스
         
+        네트워크 대기가 긴 AI 구조 분석 요청을 보내 둔 채로, 구조와 무관한
+        이미지 Alt 텍스트 생성을 동시에 진행합니다.
+        
         Args:
             input_pdf: 입력 PDF 파일 경로
             output_pdf: 출력 PDF 파일 경로
@@ -78,71 +138,27 @@ class PDFAutoTagger:
             # 1. PDF 파싱
             logger.info("1/5 PDF 파싱 중...")
             parser = PDFParser(input_pdf)
-            parsed_data = parser.parse()
+            parsed_data = await asyncio.to_thread(
+                parser.parse,
+                workers=self.config.get("parser", {}).get("workers", 1)
+            )
             logger.info(f"   페이지: {parsed_data['pages']}개")
             logger.info(f"   요소: {len(parsed_data['elements'])}개")
             
-            # 2. 구조 분석
+            # 2. 구조 분석 (3단계의 Alt 텍스트 생성과 동시 진행)
             logger.info("2/5 AI 구조 분석 중...")
-            structure = self.analyzer.analyze_structure(parsed_data['elements'])
-            logger.info(f"   문서 유형: {structure.get('document_type', 'unknown')}")
-            
-            # 3. 태그 매칭
-            logger.info("3/5 XML 태그 매칭 중...")
-            tagged_result = self.tagger.match_tags(
-                parsed_data['elements'],
-                structure,
-                api_key=openai_api_key,
-                pdf_path=input_pdf,
-                metadata=parsed_data.get("metadata", {})
-            )
-            
-            # 신뢰도 통계
-            confidences = [
-                e.get('confidence', 0.5)
-                for e in tagged_result['tagged_elements']
-            ]
-            if confidences:
-                avg_confidence = sum(confidences) / len(confidences)
-            else:
-                avg_confidence = 0.5
-            logger.info(f"   평균 신뢰도: {avg_confidence:.2%}")
-            
-            # 4. PDF 재생성
-            logger.info("4/5 태그된 PDF 생성 중...")
-            generator = TaggedPDFGenerator(output_pdf)
-            output_path = generator.generate(
-                input_pdf,
-                tagged_result['tagged_elements'],
-                tagged_result['metadata']
-            )
-            logger.info(f"   출력: {output_path}")
-            
-            # 5. 검증
-            logger.info("5/5 접근성 검증 중...")
-            validation_result = self.validator.validate(output_path)
-            
-            if validation_result['passed']:
-                logger.info("   ✅ 모든 검증 통과")
-            else:
-                logger.warning(
-                    f"   ⚠️ 경고 {len(validation_result['warnings'])}개, "
-                    f"문제 {len(validation_result['issues'])}개"
+            structure, alt_texts = await asyncio.gather(
+                self.analyzer.analyze_structure_async(parsed_data['elements']),
+                self.tagger.generate_alt_texts_async(
+                    parsed_data['elements'],
+                    api_key=self.api_key,
+                    pdf_path=input_pdf,
+                    metadata=parsed_data.get("metadata", {})
                 )
+            )
+            logger.info(f"   문서 유형: {structure.get('document_type', 'unknown')}")
             
-            # 결과 정리
-            result = {
-                "status": "success",
-                "input_file": input_pdf,
-                "output_file": output_path,
-                "pages": parsed_data['pages'],
-                "elements_processed": len(parsed_data['elements']),
-                "average_confidence": avg_confidence,
-                "validation": validation_result
-            }
-            
-            logger.info("✨ 처리 완료!")
-            return result
+            return self._finish(input_pdf, output_pdf, parsed_data, structure, alt_texts)
             
         except Exception as e:
             logger.error(f"❌ 오류 발생: {str(e)}", exc_info=True)
@@ -153,6 +169,160 @@ class PDFAutoTagger:
         finally:
             if parser:
                 parser.close()
+    
+    async def process_batch(
+        self,
+        jobs: List[Tuple[str, str]],
+        concurrency: int = 8
+    ) -> List[Dict[str, Any]]:
+        """
+        여러 PDF를 한 번에 태깅
+        
+        모든 PDF를 프로세스 풀에서 파싱한 뒤, 구조 분석 요청을 동시에 보내
+        문서별 API 지연이 누적되지 않도록 합니다.
+        
+        Args:
+            jobs: (입력 PDF 경로, 출력 PDF 경로) 튜플 리스트
+            concurrency: 동시에 진행할 최대 구조 분석 요청 수 (기본: 8)
+            
+        Returns:
+            입력 순서와 같은 순서의 처리 결과 딕셔너리 리스트
+        """
+        if not jobs:
+            return []
+        
+        logger.info(f"배치 처리 시작: {len(jobs)}개 파일")
+        loop = asyncio.get_running_loop()
+        
+        # 1. PDF 파싱 (파일 단위 프로세스 병렬)
+        logger.info("1/5 PDF 파싱 중...")
+        # parser.workers는 문서 내 페이지 병렬 설정이므로 파일 단위 풀 크기와는 무관
+        with ProcessPoolExecutor(max_workers=min(len(jobs), os.cpu_count() or 1)) as executor:
+            parsed_list = await asyncio.gather(
+                *(loop.run_in_executor(executor, _parse_pdf, input_pdf) for input_pdf, _ in jobs),
+                return_exceptions=True
+            )
+        
+        results: List[Optional[Dict[str, Any]]] = [None] * len(jobs)
+        pending = []
+        for i, parsed_data in enumerate(parsed_list):
+            if isinstance(parsed_data, BaseException):
+                logger.error(f"❌ 파싱 실패: {jobs[i][0]}: {parsed_data}")
+                results[i] = {"status": "error", "error": str(parsed_data)}
+            else:
+                pending.append(i)
+        
+        # 2. 구조 분석 (모든 문서를 동시에, Alt 텍스트 생성과 병행)
+        logger.info("2/5 AI 구조 분석 중...")
+        structures, *alt_text_list = await asyncio.gather(
+            self.analyzer.analyze_structure_batch(
+                [parsed_list[i]['elements'] for i in pending],
+                concurrency=concurrency
+            ),
+            *(
+                self.tagger.generate_alt_texts_async(
+                    parsed_list[i]['elements'],
+                    api_key=self.api_key,
+                    pdf_path=jobs[i][0],
+                    metadata=parsed_list[i].get("metadata", {})
+                )
+                for i in pending
+            )
+        )
+        
+        # 3~5. 태그 매칭, PDF 생성, 검증 (문서별)
+        for i, structure, alt_texts in zip(pending, structures, alt_text_list):
+            input_pdf, output_pdf = jobs[i]
+            try:
+                results[i] = await asyncio.to_thread(
+                    self._finish, input_pdf, output_pdf,
+                    parsed_list[i], structure, alt_texts
+                )
+            except Exception as e:
+                logger.error(f"❌ 오류 발생: {input_pdf}: {str(e)}", exc_info=True)
+                results[i] = {"status": "error", "error": str(e)}
+        
+        succeeded = sum(1 for r in results if r["status"] == "success")
+        logger.info(f"✨ 배치 처리 완료: {succeeded}/{len(jobs)}개 성공")
+        return results
+    
+    def _finish(
+        self,
+        input_pdf: str,
+        output_pdf: str,
+        parsed_data: Dict[str, Any],
+        structure: Dict[str, Any],
+        alt_texts: Dict[str, str]
+    ) -> Dict[str, Any]:
+        """
+        구조 분석 이후 단계 (태그 매칭, PDF 생성, 검증)
+        
+        Args:
+            input_pdf: 입력 PDF 파일 경로
+            output_pdf: 출력 PDF 파일 경로
+            parsed_data: PDFParser.parse 결과
+            structure: 구조 분석 결과
+            alt_texts: 요소 ID별 Alt 텍스트
+            
+        Returns:
+            처리 결과 딕셔너리
+        """
+        # 3. 태그 매칭
+        logger.info("3/5 XML 태그 매칭 중...")
+        tagged_result = self.tagger.match_tags(
+            parsed_data['elements'],
+            structure,
+            api_key=self.api_key,
+            pdf_path=input_pdf,
+            metadata=parsed_data.get("metadata", {}),
+            alt_texts=alt_texts
+        )
+        
+        # 신뢰도 통계
+        if tagged_result['tagged_elements']:
+            avg_confidence = fmean(
+                e.get('confidence', 0.5)
+                for e in tagged_result['tagged_elements']
+            )
+        else:
+            avg_confidence = 0.5
+        logger.info(f"   평균 신뢰도: {avg_confidence:.2%}")
+        
+        # 4. PDF 재생성
+        logger.info("4/5 태그된 PDF 생성 중...")
+        generator = TaggedPDFGenerator(output_pdf)
+        output_path = generator.generate(
+            input_pdf,
+            tagged_result['tagged_elements'],
+            tagged_result['metadata']
+        )
+        logger.info(f"   출력: {output_path}")
+        
+        # 5. 검증
+        logger.info("5/5 접근성 검증 중...")
+        validation_result = self.validator.validate(output_path)
+        
+        if validation_result['passed']:
+            logger.info("   ✅ 모든 검증 통과")
+        else:
+            logger.warning(
+                f"   ⚠️ 경고 {len(validation_result['warnings'])}개, "
+                f"문제 {len(validation_result['issues'])}개"
+            )
+        
+        # 결과 정리
+        result = {
+            "status": "success",
+            "input_file": input_pdf,
+            "output_file": output_path,
+            "pages": parsed_data['pages'],
+            "elements_processed": len(parsed_data['elements']),
+            "average_confidence": avg_confidence,
+            "validation": validation_result
+        }
+        
+        logger.info("✨ 처리 완료!")
+        return result
 
 
 def simple_main():
@@ -217,8 +387,10 @@ if HAS_CLICK:
         if config:
             try:
                 import yaml
+                # libyaml C 확장이 있으면 사용 (순수 Python SafeLoader보다 빠름)
+                loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
                 with open(config, 'r', encoding='utf-8') as f:
-                    config_dict = yaml.safe_load(f) or {}
+                    config_dict = yaml.load(f, Loader=loader) or {}
             except Exception as e:
                 logger.warning(f"설정 파일 로드 실패: {e}")
         
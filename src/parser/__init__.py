@@ -1,6 +1,7 @@
 """PDF 파싱 모듈"""
 
 from .pdf_parser import PDFParser
-from .content_extractor import ContentExtractor
+from .content_extractor import ContentExtractor, ElementIndex
+from .element_table import ElementTable
 
-__all__ = ["PDFParser", "ContentExtractor"]
+__all__ = ["PDFParser", "ContentExtractor", "ElementIndex", "ElementTable"]
@@ -4,41 +4,90 @@
 PDF에서 추출한 콘텐츠를 가공하는 유틸리티 함수들
 """
 
-from typing import List, Dict, Any
+from collections import defaultdict
+from typing import List, Dict, Any, NamedTuple, Optional
 import logging
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 
+class ElementIndex(NamedTuple):
+    """타입별/페이지별 요소 인덱스 (ContentExtractor.build_index 결과)"""
+    by_type: Dict[str, List[Dict[str, Any]]]
+    by_page: Dict[int, List[Dict[str, Any]]]
+
+
 class ContentExtractor:
     """콘텐츠 추출 및 가공 유틸리티 클래스"""
     
+    # 이 개수 이상이면 numpy lexsort로 정렬 (작은 입력은 sorted가 더 빠름)
+    NUMPY_SORT_THRESHOLD = 512
+    
+    @staticmethod
+    def build_index(elements: List[Dict[str, Any]]) -> ElementIndex:
+        """
+        요소 리스트를 한 번 순회하여 타입별/페이지별 인덱스 생성
+        
+        같은 요소 리스트를 여러 번 필터링할 때 filter_by_type/filter_by_page에
+        전달하면 매번 전체를 다시 훑지 않습니다.
+        
+        Args:
+            elements: 요소 리스트
+            
+        Returns:
+            ElementIndex (각 리스트는 원래 순서 유지)
+        """
+        by_type = defaultdict(list)
+        by_page = defaultdict(list)
+        
+        for elem in elements:
+            by_type[elem.get("type")].append(elem)
+            by_page[elem.get("page")].append(elem)
+        
+        return ElementIndex(by_type=dict(by_type), by_page=dict(by_page))
+    
     @staticmethod
-    def filter_by_type(elements: List[Dict[str, Any]], element_type: str) -> List[Dict[str, Any]]:
+    def filter_by_type(
+        elements: List[Dict[str, Any]],
+        element_type: str,
+        index: Optional[ElementIndex] = None
+    ) -> List[Dict[str, Any]]:
         """
         요소 리스트에서 특정 타입만 필터링
         
         Args:
             elements: 요소 리스트
             element_type: 필터링할 타입 ("text", "image", "table")
+            index: build_index로 만든 인덱스 (있으면 elements 대신 사용)
             
         Returns:
             필터링된 요소 리스트
         """
+        if index is not None:
+            return list(index.by_type.get(element_type, []))
         return [elem for elem in elements if elem.get("type") == element_type]
     
     @staticmethod
-    def filter_by_page(elements: List[Dict[str, Any]], page_num: int) -> List[Dict[str, Any]]:
+    def filter_by_page(
+        elements: List[Dict[str, Any]],
+        page_num: int,
+        index: Optional[ElementIndex] = None
+    ) -> List[Dict[str, Any]]:
         """
         요소 리스트에서 특정 페이지의 요소만 필터링
         
         Args:
             elements: 요소 리스트
             page_num: 페이지 번호
+            index: build_index로 만든 인덱스 (있으면 elements 대신 사용)
             
         Returns:
             필터링된 요소 리스트
         """
+        if index is not None:
+            return list(index.by_page.get(page_num, []))
         return [elem for elem in elements if elem.get("page") == page_num]
     
     @staticmethod
@@ -59,4 +108,15 @@ class ContentExtractor:
             x = bbox[0] if len(bbox) > 0 else 0  # X 좌표 (좌측)
             return (page, y, x)  # 페이지, Y, X 순으로 정렬
         
-        return sorted(elements, key=sort_key)
+        count = len(elements)
+        if count < ContentExtractor.NUMPY_SORT_THRESHOLD:
+            return sorted(elements, key=sort_key)
+        
+        # 페이지, Y, X 열을 한 번만 추출한 뒤 안정 정렬 (lexsort는 마지막 키가 1순위)
+        bboxes = [elem.get("bbox", [0, 0, 0, 0]) for elem in elements]
+        pages = np.fromiter((elem.get("page", 0) for elem in elements), dtype=np.int64, count=count)
+        ys = np.fromiter((bbox[1] if len(bbox) > 1 else 0 for bbox in bboxes), dtype=np.float64, count=count)
+        xs = np.fromiter((bbox[0] if len(bbox) > 0 else 0 for bbox in bboxes), dtype=np.float64, count=count)
+        order = np.lexsort((xs, ys, pages))
+        
+        return [elements[i] for i in order]
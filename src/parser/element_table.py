@@ -0,0 +1,161 @@
+"""
+요소 테이블 모듈
+
+PDF 요소 리스트(List[Dict])를 열 지향(SoA) 배열로 보관하는 컨테이너
+"""
+
+from typing import List, Dict, Any, Optional, Sequence, Union
+
+import numpy as np
+
+# 열로 분리해 보관하는 키 (나머지 키는 요소별 extras에 보관)
+COLUMN_KEYS = ("page", "type", "bbox", "content", "font_info")
+
+
+class ElementTable:
+    """
+    PDF 요소의 열 지향 표현
+    
+    페이지/bbox는 numpy 배열로, 타입/내용/폰트 정보는 리스트로 나란히 보관하여
+    필터링, 정렬, bbox 집계를 벡터 연산으로 처리합니다.
+    기존 dict 기반 코드와는 from_elements / to_dicts로 변환합니다.
+    """
+    
+    def __init__(
+        self,
+        pages: np.ndarray,
+        bboxes: np.ndarray,
+        types: np.ndarray,
+        contents: List[str],
+        font_infos: List[Dict[str, Any]],
+        extras: List[Dict[str, Any]]
+    ):
+        """
+        Args:
+            pages: 페이지 번호 배열 (int32, [N])
+            bboxes: bbox 배열 (float64, [N, 4])
+            types: 요소 타입 배열 ([N])
+            contents: 요소 내용 리스트
+            font_infos: 폰트 정보 리스트
+            extras: 그 밖의 요소별 속성 (표 data/rows/cols, 이미지 xref 등)
+        """
+        self.pages = pages
+        self.bboxes = bboxes
+        self.types = types
+        self.contents = contents
+        self.font_infos = font_infos
+        self.extras = extras
+    
+    @classmethod
+    def from_elements(cls, elements: List[Dict[str, Any]]) -> "ElementTable":
+        """
+        요소 리스트로부터 테이블 생성
+        
+        Args:
+            elements: PDFParser.parse의 elements
+            
+        Returns:
+            ElementTable
+        """
+        count = len(elements)
+        pages = np.fromiter((elem.get("page", 0) for elem in elements), dtype=np.int32, count=count)
+        bboxes = np.zeros((count, 4), dtype=np.float64)
+        types = []
+        contents = []
+        font_infos = []
+        extras = []
+        
+        for i, elem in enumerate(elements):
+            bbox = elem.get("bbox")
+            if bbox is not None and len(bbox) == 4:
+                bboxes[i] = bbox
+            types.append(elem.get("type", ""))
+            contents.append(elem.get("content", ""))
+            font_infos.append(elem.get("font_info", {}))
+            extras.append({k: v for k, v in elem.items() if k not in COLUMN_KEYS})
+        
+        return cls(pages, bboxes, np.array(types, dtype=object), contents, font_infos, extras)
+    
+    def __len__(self) -> int:
+        return len(self.pages)
+    
+    def subset(self, selector: Union[np.ndarray, Sequence[int]]) -> "ElementTable":
+        """
+        선택한 행만 담은 새 테이블 반환
+        
+        Args:
+            selector: 불리언 마스크 또는 행 인덱스 배열 (인덱스 순서대로 재배열)
+            
+        Returns:
+            ElementTable
+        """
+        indices = np.asarray(selector)
+        if indices.dtype == bool:
+            indices = np.flatnonzero(indices)
+        
+        return ElementTable(
+            self.pages[indices],
+            self.bboxes[indices],
+            self.types[indices],
+            [self.contents[i] for i in indices],
+            [self.font_infos[i] for i in indices],
+            [self.extras[i] for i in indices]
+        )
+    
+    def filter_by_type(self, element_type: str) -> "ElementTable":
+        """특정 타입의 요소만 필터링"""
+        return self.subset(self.types == element_type)
+    
+    def filter_by_page(self, page_num: int) -> "ElementTable":
+        """특정 페이지의 요소만 필터링"""
+        return self.subset(self.pages == page_num)
+    
+    def sort_by_position(self) -> "ElementTable":
+        """
+        위치 순서로 정렬 (페이지 → Y → X, 같은 위치는 원래 순서 유지)
+            
+        Returns:
+            정렬된 ElementTable
+        """
+        # lexsort는 마지막 키가 1순위
+        return self.subset(np.lexsort((self.bboxes[:, 0], self.bboxes[:, 1], self.pages)))
+    
+    def bounds(self, page_num: Optional[int] = None) -> List[float]:
+        """
+        요소 전체(또는 한 페이지)를 감싸는 bbox
+        
+        Args:
+            page_num: 페이지 번호 (None이면 전체)
+            
+        Returns:
+            [x0, y0, x1, y1] (요소가 없으면 [0, 0, 0, 0])
+        """
+        bboxes = self.bboxes if page_num is None else self.bboxes[self.pages == page_num]
+        if not len(bboxes):
+            return [0.0, 0.0, 0.0, 0.0]
+        
+        x0, y0 = bboxes[:, :2].min(axis=0)
+        x1, y1 = bboxes[:, 2:].max(axis=0)
+        return [float(x0), float(y0), float(x1), float(y1)]
+    
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """
+        기존 코드와 호환되는 요소 리스트로 변환
+            
+        Returns:
+            요소 딕셔너리 리스트
+        """
+        pages = self.pages.tolist()
+        bboxes = self.bboxes.tolist()
+        
+        return [
+            {
+                "page": pages[i],
+                "type": self.types[i],
+                "bbox": bboxes[i],
+                "content": self.contents[i],
+                **self.extras[i],
+                "font_info": self.font_infos[i]
+            }
+            for i in range(len(pages))
+        ]
@@ -5,13 +5,28 @@ PDF 파일을 파싱하고 구조 정보를 추출하는 클래스
 """
 
 import logging
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Iterable, Optional, Tuple
 import fitz  # PyMuPDF
 import pdfplumber
 
 logger = logging.getLogger(__name__)
 
+# 병렬 파싱을 사용하는 최소 페이지 수 (이보다 작으면 순차 처리)
+# 프로세스 시작 비용(Windows spawn에서 특히 큼)이 페이지 파싱 비용보다 크므로
+# workers를 지정해도 수백 페이지 이상 문서에서만 병렬 처리
+PARALLEL_MIN_PAGES = 200
+
+# get_text("dict") 결과를 캐시할 최대 페이지 수 (LRU)
+TEXT_CACHE_PAGES = 32
+
+# get_text("dict") 플래그: 이미지 블록은 어차피 버리므로 디코딩하지 않음
+TEXT_FLAGS = fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES
+
 
 class PDFError(Exception):
     """PDF 처리 관련 오류"""
@@ -50,6 +65,8 @@ class PDFParser:
             raise ValueError(f"PDF 파일이 아닙니다: {pdf_path}")
         
         self.doc: Optional[fitz.Document] = None
+        self._plumber: Optional[pdfplumber.PDF] = None  # 표 추출 시 지연 생성
+        self._page_text_cache: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
         self._open_pdf()
     
     def _open_pdf(self) -> None:
@@ -81,6 +98,12 @@ class PDFParser:
     
     def close(self) -> None:
         """PDF 문서 닫기"""
+        if self._plumber:
+            self._plumber.close()
+            self._plumber = None
+        
+        self._page_text_cache.clear()
+        
         if self.doc:
             self.doc.close()
             self.doc = None
@@ -97,10 +120,14 @@ class PDFParser:
             raise PDFError("PDF가 열려있지 않습니다")
         return len(self.doc)
     
-    def parse(self) -> Dict[str, Any]:
+    def parse(self, workers: Optional[int] = 1) -> Dict[str, Any]:
         """
         PDF를 파싱하여 구조화된 정보 반환
         
+        Args:
+            workers: 페이지 병렬 파싱에 사용할 프로세스 수
+                (기본 1: 순차 처리, None: CPU 코어 수)
+        
         Returns:
             {
                 "pages": int,
@@ -122,26 +149,20 @@ class PDFParser:
         
         logger.info(f"PDF 파싱 시작: {self.pdf_path}")
         
-        elements = []
         metadata = self._extract_metadata()
+        page_count = len(self.doc)
         
-        for page_num in range(len(self.doc)):
-            logger.debug(f"페이지 {page_num + 1}/{len(self.doc)} 처리 중...")
-            
-            # 텍스트 블록 추출
-            text_blocks = self.extract_text_blocks(page_num)
-            elements.extend(text_blocks)
-            
-            # 이미지 추출
-            images = self.extract_images(page_num)
-            elements.extend(images)
-            
-            # 표 추출 (pdfplumber 사용)
-            tables = self.extract_tables(page_num)
-            elements.extend(tables)
+        if workers is None:
+            workers = os.cpu_count() or 1
+        workers = min(workers, page_count)
+        
+        if workers > 1 and page_count >= PARALLEL_MIN_PAGES:
+            elements = self._parse_parallel(page_count, workers)
+        else:
+            elements = self._parse_pages(range(page_count))
         
         result = {
-            "pages": len(self.doc),
+            "pages": page_count,
             "metadata": metadata,
             "elements": elements
         }
@@ -149,6 +170,74 @@ class PDFParser:
         logger.info(f"파싱 완료: {len(elements)}개 요소 추출")
         return result
     
+    def _parse_page(self, page_num: int) -> List[Dict[str, Any]]:
+        """
+        한 페이지의 모든 요소 추출 (텍스트 → 이미지 → 표 순서)
+        
+        Args:
+            page_num: 페이지 번호 (0부터 시작)
+            
+        Returns:
+            요소 리스트
+        """
+        logger.debug(f"페이지 {page_num + 1}/{len(self.doc)} 처리 중...")
+        
+        elements = []
+        
+        # 텍스트 블록 추출
+        elements.extend(self.extract_text_blocks(page_num))
+        
+        # 이미지 추출
+        elements.extend(self.extract_images(page_num))
+        
+        # 표 추출 (pdfplumber 사용)
+        elements.extend(self.extract_tables(page_num))
+        
+        return elements
+    
+    def _parse_pages(self, page_nums: Iterable[int]) -> List[Dict[str, Any]]:
+        """
+        여러 페이지를 순차적으로 파싱
+        
+        Args:
+            page_nums: 페이지 번호들
+            
+        Returns:
+            페이지 순서대로 이어 붙인 요소 리스트
+        """
+        elements = []
+        for page_num in page_nums:
+            elements.extend(self._parse_page(page_num))
+        return elements
+    
+    def _parse_parallel(self, page_count: int, workers: int) -> List[Dict[str, Any]]:
+        """
+        페이지 범위를 프로세스 풀에 나누어 파싱
+        
+        fitz.Document는 pickle할 수 없으므로 각 워커가 문서를 직접 엽니다.
+        워커 부하를 고르게 하기 위해 워커 수의 약 4배로 범위를 나눕니다.
+        
+        Args:
+            page_count: 전체 페이지 수
+            workers: 프로세스 수
+            
+        Returns:
+            페이지 순서대로 이어 붙인 요소 리스트
+        """
+        chunk = max(1, page_count // (4 * workers))
+        starts = list(range(0, page_count, chunk))
+        stops = [min(start + chunk, page_count) for start in starts]
+        
+        logger.debug(f"병렬 파싱: 프로세스 {workers}개, 범위 {len(starts)}개")
+        
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = executor.map(_parse_page_range, repeat(str(self.pdf_path)), starts, stops)
+                return [elem for page_elements in results for elem in page_elements]
+        except Exception as e:
+            logger.warning(f"병렬 파싱 실패, 순차 파싱으로 전환: {e}")
+            return self._parse_pages(range(page_count))
+    
     def _extract_metadata(self) -> Dict[str, Any]:
         """
         PDF 메타데이터 추출
@@ -171,6 +260,29 @@ class PDFParser:
             "pages": len(self.doc)
         }
     
+    def get_text_dict(self, page_num: int) -> Dict[str, Any]:
+        """
+        페이지의 get_text("dict") 결과 반환 (최근 페이지 LRU 캐시)
+        
+        get_text("dict")는 호출할 때마다 레이아웃 분석을 다시 수행하므로,
+        같은 페이지의 텍스트/폰트 정보가 여러 번 필요할 때 결과를 재사용합니다.
+        
+        Args:
+            page_num: 페이지 번호 (0부터 시작)
+            
+        Returns:
+            PyMuPDF 텍스트 딕셔너리
+        """
+        text_dict = self._page_text_cache.get(page_num)
+        if text_dict is None:
+            text_dict = self.doc[page_num].get_text("dict", flags=TEXT_FLAGS)
+            self._page_text_cache[page_num] = text_dict
+            if len(self._page_text_cache) > TEXT_CACHE_PAGES:
+                self._page_text_cache.popitem(last=False)
+        else:
+            self._page_text_cache.move_to_end(page_num)
+        return text_dict
+    
     def extract_text_blocks(self, page_num: int) -> List[Dict[str, Any]]:
         """
         페이지에서 텍스트 블록 추출
@@ -198,60 +310,58 @@ class PDFParser:
         if not self.doc or page_num >= len(self.doc):
             return []
         
-        page = self.doc[page_num]
         blocks = []
         
         try:
             # get_text("dict")를 사용하여 구조화된 텍스트 추출
-            text_dict = page.get_text("dict")
+            text_dict = self.get_text_dict(page_num)
             
             for block in text_dict.get("blocks", []):
                 if "lines" not in block:  # 이미지 블록 건너뛰기
                     continue
                 
                 block_text = []
-                font_infos = []
-                bbox_list = []
+                main_span = None
+                main_size = -1
+                x0 = y0 = float("inf")
+                x1 = y1 = float("-inf")
                 
-                for line in block.get("lines", []):
-                    for span in line.get("spans", []):
-                        text = span.get("text", "").strip()
-                        if text:
-                            block_text.append(text)
-                            
-                            # 폰트 정보 수집
-                            font_info = {
-                                "font": span.get("font", ""),
-                                "size": span.get("size", 0),
-                                "flags": span.get("flags", 0),
-                                "color": span.get("color", 0)
-                            }
-                            font_infos.append(font_info)
-                            
-                            # Bounding box
-                            bbox_list.append(span.get("bbox", [0, 0, 0, 0]))
+                for line in block["lines"]:
+                    for span in line["spans"]:
+                        text = span["text"].strip()
+                        if not text:
+                            continue
+                        block_text.append(text)
+                        
+                        # 대표 폰트 (가장 큰 폰트 크기의 첫 span)
+                        size = span["size"]
+                        if size > main_size:
+                            main_size = size
+                            main_span = span
+                        
+                        # 블록 전체 bbox 누적
+                        sx0, sy0, sx1, sy1 = span["bbox"]
+                        if sx0 < x0:
+                            x0 = sx0
+                        if sy0 < y0:
+                            y0 = sy0
+                        if sx1 > x1:
+                            x1 = sx1
+                        if sy1 > y1:
+                            y1 = sy1
                 
                 if block_text:
-                    # 블록 전체 bbox 계산
-                    if bbox_list:
-                        x0 = min(b[0] for b in bbox_list)
-                        y0 = min(b[1] for b in bbox_list)
-                        x1 = max(b[2] for b in bbox_list)
-                        y1 = max(b[3] for b in bbox_list)
-                        bbox = [x0, y0, x1, y1]
-                    else:
-                        bbox = block.get("bbox", [0, 0, 0, 0])
-                    
-                    # 대표 폰트 정보 (가장 큰 폰트 크기)
-                    if font_infos:
-                        main_font = max(font_infos, key=lambda f: f["size"])
-                    else:
-                        main_font = {}
+                    main_font = {
+                        "font": main_span["font"],
+                        "size": main_size,
+                        "flags": main_span["flags"],
+                        "color": main_span["color"]
+                    }
                     
                     blocks.append({
                         "page": page_num,
                         "type": "text",
-                        "bbox": bbox,
+                        "bbox": [x0, y0, x1, y1],
                         "content": " ".join(block_text),
                         "font_info": main_font
                     })
@@ -289,7 +399,8 @@ class PDFParser:
         images = []
         
         try:
-            image_list = page.get_images()
+            # get_image_bbox는 full=True 목록의 항목이 필요함
+            image_list = page.get_images(full=True)
             
             for img_index, img in enumerate(image_list):
                 # 이미지의 bbox 찾기
@@ -314,7 +425,7 @@ class PDFParser:
     
     def extract_tables(self, page_num: int) -> List[Dict[str, Any]]:
         """
-        페이지에서 표 추출 (pdfplumber 사용)
+        페이지에서 표 추출 (PyMuPDF 내장 표 탐지, 실패 시 pdfplumber)
         
         Args:
             page_num: 페이지 번호 (0부터 시작)
@@ -333,53 +444,72 @@ class PDFParser:
                 }
             ]
         """
-        if not self.doc:
+        if not self.doc or page_num >= len(self.doc):
             return []
         
         tables = []
         
         try:
-            # pdfplumber를 사용하여 표 추출
-            with pdfplumber.open(self.pdf_path) as pdf:
-                if page_num < len(pdf.pages):
-                    page = pdf.pages[page_num]
-                    extracted_tables = page.extract_tables()
+            # 표 탐지는 한 번만 수행하고 탐지된 표에서 데이터/bbox를 함께 얻음
+            for found_table in self._find_tables(page_num):
+                table = found_table.extract()
+                if not table:
+                    continue
+                
+                table_bbox = found_table.bbox
+                
+                # 표 데이터 정리
+                table_data = []
+                for row in table:
+                    if row:
+                        # None 값을 빈 문자열로 변환
+                        cleaned_row = [str(cell) if cell is not None else "" for cell in row]
+                        table_data.append(cleaned_row)
+                
+                if table_data:
+                    # 표를 텍스트로 변환
+                    table_text = "\n".join(["\t".join(row) for row in table_data])
                     
-                    for table in extracted_tables:
-                        if not table:
-                            continue
-                        
-                        # 표의 bbox 찾기
-                        table_bbox = page.find_tables()[extracted_tables.index(table)].bbox
-                        
-                        # 표 데이터 정리
-                        table_data = []
-                        for row in table:
-                            if row:
-                                # None 값을 빈 문자열로 변환
-                                cleaned_row = [str(cell) if cell is not None else "" for cell in row]
-                                table_data.append(cleaned_row)
-                        
-                        if table_data:
-                            # 표를 텍스트로 변환
-                            table_text = "\n".join(["\t".join(row) for row in table_data])
-                            
-                            tables.append({
-                                "page": page_num,
-                                "type": "table",
-                                "bbox": list(table_bbox),  # [x0, y0, x1, y1]
-                                "content": table_text,
-                                "data": table_data,
-                                "rows": len(table_data),
-                                "cols": len(table_data[0]) if table_data else 0,
-                                "font_info": {}  # 표는 폰트 정보 별도 처리 필요
-                            })
+                    tables.append({
+                        "page": page_num,
+                        "type": "table",
+                        "bbox": list(table_bbox),  # [x0, y0, x1, y1]
+                        "content": table_text,
+                        "data": table_data,
+                        "rows": len(table_data),
+                        "cols": len(table_data[0]) if table_data else 0,
+                        "font_info": {}  # 표는 폰트 정보 별도 처리 필요
+                    })
         
         except Exception as e:
             logger.warning(f"페이지 {page_num} 표 추출 실패: {e}")
         
         return tables
     
+    def _find_tables(self, page_num: int) -> List[Any]:
+        """
+        페이지의 표 탐지
+        
+        이미 열린 PyMuPDF 문서의 내장 표 탐지(PyMuPDF 1.23+)를 우선 사용하고,
+        표가 없는 페이지는 pdfplumber를 열지 않고 바로 건너뜁니다.
+        내장 탐지가 실패한 경우에만 pdfplumber로 대체합니다.
+        
+        Args:
+            page_num: 페이지 번호 (0부터 시작)
+            
+        Returns:
+            extract()와 bbox를 제공하는 표 객체 리스트
+        """
+        try:
+            return self.doc[page_num].find_tables().tables
+        except Exception as e:
+            logger.debug(f"페이지 {page_num} PyMuPDF 표 탐지 실패, pdfplumber 사용: {e}")
+        
+        # pdfplumber는 문서당 한 번만 열어 재사용
+        if self._plumber is None:
+            self._plumber = pdfplumber.open(self.pdf_path)
+        return self._plumber.pages[page_num].find_tables()
+    
     def get_page_dimensions(self, page_num: int) -> Tuple[float, float]:
         """
         페이지 크기 반환
@@ -396,3 +526,19 @@ class PDFParser:
         page = self.doc[page_num]
         rect = page.rect
         return rect.width, rect.height
+
+
+def _parse_page_range(pdf_path: str, start: int, stop: int) -> List[Dict[str, Any]]:
+    """
+    워커 프로세스에서 페이지 범위 [start, stop) 파싱
+    
+    Args:
+        pdf_path: PDF 파일 경로
+        start: 시작 페이지 번호
+        stop: 끝 페이지 번호 (포함하지 않음)
+        
+    Returns:
+        요소 리스트
+    """
+    with PDFParser(pdf_path) as parser:
+        return parser._parse_pages(range(start, stop))
@@ -1,6 +1,6 @@
 """태그 매칭 모듈"""
 
 from .tag_matcher import TagMatcher
-from .alt_text_generator import AltTextGenerator
+from .alt_text_generator import AltTextGenerator, AltTextCache, AsyncRateLimiter
 
-__all__ = ["TagMatcher", "AltTextGenerator"]
+__all__ = ["TagMatcher", "AltTextGenerator", "AltTextCache", "AsyncRateLimiter"]
@@ -4,14 +4,217 @@ Alt 텍스트 자동 생성 모듈
 GPT-4 Vision을 활용한 이미지 대체 텍스트 생성
 """
 
+import asyncio
+import bisect
+import hashlib
+import io
+import json
 import logging
+import random
 import base64
+import re
+import sqlite3
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any, Optional
-from openai import OpenAI
+from typing import Dict, List, Any, Optional, Tuple, Union
+from openai import APIConnectionError, AsyncOpenAI, InternalServerError, OpenAI, RateLimitError
+
+# Pillow를 사용한 이미지 축소 (선택적)
+try:
+    from PIL import Image
+    HAS_PIL = True
+except ImportError:
+    HAS_PIL = False
 
 logger = logging.getLogger(__name__)
 
+# Alt 텍스트 프롬프트 버전 (프롬프트를 바꾸면 올려서 디스크 캐시를 무효화)
+PROMPT_VERSION = 2
+
+# 요청당 이미지/프롬프트 입력 토큰 추정치 (TPM 제한 계산용)
+REQUEST_INPUT_TOKENS = 1000
+
+# 스트리밍 응답 조기 종료 길이 (후처리에서 200자로 자르므로 그 이상은 받지 않음, 단일 이미지 요청만)
+STREAM_STOP_CHARS = 240
+
+# 재시도할 일시적 오류 (속도 제한, 서버 오류, 연결/타임아웃) 및 최대 대기 시간(초)
+RETRYABLE_ERRORS = (RateLimitError, InternalServerError, APIConnectionError)
+RETRY_MAX_WAIT = 30.0
+
+# 동시에 열어 둘 최대 PDF 문서 수 (LRU, 초과하면 가장 오래 쓰지 않은 문서를 닫음)
+MAX_OPEN_DOCS = 8
+
+# Alt 텍스트 작성 규칙 (모든 요청에 같은 system 메시지로 보내 서버 측 프롬프트 캐시를 활용)
+ALT_TEXT_RULES = """당신은 접근성 전문가입니다. 주어진 이미지와 주변 문맥을 기반으로 
+WCAG 2.1 AA 기준에 맞는 Alt 텍스트를 생성하세요.
+
+출력 규칙:
+- 길이: 20~200자
+- 중복 표현 회피
+- "이미지" 같은 일반어만 단독 사용 금지
+- 이미지를 보지 못하는 사용자가 이해할 수 있도록 구체적으로 설명
+- 차트/그래프인 경우: 유형, 데이터 포인트, 트렌드 설명
+- 사진/일러스트인 경우: 주요 피사체, 배경, 색상, 의미 설명"""
+
+# 이미지 캡션 ("그림 3-2: ...", "Figure 1. ...", 표 캡션은 제외)
+CAPTION_RE = re.compile(r"^\s*(그림|Figure)\s*[\d\-.]+[:\s]")
+
+# 캡션으로 인정하는 이미지 하단과 텍스트 상단 사이 최대 간격 (pt)
+CAPTION_MAX_GAP = 24.0
+
+# 페이지별 문맥 색인: {page: (Y 좌표 리스트, 내용 리스트, (x0, x1) 리스트)}
+ContextIndex = Dict[Any, Tuple[List[float], List[str], List[Tuple[float, float]]]]
+
+# 응답을 감싼 ```json ... ``` 코드 블록
+_CODE_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL)
+
+
+class AltTextCache:
+    """
+    Alt 텍스트 디스크 캐시 (SQLite)
+    
+    이미지 내용 해시, 모델, 프롬프트 버전, 언어, temperature를 키로 생성 결과를 저장하여
+    같은 이미지를 다시 태깅할 때 Vision API 호출을 건너뜁니다.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Args:
+            path: SQLite 캐시 파일 경로
+        """
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS alt_text (key TEXT PRIMARY KEY, alt_text TEXT NOT NULL)"
+        )
+        self._conn.commit()
+    
+    @staticmethod
+    def make_key(image_sha256: str, model: str, lang: str, temperature: float) -> str:
+        """
+        캐시 키 생성
+        
+        Args:
+            image_sha256: 원본 이미지 바이트의 SHA-256
+            model: Vision 모델 이름
+            lang: 문서 언어
+            temperature: 모델 temperature (설정이 다르면 따로 저장)
+            
+        Returns:
+            캐시 키 (SHA-256 hex)
+        """
+        return hashlib.sha256(
+            f"{image_sha256}|{model}|{PROMPT_VERSION}|{lang}|{float(temperature)}".encode("utf-8")
+        ).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        """캐시된 Alt 텍스트 조회 (없으면 None)"""
+        row = self._conn.execute(
+            "SELECT alt_text FROM alt_text WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else None
+    
+    def set(self, key: str, alt_text: str) -> None:
+        """Alt 텍스트 저장"""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO alt_text (key, alt_text) VALUES (?, ?)", (key, alt_text)
+        )
+        self._conn.commit()
+    
+    def close(self) -> None:
+        """캐시 파일 닫기"""
+        self._conn.close()
+
+
+class AsyncRateLimiter:
+    """
+    분당 요청 수(RPM)와 분당 토큰 수(TPM)를 함께 제한하는 토큰 버킷
+    
+    세마포어가 동시 요청 수를 제한한다면, 이 리미터는 요청 속도를 계정 한도에
+    맞춰 429 응답과 재시도 대기를 피합니다. 버킷은 acquire 시점에 경과 시간만큼
+    채워집니다. 여러 문서와 이벤트 루프(동기 래퍼의 asyncio.run)에서 함께 써도
+    버킷 상태가 이어집니다.
+    """
+    
+    def __init__(
+        self,
+        max_requests_per_minute: Optional[float] = None,
+        max_tokens_per_minute: Optional[float] = None
+    ):
+        """
+        Args:
+            max_requests_per_minute: 분당 최대 요청 수 (None이면 제한 없음)
+            max_tokens_per_minute: 분당 최대 토큰 수 (None이면 제한 없음)
+        """
+        self.max_requests_per_minute = max_requests_per_minute
+        self.max_tokens_per_minute = max_tokens_per_minute
+        self._available_requests = max_requests_per_minute or 0.0
+        self._available_tokens = max_tokens_per_minute or 0.0
+        self._updated_at = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    def _get_lock(self) -> asyncio.Lock:
+        """현재 이벤트 루프용 잠금 (asyncio.Lock은 처음 대기한 루프에 묶이므로 루프가 바뀌면 새로 생성)"""
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._loop is not loop:
+            self._lock = asyncio.Lock()
+            self._loop = loop
+        return self._lock
+    
+    def _refill(self) -> None:
+        """경과 시간만큼 버킷 채우기 (최대 1분 분량)"""
+        now = time.monotonic()
+        elapsed = now - self._updated_at
+        self._updated_at = now
+        
+        if self.max_requests_per_minute:
+            self._available_requests = min(
+                self.max_requests_per_minute,
+                self._available_requests + elapsed * self.max_requests_per_minute / 60
+            )
+        if self.max_tokens_per_minute:
+            self._available_tokens = min(
+                self.max_tokens_per_minute,
+                self._available_tokens + elapsed * self.max_tokens_per_minute / 60
+            )
+    
+    async def acquire(self, tokens: int = 0) -> None:
+        """
+        요청 1건과 tokens개 토큰의 여유가 생길 때까지 대기한 뒤 차감
+        
+        Args:
+            tokens: 이 요청이 사용할 것으로 예상되는 토큰 수
+        """
+        if self.max_tokens_per_minute:
+            tokens = min(tokens, self.max_tokens_per_minute)
+        
+        # 대기 순서대로 처리되도록 한 번에 하나씩 확보
+        async with self._get_lock():
+            while True:
+                self._refill()
+                
+                wait_time = 0.0
+                if self.max_requests_per_minute and self._available_requests < 1:
+                    wait_time = (1 - self._available_requests) * 60 / self.max_requests_per_minute
+                if self.max_tokens_per_minute and self._available_tokens < tokens:
+                    wait_time = max(
+                        wait_time,
+                        (tokens - self._available_tokens) * 60 / self.max_tokens_per_minute
+                    )
+                
+                if wait_time <= 0:
+                    break
+                await asyncio.sleep(wait_time)
+            
+            if self.max_requests_per_minute:
+                self._available_requests -= 1
+            if self.max_tokens_per_minute:
+                self._available_tokens -= tokens
+
 
 class AltTextGenerator:
     """
@@ -25,7 +228,10 @@ class AltTextGenerator:
         api_key: str,
         model: str = "gpt-4-vision-preview",
         max_tokens: int = 300,
-        temperature: float = 0.3
+        temperature: float = 0.3,
+        cache: Optional[AltTextCache] = None,
+        max_edge: Optional[int] = 1024,
+        rate_limiter: Optional[AsyncRateLimiter] = None
     ):
         """
         Args:
@@ -33,18 +239,38 @@ class AltTextGenerator:
             model: 사용할 Vision 모델 (기본: gpt-4-vision-preview)
             max_tokens: 최대 토큰 수 (기본: 300)
             temperature: 모델 temperature (기본: 0.3)
+            cache: Alt 텍스트 디스크 캐시 (temperature별로 처음 생성한 결과를 재사용)
+            max_edge: 전송 전 이미지 긴 변의 최대 픽셀 수 (기본: 1024, None이면 원본 전송)
+            rate_limiter: 비동기 Vision API 호출 속도 제한 (RPM/TPM)
         """
-        self.client = OpenAI(api_key=api_key)
+        # 재시도는 _call_vision_api에서 직접 처리 (속도 제한기를 거쳐 다시 요청하도록)
+        self.client = OpenAI(api_key=api_key, max_retries=0)
+        self.aclient = AsyncOpenAI(api_key=api_key, max_retries=0)
         self.model = model
         self.max_tokens = max_tokens
         self.temperature = temperature
+        self.max_edge = max_edge
+        self.rate_limiter = rate_limiter
+        # temperature > 0이면 결과가 매번 달라질 수 있지만, 캐시 키에 temperature를 넣어
+        # 설정별로 처음 생성한 결과를 재사용
+        self.cache = cache
+        
+        # 이미지 추출용 PDF 문서 핸들 (LRU) 및 문서별 페이지 이미지 목록 캐시
+        self._docs: "OrderedDict[str, Any]" = OrderedDict()
+        self._page_images: Dict[int, Dict[int, List[tuple]]] = {}
+        # 문서별 원본 이미지 해시 (xref -> SHA-256), Base64 이미지는 요청할 때 만들고 보관하지 않음
+        self._image_hashes: Dict[int, Dict[int, str]] = {}
+        # 비동기 경로의 이미지 추출/축소/인코딩 전용 스레드 (이벤트 루프를 막지 않도록,
+        # fitz 문서는 스레드 간에 공유할 수 없으므로 작업 스레드 하나에서만 사용)
+        self._image_executor: Optional[ThreadPoolExecutor] = None
     
     def generate_alt_text(
         self,
         image_element: Dict[str, Any],
         context: List[Dict[str, Any]],
         pdf_path: Optional[str] = None,
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        context_index: Optional[ContextIndex] = None
     ) -> str:
         """
         이미지 대체 텍스트 생성
@@ -54,6 +280,7 @@ class AltTextGenerator:
             context: 주변 문맥 요소들 (텍스트, 제목 등)
             pdf_path: PDF 파일 경로 (이미지 추출용)
             metadata: 문서 메타데이터 (제목, 언어 등)
+            context_index: build_context_index로 미리 만든 페이지별 문맥 색인 (없으면 context에서 생성)
             
         Returns:
             대체 텍스트 문자열 (20-200자)
@@ -61,21 +288,20 @@ class AltTextGenerator:
         logger.info(f"Alt 텍스트 생성 시작: 이미지 요소 {image_element.get('id', 'unknown')}")
         
         try:
-            # 이미지 바이너리 추출
-            image_base64 = self._extract_image_base64(image_element, pdf_path)
-            if not image_base64:
+            request = self._prepare_request(image_element, context, pdf_path, metadata, context_index)
+            if request is None:
                 logger.warning("이미지 추출 실패, 기본값 사용")
                 return self._generate_default_alt_text(image_element, context)
             
-            # 주변 문맥 수집
-            context_text = self._collect_context(context, image_element)
-            
-            # 메타데이터 준비
-            title = metadata.get("title", "") if metadata else ""
-            lang = metadata.get("language", "ko-KR") if metadata else "ko-KR"
+            image_base64, prompt, image_sha256 = request
             
-            # 프롬프트 생성
-            prompt = self._create_alt_text_prompt(title, lang, context_text)
+            # 디스크 캐시 확인
+            cache_key = self._cache_key(image_sha256, metadata)
+            if cache_key:
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    logger.info("Alt 텍스트 캐시 사용")
+                    return cached
             
             # GPT-4 Vision API 호출
             alt_text = self._call_vision_api(image_base64, prompt)
@@ -83,6 +309,9 @@ class AltTextGenerator:
             # 후처리 및 검증
             alt_text = self._postprocess_alt_text(alt_text)
             
+            if cache_key:
+                self.cache.set(cache_key, alt_text)
+            
             logger.info(f"Alt 텍스트 생성 완료: {len(alt_text)}자")
             return alt_text
             
@@ -91,68 +320,552 @@ class AltTextGenerator:
             # Fallback: 기본값 반환
             return self._generate_default_alt_text(image_element, context)
     
-    def _extract_image_base64(
+    async def generate_alt_text_async(
+        self,
+        image_element: Dict[str, Any],
+        context: List[Dict[str, Any]],
+        pdf_path: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        context_index: Optional[ContextIndex] = None
+    ) -> str:
+        """
+        이미지 대체 텍스트 비동기 생성 (generate_alt_text와 동일한 결과)
+        
+        Args:
+            image_element: 이미지 요소 (PDFParser에서 추출한 이미지 정보)
+            context: 주변 문맥 요소들 (텍스트, 제목 등)
+            pdf_path: PDF 파일 경로 (이미지 추출용)
+            metadata: 문서 메타데이터 (제목, 언어 등)
+            context_index: build_context_index로 미리 만든 페이지별 문맥 색인 (없으면 context에서 생성)
+            
+        Returns:
+            대체 텍스트 문자열 (20-200자)
+        """
+        logger.info(f"Alt 텍스트 생성 시작: 이미지 요소 {image_element.get('id', 'unknown')}")
+        
+        try:
+            request = await self._run_in_image_thread(
+                self._prepare_request, image_element, context, pdf_path, metadata, context_index
+            )
+            if request is None:
+                logger.warning("이미지 추출 실패, 기본값 사용")
+                return self._generate_default_alt_text(image_element, context)
+            
+            image_base64, prompt, image_sha256 = request
+            
+            # 디스크 캐시 확인
+            cache_key = self._cache_key(image_sha256, metadata)
+            if cache_key:
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    logger.info("Alt 텍스트 캐시 사용")
+                    return cached
+            
+            # GPT-4 Vision API 호출
+            alt_text = await self._call_vision_api_async(image_base64, prompt)
+            
+            # 후처리 및 검증
+            alt_text = self._postprocess_alt_text(alt_text)
+            
+            if cache_key:
+                self.cache.set(cache_key, alt_text)
+            
+            logger.info(f"Alt 텍스트 생성 완료: {len(alt_text)}자")
+            return alt_text
+            
+        except Exception as e:
+            logger.error(f"Alt 텍스트 생성 실패: {e}", exc_info=True)
+            # Fallback: 기본값 반환
+            return self._generate_default_alt_text(image_element, context)
+    
+    async def generate_alt_text_batch(
+        self,
+        image_elements: List[Dict[str, Any]],
+        context: List[Dict[str, Any]],
+        pdf_path: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        context_index: Optional[ContextIndex] = None
+    ) -> List[str]:
+        """
+        여러 이미지의 Alt 텍스트를 한 번의 Vision 요청으로 생성
+        
+        이미지를 하나의 요청에 함께 첨부하고 JSON 배열로 응답받아 고정 프롬프트
+        토큰과 왕복 지연을 줄입니다. 요청이 실패하거나 응답 형식이 맞지 않으면
+        이미지별 요청으로 전환하되, 호출한 쪽이 잡고 있는 동시 실행 슬롯 하나 안에서
+        한 번에 하나씩 보냅니다. 재시도 후에도 속도 제한(RateLimitError)에 걸렸으면
+        요청을 더 보내지 않고 기본값을 사용합니다. 캐시된 이미지나 추출에 실패한
+        이미지는 요청에서 제외합니다.
+        
+        Args:
+            image_elements: 이미지 요소 리스트
+            context: 주변 문맥 요소들
+            pdf_path: PDF 파일 경로 (이미지 추출용)
+            metadata: 문서 메타데이터 (제목, 언어 등)
+            context_index: build_context_index로 미리 만든 페이지별 문맥 색인 (없으면 context에서 생성)
+            
+        Returns:
+            image_elements 순서의 대체 텍스트 리스트
+        """
+        logger.info(f"Alt 텍스트 일괄 생성 시작: 이미지 {len(image_elements)}개")
+        
+        results: List[Optional[str]] = [None] * len(image_elements)
+        pending = []  # (인덱스, Base64 이미지, 주변 문맥, 캐시 키)
+        
+        for i, image_element in enumerate(image_elements):
+            image = await self._run_in_image_thread(self._extract_image_base64, image_element, pdf_path)
+            if image is None:
+                logger.warning("이미지 추출 실패, 기본값 사용")
+                results[i] = self._generate_default_alt_text(image_element, context)
+                continue
+            
+            image_base64, image_sha256 = image
+            cache_key = self._cache_key(image_sha256, metadata)
+            cached = self.cache.get(cache_key) if cache_key else None
+            if cached is not None:
+                results[i] = cached
+                continue
+            
+            pending.append((i, image_base64, self._collect_context(context, image_element, context_index), cache_key))
+        
+        alt_texts = None
+        rate_limited = False
+        if len(pending) > 1:
+            title = metadata.get("title", "") if metadata else ""
+            lang = metadata.get("language", "ko-KR") if metadata else "ko-KR"
+            prompt = self._create_alt_text_batch_prompt(title, lang, [p[2] for p in pending])
+            
+            try:
+                response = await self._call_vision_api_async([p[1] for p in pending], prompt)
+                alt_texts = self._parse_batch_response(response, len(pending))
+                if alt_texts is None:
+                    logger.warning("일괄 응답 형식 오류, 이미지별 생성으로 전환")
+            except RateLimitError as e:
+                logger.warning(f"일괄 Alt 텍스트 생성 속도 제한, 기본값 사용: {e}")
+                rate_limited = True
+            except Exception as e:
+                logger.warning(f"일괄 Alt 텍스트 생성 실패, 이미지별 생성으로 전환: {e}")
+        
+        if rate_limited:
+            # 속도 제한 중에 이미지별 요청을 보내면 부하만 늘어나므로 기본값 사용
+            alt_texts = [self._generate_default_alt_text(image_elements[i], context) for i, _, _, _ in pending]
+        elif alt_texts is None:
+            # 동시 실행 슬롯 하나로 묶음 전체를 처리하므로 이미지별 요청도 순서대로 하나씩
+            alt_texts = []
+            for i, _, _, _ in pending:
+                alt_texts.append(await self.generate_alt_text_async(
+                    image_elements[i], context, pdf_path, metadata, context_index
+                ))
+        else:
+            alt_texts = [self._postprocess_alt_text(alt_text) for alt_text in alt_texts]
+            for (_, _, _, cache_key), alt_text in zip(pending, alt_texts):
+                if cache_key:
+                    self.cache.set(cache_key, alt_text)
+        
+        for (i, _, _, _), alt_text in zip(pending, alt_texts):
+            results[i] = alt_text
+        
+        logger.info(f"Alt 텍스트 일괄 생성 완료: 이미지 {len(image_elements)}개")
+        return results
+    
+    def close(self) -> None:
+        """이미지 작업 스레드를 멈추고 열어 둔 PDF 문서 닫기"""
+        if self._image_executor is not None:
+            self._image_executor.shutdown(wait=True)
+            self._image_executor = None
+        for doc in self._docs.values():
+            doc.close()
+        self._docs.clear()
+        self._page_images.clear()
+        self._image_hashes.clear()
+    
+    async def aclose(self) -> None:
+        """열어 둔 PDF 문서와 비동기 클라이언트 연결 정리"""
+        self.close()
+        await self.aclient.close()
+    
+    def get_image_sha256(
         self,
         image_element: Dict[str, Any],
         pdf_path: Optional[str] = None
     ) -> Optional[str]:
         """
-        이미지를 Base64로 추출
+        이미지 내용(원본 바이트)의 SHA-256 반환
+        
+        문서가 달라도 같은 이미지는 같은 값이므로 중복 요청 제거 키로 사용합니다.
+        축소나 Base64 인코딩 없이 원본 바이트만 해시하며, 해시 값만 보관합니다.
         
         Args:
             image_element: 이미지 요소
             pdf_path: PDF 파일 경로
             
         Returns:
-            Base64 인코딩된 이미지 문자열 (없으면 None)
+            SHA-256 16진 문자열 (이미지 추출 실패 시 None)
         """
-        if not pdf_path:
+        try:
+            location = self._locate_image(image_element, pdf_path)
+            if location is None:
+                return None
+            doc, xref = location
+            
+            image_sha256 = self._image_hashes.get(id(doc), {}).get(xref)
+            if image_sha256 is None:
+                image_sha256 = self._extract_image_bytes(doc, xref)[1]
+            return image_sha256
+            
+        except Exception as e:
+            logger.warning(f"이미지 추출 실패: {e}")
             return None
+    
+    async def get_image_sha256_async(
+        self,
+        image_element: Dict[str, Any],
+        pdf_path: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        get_image_sha256을 이미지 작업 스레드에서 실행 (이벤트 루프를 막지 않음)
         
-        try:
-            import fitz  # PyMuPDF
+        Args:
+            image_element: 이미지 요소
+            pdf_path: PDF 파일 경로
             
-            doc = fitz.open(pdf_path)
-            page_num = image_element.get("page", 0)
+        Returns:
+            SHA-256 16진 문자열 (이미지 추출 실패 시 None)
+        """
+        return await self._run_in_image_thread(self.get_image_sha256, image_element, pdf_path)
+    
+    async def _run_in_image_thread(self, func: Any, *args: Any) -> Any:
+        """
+        이미지 작업 스레드에서 func(*args) 실행
+        
+        생성기(문서)마다 작업 스레드 하나를 쓰므로 같은 fitz 문서에 동시에 접근하지 않습니다.
+        
+        Args:
+            func: 실행할 함수
+            *args: 함수 인자
             
-            if page_num >= len(doc):
-                doc.close()
-                return None
+        Returns:
+            func 반환 값
+        """
+        if self._image_executor is None:
+            self._image_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="alt-text-image")
+        return await asyncio.get_running_loop().run_in_executor(self._image_executor, func, *args)
+    
+    def _cache_key(
+        self,
+        image_sha256: str,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Optional[str]:
+        """
+        디스크 캐시 키 생성 (캐시를 쓰지 않으면 None)
+        
+        Args:
+            image_sha256: 원본 이미지 바이트의 SHA-256
+            metadata: 문서 메타데이터
+            
+        Returns:
+            캐시 키 또는 None
+        """
+        if self.cache is None or not image_sha256:
+            return None
+        
+        lang = metadata.get("language", "ko-KR") if metadata else "ko-KR"
+        return AltTextCache.make_key(image_sha256, self.model, lang, self.temperature)
+    
+    def _prepare_request(
+        self,
+        image_element: Dict[str, Any],
+        context: List[Dict[str, Any]],
+        pdf_path: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        context_index: Optional[ContextIndex] = None
+    ) -> Optional[Tuple[str, str, str]]:
+        """
+        Vision API 요청에 필요한 이미지와 프롬프트 준비
+        
+        Args:
+            image_element: 이미지 요소
+            context: 주변 문맥 요소들
+            pdf_path: PDF 파일 경로
+            metadata: 문서 메타데이터
+            context_index: build_context_index로 미리 만든 페이지별 문맥 색인 (없으면 context에서 생성)
+            
+        Returns:
+            (Base64 이미지, 프롬프트, 이미지 SHA-256) 튜플 (이미지 추출 실패 시 None)
+        """
+        # 이미지 바이너리 추출
+        image = self._extract_image_base64(image_element, pdf_path)
+        if image is None:
+            return None
+        image_base64, image_sha256 = image
+        
+        # 주변 문맥 수집
+        context_text = self._collect_context(context, image_element, context_index)
+        
+        # 메타데이터 준비
+        title = metadata.get("title", "") if metadata else ""
+        lang = metadata.get("language", "ko-KR") if metadata else "ko-KR"
+        
+        # 프롬프트 생성
+        prompt = self._create_alt_text_prompt(title, lang, context_text)
+        
+        return image_base64, prompt, image_sha256
+    
+    def _locate_image(
+        self,
+        image_element: Dict[str, Any],
+        pdf_path: Optional[str] = None,
+        doc: Optional[Any] = None
+    ) -> Optional[Tuple[Any, int]]:
+        """
+        이미지 요소의 문서와 xref 찾기
+        
+        Args:
+            image_element: 이미지 요소
+            pdf_path: PDF 파일 경로
+            doc: 이미 열린 fitz.Document (없으면 pdf_path로 한 번 열어 재사용)
             
-            page = doc[page_num]
-            image_list = page.get_images()
+        Returns:
+            (fitz.Document, xref) 튜플 (없으면 None)
+        """
+        if doc is None and not pdf_path:
+            return None
+        
+        if doc is None:
+            doc = self._get_document(pdf_path)
+        
+        page_num = image_element.get("page", 0)
+        if page_num >= len(doc):
+            return None
+        
+        # PDFParser가 기록한 xref가 있으면 페이지 이미지 목록 조회 생략
+        xref = image_element.get("xref")
+        if xref is None:
+            image_list = self._get_page_images(doc, page_num)
             
             image_index = image_element.get("image_index", 0)
             if image_index >= len(image_list):
-                doc.close()
                 return None
             
-            img = image_list[image_index]
-            xref = img[0]
+            xref = image_list[image_index][0]
+        
+        return doc, xref
+    
+    def _extract_image_bytes(self, doc: Any, xref: int) -> Tuple[Dict[str, Any], str]:
+        """
+        원본 이미지 추출 (축소/인코딩 없음) 및 SHA-256 계산
+        
+        Args:
+            doc: fitz.Document
+            xref: 이미지 xref
+            
+        Returns:
+            (doc.extract_image 결과, SHA-256) 튜플
+        """
+        base_image = doc.extract_image(xref)
+        hashes = self._image_hashes.setdefault(id(doc), {})
+        image_sha256 = hashes.get(xref)
+        if image_sha256 is None:
+            image_sha256 = hashlib.sha256(base_image["image"]).hexdigest()
+            hashes[xref] = image_sha256
+        return base_image, image_sha256
+    
+    def _extract_image_base64(
+        self,
+        image_element: Dict[str, Any],
+        pdf_path: Optional[str] = None,
+        doc: Optional[Any] = None
+    ) -> Optional[Tuple[str, str]]:
+        """
+        이미지를 Base64로 추출 (요청 직전에 호출, 결과는 보관하지 않음)
+        
+        원본 이미지 바이트의 SHA-256을 함께 반환합니다 (중복 이미지 식별 및 디스크 캐시 키).
+        
+        Args:
+            image_element: 이미지 요소
+            pdf_path: PDF 파일 경로
+            doc: 이미 열린 fitz.Document (없으면 pdf_path로 한 번 열어 재사용)
+            
+        Returns:
+            (Base64 인코딩된 이미지 문자열, SHA-256) 튜플 (없으면 None)
+        """
+        try:
+            location = self._locate_image(image_element, pdf_path, doc)
+            if location is None:
+                return None
             
             # 이미지 데이터 추출
-            base_image = doc.extract_image(xref)
+            base_image, image_sha256 = self._extract_image_bytes(*location)
             image_bytes = base_image["image"]
             
-            doc.close()
+            # 큰 이미지는 축소하여 전송량과 Vision 토큰 절감
+            image_ext = base_image.get("ext", "png")
+            if self.max_edge and max(base_image.get("width", 0), base_image.get("height", 0)) > self.max_edge:
+                image_bytes, image_ext = self._downscale_image(image_bytes, image_ext)
             
             # Base64 인코딩
             image_base64 = base64.b64encode(image_bytes).decode('utf-8')
             
             # MIME 타입 추가 (jpeg/png)
-            image_ext = base_image.get("ext", "png")
             mime_type = f"image/{image_ext}"
             
-            return f"data:{mime_type};base64,{image_base64}"
+            return f"data:{mime_type};base64,{image_base64}", image_sha256
             
         except Exception as e:
             logger.warning(f"이미지 추출 실패: {e}")
             return None
     
+    def _downscale_image(self, image_bytes: bytes, image_ext: str) -> Tuple[bytes, str]:
+        """
+        긴 변이 max_edge 이하가 되도록 이미지 축소 (Lanczos)
+        
+        투명도가 있으면 PNG, 없으면 JPEG(품질 85)로 다시 인코딩합니다.
+        Pillow가 없거나 디코딩에 실패하면 원본을 그대로 반환합니다.
+        
+        Args:
+            image_bytes: 원본 이미지 바이트
+            image_ext: 원본 이미지 확장자
+            
+        Returns:
+            (이미지 바이트, 확장자) 튜플
+        """
+        if not HAS_PIL:
+            return image_bytes, image_ext
+        
+        try:
+            with Image.open(io.BytesIO(image_bytes)) as img:
+                img.thumbnail((self.max_edge, self.max_edge), Image.LANCZOS)
+                
+                buffer = io.BytesIO()
+                if img.mode in ("RGBA", "LA", "PA") or "transparency" in img.info:
+                    img.save(buffer, "PNG", optimize=True)
+                    image_ext = "png"
+                else:
+                    if img.mode not in ("RGB", "L"):
+                        img = img.convert("RGB")
+                    img.save(buffer, "JPEG", quality=85, optimize=True)
+                    image_ext = "jpeg"
+                
+                return buffer.getvalue(), image_ext
+            
+        except Exception as e:
+            logger.warning(f"이미지 축소 실패, 원본 사용: {e}")
+            return image_bytes, image_ext
+    
+    def _get_document(self, pdf_path: str) -> Any:
+        """
+        PDF 문서 핸들 반환 (경로별로 한 번만 열어 재사용, 최대 MAX_OPEN_DOCS개까지 보관)
+        
+        Args:
+            pdf_path: PDF 파일 경로
+            
+        Returns:
+            fitz.Document
+        """
+        doc = self._docs.get(pdf_path)
+        if doc is None:
+            import fitz  # PyMuPDF
+            
+            doc = fitz.open(pdf_path)
+            self._docs[pdf_path] = doc
+            if len(self._docs) > MAX_OPEN_DOCS:
+                _, evicted = self._docs.popitem(last=False)
+                self._page_images.pop(id(evicted), None)
+                self._image_hashes.pop(id(evicted), None)
+                evicted.close()
+        else:
+            self._docs.move_to_end(pdf_path)
+        return doc
+    
+    def _get_page_images(self, doc: Any, page_num: int) -> List[tuple]:
+        """
+        페이지 이미지 목록 반환 (문서/페이지별 캐시)
+        
+        Args:
+            doc: fitz.Document
+            page_num: 페이지 번호
+            
+        Returns:
+            page.get_images() 결과
+        """
+        page_images = self._page_images.setdefault(id(doc), {})
+        image_list = page_images.get(page_num)
+        if image_list is None:
+            image_list = doc[page_num].get_images()
+            page_images[page_num] = image_list
+        return image_list
+    
+    @staticmethod
+    def build_context_index(context: List[Dict[str, Any]]) -> ContextIndex:
+        """
+        페이지별 문맥 색인 생성 (이미지마다 전체 요소를 다시 걸러 정렬하지 않도록 한 번만 생성)
+        
+        Args:
+            context: 주변 요소 리스트
+            
+        Returns:
+            {page: (Y 좌표 리스트, 내용 리스트, X 범위 리스트)} (내용이 있는 텍스트 요소만, 위에서 아래 순)
+        """
+        by_page: Dict[Any, List[Tuple[float, str, Tuple[float, float]]]] = {}
+        for elem in context:
+            if elem.get("type") != "text":
+                continue
+            content = elem.get("content", "").strip()
+            if not content:
+                continue
+            bbox = elem.get("bbox", [])
+            elem_y = bbox[1] if len(bbox) > 1 else 0
+            x_range = (bbox[0], bbox[2]) if len(bbox) > 3 else (0, 0)
+            by_page.setdefault(elem.get("page"), []).append((elem_y, content, x_range))
+        
+        index = {}
+        for page, items in by_page.items():
+            # Y 좌표 기준 정렬 (같은 Y는 원래 순서 유지)
+            items.sort(key=lambda item: item[0])
+            index[page] = ([item[0] for item in items], [item[1] for item in items], [item[2] for item in items])
+        
+        return index
+    
+    @staticmethod
+    def find_caption(
+        image_element: Dict[str, Any],
+        context_index: ContextIndex
+    ) -> Optional[str]:
+        """
+        이미지 바로 아래의 캡션 찾기
+        
+        이미지 하단에서 CAPTION_MAX_GAP 이내에 있고 X 범위가 이미지와 겹치는
+        첫 텍스트만 확인합니다 (다른 단의 텍스트나 멀리 떨어진 캡션은 제외).
+        
+        Args:
+            image_element: 이미지 요소
+            context_index: build_context_index로 만든 페이지별 문맥 색인
+            
+        Returns:
+            Alt 텍스트로 쓸 수 있는 캡션 (CAPTION_RE 형식, 20~200자), 없으면 None
+        """
+        page_ys, page_texts, page_xs = context_index.get(image_element.get("page", 0), ([], [], []))
+        image_bbox = image_element.get("bbox", [0, 0, 0, 0])
+        if len(image_bbox) < 4:
+            return None
+        image_x0, _, image_x1, image_bottom = image_bbox[:4]
+        
+        for i in range(bisect.bisect_left(page_ys, image_bottom), len(page_texts)):
+            if page_ys[i] - image_bottom > CAPTION_MAX_GAP:
+                break
+            text_x0, text_x1 = page_xs[i]
+            if text_x1 <= image_x0 or text_x0 >= image_x1:
+                continue
+            caption = page_texts[i]
+            if CAPTION_RE.match(caption) and 20 <= len(caption) <= 200:
+                return caption
+            break
+        return None
+    
     def _collect_context(
         self,
         context: List[Dict[str, Any]],
-        image_element: Dict[str, Any]
+        image_element: Dict[str, Any],
+        context_index: Optional[ContextIndex] = None
     ) -> str:
         """
         주변 문맥 수집
@@ -160,6 +873,7 @@ class AltTextGenerator:
         Args:
             context: 주변 요소 리스트
             image_element: 이미지 요소
+            context_index: build_context_index로 미리 만든 색인 (없으면 context에서 생성)
             
         Returns:
             문맥 텍스트
@@ -172,30 +886,21 @@ class AltTextGenerator:
         image_bbox = image_element.get("bbox", [0, 0, 0, 0])
         image_y = image_bbox[1] if len(image_bbox) > 1 else 0
         
-        # 같은 페이지의 요소들 필터링
-        same_page_elements = [
-            elem for elem in context
-            if elem.get("page") == image_page and elem.get("type") == "text"
-        ]
-        
-        # Y 좌표 기준 정렬 (위에서 아래로)
-        same_page_elements.sort(key=lambda x: x.get("bbox", [0, 0])[1] if len(x.get("bbox", [])) > 1 else 0)
+        # 같은 페이지의 텍스트 요소 (Y 좌표 기준 정렬, 위에서 아래로)
+        if context_index is None:
+            context_index = self.build_context_index(
+                [elem for elem in context if elem.get("page") == image_page]
+            )
+        page_ys, page_texts, _ = context_index.get(image_page, ([], [], []))
         
-        # 이미지 근처 요소 찾기 (위 2개, 아래 2개)
-        context_texts = []
-        for elem in same_page_elements:
-            elem_y = elem.get("bbox", [0, 0])[1] if len(elem.get("bbox", [])) > 1 else 0
-            content = elem.get("content", "").strip()
-            
-            if content:
-                # 이미지 위 (Y 좌표가 작음)
-                if elem_y < image_y:
-                    context_texts.append(content)
-                # 이미지 아래 (Y 좌표가 큼)
-                elif elem_y > image_y and len([t for t in context_texts if t]) < 4:
-                    context_texts.append(content)
+        # 이미지 위 요소 (Y 좌표가 작음) 다음에 아래 요소 (Y 좌표가 큼)를 합쳐 4개까지 채움
+        above_end = bisect.bisect_left(page_ys, image_y)
+        context_texts = page_texts[:min(above_end, 5)]
+        if len(context_texts) < 4:
+            below_start = bisect.bisect_right(page_ys, image_y)
+            context_texts += page_texts[below_start:below_start + 4 - len(context_texts)]
         
-        return "\n".join(context_texts[:5])  # 최대 5개
+        return "\n".join(context_texts)  # 최대 5개
     
     def _create_alt_text_prompt(
         self,
@@ -214,18 +919,7 @@ class AltTextGenerator:
         Returns:
             프롬프트 문자열
         """
-        system_prompt = """당신은 접근성 전문가입니다. 주어진 이미지와 주변 문맥을 기반으로 
-WCAG 2.1 AA 기준에 맞는 Alt 텍스트를 생성하세요.
-
-출력 규칙:
-- 길이: 20~200자
-- 중복 표현 회피
-- "이미지" 같은 일반어만 단독 사용 금지
-- 이미지를 보지 못하는 사용자가 이해할 수 있도록 구체적으로 설명
-- 차트/그래프인 경우: 유형, 데이터 포인트, 트렌드 설명
-- 사진/일러스트인 경우: 주요 피사체, 배경, 색상, 의미 설명"""
-        
-        user_prompt = f"""다음 정보를 바탕으로 Alt 텍스트를 생성하세요.
+        return f"""다음 정보를 바탕으로 Alt 텍스트를 생성하세요.
 
 [문서 메타데이터]
 - 제목: {title}
@@ -237,58 +931,258 @@ WCAG 2.1 AA 기준에 맞는 Alt 텍스트를 생성하세요.
 [요청]
 이미지를 보지 못하는 사용자가 이해할 수 있도록 1~2문장 Alt 텍스트를 작성하세요.
 한국어로 작성하고, 20~200자로 제한하세요."""
+    
+    def _create_alt_text_batch_prompt(
+        self,
+        title: str,
+        lang: str,
+        context_texts: List[str]
+    ) -> str:
+        """
+        여러 이미지를 한 번에 요청하는 Alt 텍스트 프롬프트 생성
+        
+        Args:
+            title: 문서 제목
+            lang: 언어
+            context_texts: 첨부 순서대로의 이미지별 주변 문맥 텍스트
+            
+        Returns:
+            프롬프트 문자열
+        """
+        count = len(context_texts)
+        context_sections = "\n\n".join(
+            f"[이미지 {i}의 주변 문맥]\n{context_text if context_text else '없음'}"
+            for i, context_text in enumerate(context_texts, 1)
+        )
         
-        return f"{system_prompt}\n\n{user_prompt}"
+        return f"""다음 정보를 바탕으로 첨부된 이미지 {count}개의 Alt 텍스트를 생성하세요.
+
+[문서 메타데이터]
+- 제목: {title}
+- 언어: {lang}
+
+{context_sections}
+
+[요청]
+이미지를 보지 못하는 사용자가 이해할 수 있도록 이미지마다 1~2문장 Alt 텍스트를 작성하세요.
+한국어로 작성하고, 각각 20~200자로 제한하세요.
+첨부 순서대로 Alt 텍스트 {count}개를 담은 JSON 문자열 배열만 출력하세요."""
+    
+    def _parse_batch_response(self, response: str, count: int) -> Optional[List[str]]:
+        """
+        일괄 요청 응답(JSON 문자열 배열) 파싱
+        
+        Args:
+            response: Vision API 응답 텍스트
+            count: 기대하는 Alt 텍스트 개수
+            
+        Returns:
+            Alt 텍스트 리스트 (형식이 맞지 않으면 None)
+        """
+        candidates = [response]
+        match = _CODE_FENCE_RE.search(response)
+        if match:
+            candidates.append(match.group(1))
+        
+        for candidate in candidates:
+            try:
+                result = json.loads(candidate)
+            except ValueError:
+                continue
+            if (
+                isinstance(result, list)
+                and len(result) == count
+                and all(isinstance(alt_text, str) for alt_text in result)
+            ):
+                return result
+        
+        return None
     
     def _call_vision_api(
         self,
         image_base64: str,
-        prompt: str
+        prompt: str,
+        max_retries: int = 3
     ) -> str:
         """
-        GPT-4 Vision API 호출
+        GPT-4 Vision API 호출 (스트리밍, 일시적 오류 재시도 포함)
         
         Args:
             image_base64: Base64 인코딩된 이미지
             prompt: 프롬프트
+            max_retries: 최대 시도 횟수
             
         Returns:
             생성된 Alt 텍스트
         """
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "당신은 접근성 전문가입니다. WCAG 2.1 AA 기준에 맞는 Alt 텍스트를 생성하세요."
-                    },
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": prompt
-                            },
+        for attempt in range(max_retries):
+            try:
+                stream = self.client.chat.completions.create(
+                    **self._build_request(image_base64, prompt),
+                    stream=True
+                )
+                
+                # 필요한 길이를 받으면 스트림을 닫아 나머지 응답 수신 중단
+                parts = []
+                length = 0
+                try:
+                    for chunk in stream:
+                        if not chunk.choices:
+                            continue
+                        delta = chunk.choices[0].delta.content or ""
+                        parts.append(delta)
+                        length += len(delta)
+                        if length > STREAM_STOP_CHARS:
+                            break
+                finally:
+                    stream.close()
+                
+                alt_text = "".join(parts).strip()
+                return alt_text
+            
+            except RETRYABLE_ERRORS as e:
+                if attempt < max_retries - 1:
+                    wait_time = self._retry_wait_time(e, attempt)
+                    logger.warning(f"GPT-4 Vision API 호출 실패 (시도 {attempt + 1}/{max_retries}): {e}. {wait_time:.1f}초 후 재시도...")
+                    time.sleep(wait_time)
+                else:
+                    logger.error(f"GPT-4 Vision API 호출 최종 실패: {e}")
+                    raise
+            
+            except Exception as e:
+                logger.error(f"GPT-4 Vision API 호출 실패: {e}")
+                raise
+    
+    async def _call_vision_api_async(
+        self,
+        image_base64: Union[str, List[str]],
+        prompt: str,
+        max_retries: int = 3
+    ) -> str:
+        """
+        GPT-4 Vision API 비동기 호출 (스트리밍, 일시적 오류 재시도 포함)
+        
+        재시도할 때마다 속도 제한기를 다시 거칩니다.
+        
+        Args:
+            image_base64: Base64 인코딩된 이미지 (일괄 요청이면 리스트)
+            prompt: 프롬프트
+            max_retries: 최대 시도 횟수
+            
+        Returns:
+            생성된 Alt 텍스트 (일괄 요청이면 응답 원문)
+        """
+        for attempt in range(max_retries):
+            try:
+                if self.rate_limiter:
+                    count = 1 if isinstance(image_base64, str) else len(image_base64)
+                    await self.rate_limiter.acquire((REQUEST_INPUT_TOKENS + self.max_tokens) * count)
+                
+                stream = await self.aclient.chat.completions.create(
+                    **self._build_request(image_base64, prompt),
+                    stream=True
+                )
+                
+                # 단일 이미지 요청은 필요한 길이를 받으면 스트림을 닫음 (일괄 요청은 JSON 전체 필요)
+                stop_chars = STREAM_STOP_CHARS if isinstance(image_base64, str) else None
+                parts = []
+                length = 0
+                try:
+                    async for chunk in stream:
+                        if not chunk.choices:
+                            continue
+                        delta = chunk.choices[0].delta.content or ""
+                        parts.append(delta)
+                        length += len(delta)
+                        if stop_chars and length > stop_chars:
+                            break
+                finally:
+                    await stream.close()
+                
+                alt_text = "".join(parts).strip()
+                return alt_text
+            
+            except RETRYABLE_ERRORS as e:
+                if attempt < max_retries - 1:
+                    wait_time = self._retry_wait_time(e, attempt)
+                    logger.warning(f"GPT-4 Vision API 호출 실패 (시도 {attempt + 1}/{max_retries}): {e}. {wait_time:.1f}초 후 재시도...")
+                    await asyncio.sleep(wait_time)
+                else:
+                    logger.error(f"GPT-4 Vision API 호출 최종 실패: {e}")
+                    raise
+            
+            except Exception as e:
+                logger.error(f"GPT-4 Vision API 호출 실패: {e}")
+                raise
+    
+    def _retry_wait_time(self, error: Exception, attempt: int) -> float:
+        """
+        재시도 대기 시간 (지수 백오프 + 지터, 서버의 Retry-After가 더 길면 그 값)
+        
+        Args:
+            error: 발생한 오류
+            attempt: 실패한 시도 번호 (0부터)
+            
+        Returns:
+            대기 시간(초)
+        """
+        wait_time = random.uniform(0, min(RETRY_MAX_WAIT, 2 ** attempt))
+        
+        response = getattr(error, "response", None)
+        if response is not None:
+            try:
+                wait_time = max(wait_time, float(response.headers.get("retry-after")))
+            except (TypeError, ValueError):
+                pass
+        
+        return wait_time
+    
+    def _build_request(
+        self,
+        image_base64: Union[str, List[str]],
+        prompt: str
+    ) -> Dict[str, Any]:
+        """
+        Vision API 요청 파라미터 생성 (동기/비동기 호출 공통)
+        
+        Args:
+            image_base64: Base64 인코딩된 이미지 (일괄 요청이면 리스트)
+            prompt: 프롬프트
+            
+        Returns:
+            chat.completions.create 키워드 인자
+        """
+        images = [image_base64] if isinstance(image_base64, str) else image_base64
+        
+        return {
+            "model": self.model,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": ALT_TEXT_RULES
+                },
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": prompt
+                        },
+                        *(
                             {
                                 "type": "image_url",
                                 "image_url": {
-                                    "url": image_base64
+                                    "url": url
                                 }
                             }
-                        ]
-                    }
-                ],
-                max_tokens=self.max_tokens,
-                temperature=self.temperature
-            )
-            
-            alt_text = response.choices[0].message.content.strip()
-            return alt_text
-            
-        except Exception as e:
-            logger.error(f"GPT-4 Vision API 호출 실패: {e}")
-            raise
+                            for url in images
+                        )
+                    ]
+                }
+            ],
+            "max_tokens": self.max_tokens * len(images),
+            "temperature": self.temperature
+        }
     
     def _postprocess_alt_text(self, alt_text: str) -> str:
         """
@@ -4,11 +4,14 @@
 구조 분석 결과를 바탕으로 XML 태그를 매칭하는 모듈
 """
 
+import asyncio
 import logging
 from typing import Dict, List, Any, Optional, Tuple
 from openai import OpenAI
 
-from .alt_text_generator import AltTextGenerator
+import numpy as np
+
+from .alt_text_generator import AltTextCache, AltTextGenerator, AsyncRateLimiter
 
 logger = logging.getLogger(__name__)
 
@@ -53,6 +56,9 @@ class TagMatcher:
         }
     }
     
+    # 이 개수 이상이면 규칙 기반 매칭을 numpy로 일괄 처리 (작은 입력은 요소별 처리가 더 빠름)
+    BULK_RULE_THRESHOLD = 256
+    
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         """
         Args:
@@ -64,6 +70,210 @@ class TagMatcher:
         self.enable_rule_matching = self.config.get("enable_rule_matching", True)
         self.enable_alt_text = self.config.get("enable_alt_text", True)
         self.alt_text_config = self.config.get("alt_text", {})
+        
+        # Vision API 속도 제한은 계정 단위이므로 모든 generate_alt_texts_async 호출
+        # (process_batch에서 동시에 처리하는 문서 포함)이 같은 버킷을 사용
+        rpm = self.alt_text_config.get("rpm")
+        tpm = self.alt_text_config.get("tpm")
+        self.alt_text_rate_limiter = AsyncRateLimiter(rpm, tpm) if (rpm or tpm) else None
+        
+        # 동시 Vision 요청 수 제한도 문서별이 아닌 인스턴스 전체에 적용 (_get_alt_text_semaphore)
+        self._alt_text_semaphore: Optional[asyncio.Semaphore] = None
+        self._alt_text_loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    def _get_alt_text_semaphore(self) -> asyncio.Semaphore:
+        """
+        현재 이벤트 루프에서 쓸 Vision 요청 동시 실행 제한 (alt_text.concurrency)
+        
+        asyncio.Semaphore는 처음 대기한 이벤트 루프에 묶이므로 루프가 바뀌면
+        (동기 래퍼의 asyncio.run) 새로 만듭니다.
+        
+        Returns:
+            같은 루프의 모든 generate_alt_texts_async 호출이 함께 쓰는 세마포어
+        """
+        loop = asyncio.get_running_loop()
+        if self._alt_text_semaphore is None or self._alt_text_loop is not loop:
+            self._alt_text_semaphore = asyncio.Semaphore(max(1, self.alt_text_config.get("concurrency", 5)))
+            self._alt_text_loop = loop
+        return self._alt_text_semaphore
+    
+    def generate_alt_texts(
+        self,
+        elements: List[Dict[str, Any]],
+        api_key: Optional[str] = None,
+        pdf_path: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, str]:
+        """
+        이미지 요소의 Alt 텍스트 생성 (generate_alt_texts_async의 동기 래퍼)
+        
+        Args:
+            elements: PDF 요소 리스트
+            api_key: OpenAI API 키 (없으면 생성하지 않음)
+            pdf_path: PDF 파일 경로 (이미지 추출용)
+            metadata: 문서 메타데이터
+            
+        Returns:
+            {element_id: alt_text} 딕셔너리
+        """
+        if not (self.enable_alt_text and api_key):
+            return {}
+        
+        return asyncio.run(
+            self.generate_alt_texts_async(elements, api_key, pdf_path, metadata)
+        )
+    
+    async def generate_alt_texts_async(
+        self,
+        elements: List[Dict[str, Any]],
+        api_key: Optional[str] = None,
+        pdf_path: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, str]:
+        """
+        이미지 요소의 Alt 텍스트를 동시에 생성
+        
+        구조 분석 결과와 무관하므로 구조 분석과 동시에 실행할 수 있습니다.
+        Vision API 요청은 동시에 실행 중인 모든 호출을 합쳐 alt_text.concurrency(기본: 5)개까지
+        동시에 보내며,
+        같은 이미지(xref 또는 이미지 내용)가 여러 번 나오면 한 번만 요청합니다.
+        이미지 바로 아래에 "그림 3-2: ..." 형식의 캡션이 있으면 요청하지 않고
+        캡션을 Alt 텍스트로 사용합니다 (alt_text.caption_as_alt, 기본: 켜짐).
+        alt_text.batch_supported가 켜져 있으면 같은 페이지의 이미지를
+        alt_text.batch_size(기본: 4)개씩 한 요청에 묶습니다.
+        
+        Args:
+            elements: PDF 요소 리스트
+            api_key: OpenAI API 키 (없으면 생성하지 않음)
+            pdf_path: PDF 파일 경로 (이미지 추출용)
+            metadata: 문서 메타데이터
+            
+        Returns:
+            {element_id: alt_text} 딕셔너리
+        """
+        if not (self.enable_alt_text and api_key):
+            return {}
+        
+        # 이미지별 요청 (cache_key -> 대표 요소, 같은 이미지를 쓰는 요소 ID들)
+        requests: Dict[Any, Dict[str, Any]] = {}
+        element_ids: Dict[Any, List[str]] = {}
+        for idx, elem in enumerate(elements):
+            if elem.get("type") != "image":
+                continue
+            elem_id = f"element_{idx}"
+            cache_key = elem.get("xref", elem_id)
+            if cache_key not in requests:
+                requests[cache_key] = {**elem, "id": elem_id}
+                element_ids[cache_key] = []
+            element_ids[cache_key].append(elem_id)
+        
+        if not requests:
+            return {}
+        
+        context_index = AltTextGenerator.build_context_index(elements)
+        alt_texts = {}
+        
+        # 이미지 바로 아래에 캡션이 있으면 Vision API 대신 캡션을 Alt 텍스트로 사용
+        if self.alt_text_config.get("caption_as_alt", True):
+            for cache_key in list(requests):
+                caption = AltTextGenerator.find_caption(requests[cache_key], context_index)
+                if caption is None:
+                    continue
+                logger.info(f"Alt 텍스트 캡션 사용: {requests.pop(cache_key)['id']} (alt_source=caption)")
+                for elem_id in element_ids.pop(cache_key):
+                    alt_texts[elem_id] = caption
+            
+            if not requests:
+                return alt_texts
+        
+        cache_path = self.alt_text_config.get("cache_path")
+        cache = AltTextCache(cache_path) if cache_path else None
+        
+        alt_text_generator = AltTextGenerator(
+            api_key=api_key,
+            model=self.alt_text_config.get("model", "gpt-4-vision-preview"),
+            max_tokens=self.alt_text_config.get("max_tokens", 300),
+            temperature=self.alt_text_config.get("temperature", 0.3),
+            cache=cache,
+            max_edge=self.alt_text_config.get("max_edge", 1024),
+            rate_limiter=self.alt_text_rate_limiter
+        )
+        
+        semaphore = self._get_alt_text_semaphore()
+        # 일괄 요청을 지원하는 모델이면 같은 페이지 이미지를 batch_size개씩 묶어 한 요청으로 보냄
+        if self.alt_text_config.get("batch_supported", False):
+            batch_size = max(1, self.alt_text_config.get("batch_size", 4))
+        else:
+            batch_size = 1
+        
+        async def _generate(group: List[Any]) -> List[str]:
+            image_elements = [requests[cache_key] for cache_key in group]
+            async with semaphore:
+                if len(image_elements) == 1:
+                    return [await alt_text_generator.generate_alt_text_async(
+                        image_element=image_elements[0],
+                        context=elements,
+                        pdf_path=pdf_path,
+                        metadata=metadata or {},
+                        context_index=context_index
+                    )]
+                return await alt_text_generator.generate_alt_text_batch(
+                    image_elements=image_elements,
+                    context=elements,
+                    pdf_path=pdf_path,
+                    metadata=metadata or {},
+                    context_index=context_index
+                )
+        
+        groups: List[List[Any]] = []
+        tasks: List[asyncio.Future] = []
+        by_page: Dict[Any, List[Any]] = {}
+        try:
+            # xref가 달라도 내용(SHA-256)이 같은 이미지(중복 임베드)는 한 요청으로 합침
+            # 원본 바이트만 이미지 작업 스레드에서 해시하고, 해시가 나오는 대로 요청을 시작하여
+            # 모든 이미지를 추출할 때까지 첫 Vision 요청이 기다리지 않도록 함
+            by_content: Dict[str, Any] = {}
+            for cache_key in list(requests):
+                image_sha256 = await alt_text_generator.get_image_sha256_async(requests[cache_key], pdf_path)
+                if image_sha256 is not None:
+                    if image_sha256 in by_content:
+                        del requests[cache_key]
+                        element_ids[by_content[image_sha256]].extend(element_ids.pop(cache_key))
+                        continue
+                    by_content[image_sha256] = cache_key
+                
+                page = requests[cache_key].get("page")
+                by_page.setdefault(page, []).append(cache_key)
+                if len(by_page[page]) == batch_size:
+                    groups.append(by_page.pop(page))
+                    tasks.append(asyncio.ensure_future(_generate(groups[-1])))
+            
+            for group in by_page.values():
+                groups.append(group)
+                tasks.append(asyncio.ensure_future(_generate(group)))
+            
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            # 해시 중 오류가 나면 이미 시작한 요청을 정리한 뒤 클라이언트를 닫음
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await alt_text_generator.aclose()
+            if cache:
+                cache.close()
+        
+        for group, group_result in zip(groups, results):
+            if isinstance(group_result, BaseException):
+                logger.error(f"Alt 텍스트 생성 실패: {group_result}")
+                group_result = [
+                    alt_text_generator._generate_default_alt_text(requests[cache_key], elements)
+                    for cache_key in group
+                ]
+            for cache_key, result in zip(group, group_result):
+                for elem_id in element_ids[cache_key]:
+                    alt_texts[elem_id] = result
+        
+        return alt_texts
     
     def match_tags(
         self,
@@ -71,7 +281,8 @@ class TagMatcher:
         structure: Dict[str, Any],
         api_key: Optional[str] = None,
         pdf_path: Optional[str] = None,
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        alt_texts: Optional[Dict[str, str]] = None
     ) -> Dict[str, Any]:
         """
         요소들에 XML 태그 매칭
@@ -79,6 +290,11 @@ class TagMatcher:
         Args:
             elements: PDF 요소 리스트
             structure: StructureAnalyzer 결과
+            api_key: OpenAI API 키 (Alt 텍스트 생성용)
+            pdf_path: PDF 파일 경로 (이미지 추출용)
+            metadata: 문서 메타데이터
+            alt_texts: generate_alt_texts로 미리 생성한 Alt 텍스트
+                (없으면 이 메서드 안에서 생성)
             
         Returns:
             {
@@ -105,33 +321,44 @@ class TagMatcher:
         hierarchy = structure.get("hierarchy", {})
         reading_order = structure.get("reading_order", [])
         
-        # 제목 추출 (메타데이터용)
-        title = self._extract_title(elements, hierarchy)
-        
-        # Alt 텍스트 생성기 준비
-        alt_text_generator = None
-        if self.enable_alt_text and api_key:
-            alt_text_generator = AltTextGenerator(
-                api_key=api_key,
-                model=self.alt_text_config.get("model", "gpt-4-vision-preview"),
-                max_tokens=self.alt_text_config.get("max_tokens", 300),
-                temperature=self.alt_text_config.get("temperature", 0.3)
-            )
-
-        # 요소별 태그 매칭
-        for idx, elem in enumerate(elements):
-            elem_id = f"element_{idx}"
-            
-            # 구조 분석 결과에서 태그 가져오기
-            if elem_id in hierarchy:
-                suggested_tag = hierarchy[elem_id].get("tag", "P")
-                level = hierarchy[elem_id].get("level", 0)
+        # 이미지 Alt 텍스트 준비
+        if alt_texts is None:
+            alt_texts = self.generate_alt_texts(elements, api_key, pdf_path, metadata)
+        
+        elem_ids = [f"element_{idx}" for idx in range(len(elements))]
+        hierarchy_get = hierarchy.get
+        title_index = None  # 구조 분석에서 첫 번째 H1로 제안된 요소 (제목용)
+        
+        # 구조 분석 결과에서 태그 가져오기
+        suggested_tags = []
+        levels = []
+        for idx, elem_id in enumerate(elem_ids):
+            node = hierarchy_get(elem_id)
+            if node is not None:
+                suggested_tag = node.get("tag", "P")
+                levels.append(node.get("level", 0))
+                if title_index is None and suggested_tag == "H1":
+                    title_index = idx
             else:
                 suggested_tag = "P"
-                level = 0
-            
-            # 규칙 기반 매칭
-            rule_result = self._rule_based_matching(elem, suggested_tag)
+                levels.append(0)
+            suggested_tags.append(suggested_tag)
+        
+        # 규칙 기반 매칭
+        if len(elements) >= self.BULK_RULE_THRESHOLD:
+            rule_results = self._rule_based_matching_bulk(elements, suggested_tags)
+        else:
+            rule_results = [
+                self._rule_based_matching(elem, suggested_tag)
+                for elem, suggested_tag in zip(elements, suggested_tags)
+            ]
+        
+        # 요소별 태그 매칭
+        for idx, elem in enumerate(elements):
+            elem_id = elem_ids[idx]
+            suggested_tag = suggested_tags[idx]
+            level = levels[idx]
+            rule_result = rule_results[idx]
             
             # AI 기반 매칭 (구조 분석 결과 활용)
             ai_result = (suggested_tag, 0.8) if self.enable_ai_matching else (suggested_tag, 0.5)
@@ -142,14 +369,9 @@ class TagMatcher:
             # 태그 속성 생성
             attributes = self._generate_attributes(final_tag, level, elem)
 
-            # 이미지 요소의 Alt 텍스트 생성
-            if elem.get("type") == "image" and alt_text_generator:
-                attributes["alt"] = alt_text_generator.generate_alt_text(
-                    image_element={**elem, "id": elem_id},
-                    context=elements,
-                    pdf_path=pdf_path,
-                    metadata=metadata or {}
-                )
+            # 이미지 요소의 Alt 텍스트 적용
+            if elem.get("type") == "image" and elem_id in alt_texts:
+                attributes["alt"] = alt_texts[elem_id]
             
             tagged_elements.append({
                 "id": elem_id,
@@ -162,6 +384,11 @@ class TagMatcher:
                 "level": level
             })
         
+        # 제목 추출 (메타데이터용, H1 제안이 없으면 첫 번째 요소)
+        if title_index is None and elements:
+            title_index = 0
+        title = self._extract_title(elements, hierarchy, title_index)
+        
         # 태그 검증 및 보정
         tagged_elements = self._validate_and_correct(tagged_elements)
         
@@ -245,6 +472,66 @@ class TagMatcher:
         
         return (matched_tag, confidence)
     
+    def _rule_based_matching_bulk(
+        self,
+        elements: List[Dict[str, Any]],
+        suggested_tags: List[str]
+    ) -> List[Tuple[str, float]]:
+        """
+        규칙 기반 태그 매칭 (전체 요소 일괄, _rule_based_matching과 같은 결과)
+        
+        텍스트 요소의 폰트 크기/굵기/Y 좌표를 numpy 배열로 모아 규칙을 한 번에
+        평가합니다. 이미지/표 요소는 요소별 규칙을 그대로 적용합니다.
+        
+        Args:
+            elements: PDF 요소 리스트
+            suggested_tags: 요소별 제안 태그
+            
+        Returns:
+            요소 순서의 (tag, confidence) 튜플 리스트
+        """
+        if not self.enable_rule_matching:
+            return [(suggested_tag, 0.5) for suggested_tag in suggested_tags]
+        
+        count = len(elements)
+        font_infos = [elem.get("font_info", {}) for elem in elements]
+        bboxes = [elem.get("bbox", [0, 0, 0, 0]) for elem in elements]
+        font_size = np.fromiter((f.get("size", 11) for f in font_infos), dtype=np.float64, count=count)
+        flags = np.fromiter((f.get("flags", 0) for f in font_infos), dtype=np.int64, count=count)
+        y_pos = np.fromiter((b[1] if len(b) > 1 else 0 for b in bboxes), dtype=np.float64, count=count)
+        is_bold = (flags & 16) != 0
+        suggested = np.array(suggested_tags, dtype=object)
+        
+        # 규칙은 H1 → H2 → H3 → P 순서로 처음 일치한 것만 적용
+        is_h1 = (font_size >= 20) & is_bold & (y_pos < 200)
+        is_h2 = ~is_h1 & (font_size >= 16) & is_bold
+        is_h3 = ~is_h1 & ~is_h2 & (font_size >= 14) & is_bold
+        is_p = (font_size >= 10) & (font_size <= 13) & ~is_bold
+        
+        # P 규칙은 단어 5개 이상일 때만 점수 부여
+        for idx in np.flatnonzero(is_p):
+            if len(elements[idx].get("content", "").split()) < 5:
+                is_p[idx] = False
+        
+        scores = np.select([is_h1, is_h2, is_h3, is_p], [0.8, 0.7, 0.6, 0.7], default=0.0)
+        confidences = np.where(scores > 0, np.minimum(scores, 1.0), 0.5).tolist()
+        
+        # H1 규칙은 제안 태그를 유지하고, H2/H3 규칙은 더 높은 제목 제안만 낮춤
+        tags = suggested.copy()
+        tags[is_h2 & (suggested == "H1")] = "H2"
+        tags[is_h3 & ((suggested == "H1") | (suggested == "H2"))] = "H3"
+        tags[is_p] = "P"
+        tags = tags.tolist()
+        
+        results = list(zip(tags, confidences))
+        
+        # 타입별 기본 태그 (이미지/표)
+        for idx, elem in enumerate(elements):
+            if elem.get("type", "text") in ("image", "table"):
+                results[idx] = self._rule_based_matching(elem, suggested_tags[idx])
+        
+        return results
+    
     def _merge_results(
         self,
         rule_result: Tuple[str, float],
@@ -352,7 +639,8 @@ class TagMatcher:
     def _extract_title(
         self,
         elements: List[Dict[str, Any]],
-        hierarchy: Dict[str, Any]
+        hierarchy: Dict[str, Any],
+        title_index: Optional[int] = None
     ) -> str:
         """
         문서 제목 추출
@@ -360,16 +648,21 @@ class TagMatcher:
         Args:
             elements: PDF 요소 리스트
             hierarchy: 계층 구조
+            title_index: 미리 찾은 첫 번째 H1 요소 인덱스 (없으면 hierarchy에서 탐색)
             
         Returns:
             제목 문자열
         """
         # H1 태그된 요소 찾기
-        for idx, elem in enumerate(elements):
-            elem_id = f"element_{idx}"
-            if elem_id in hierarchy:
-                if hierarchy[elem_id].get("tag") == "H1":
-                    return elem.get("content", "")[:200]  # 최대 200자
+        if title_index is None:
+            for idx in range(len(elements)):
+                node = hierarchy.get(f"element_{idx}")
+                if node is not None and node.get("tag") == "H1":
+                    title_index = idx
+                    break
+        
+        if title_index is not None:
+            return elements[title_index].get("content", "")[:200]  # 최대 200자
         
         # H1이 없으면 첫 번째 요소
         if elements:
@@ -4,15 +4,215 @@
 생성된 PDF의 접근성을 검증하는 클래스
 """
 
+import hashlib
+import io
 import json
 import logging
+import mmap
+import os
 import subprocess
+import urllib.error
+import urllib.request
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Iterable, Optional, Union
+
+import fitz  # PyMuPDF
 from pypdf import PdfReader
 
+# orjson을 사용한 veraPDF 결과 파싱 (선택적, 없으면 json 사용)
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 logger = logging.getLogger(__name__)
 
+# 지원하는 PDF 읽기 백엔드 (validator.backend 설정)
+BACKENDS = ("pymupdf", "pypdf")
+
+# validate()에서 선택할 수 있는 검사
+CHECKS = ("metadata", "text", "structure", "reading", "alt", "external")
+
+# AI 친화성 점수 계산에 필요한 검사 (나머지는 점수에 영향을 주지 않음)
+SCORE_CHECKS = ("metadata", "text", "structure")
+
+# 검사 실패 시 validate()의 감점 (실패한 검사는 결과의 failed_checks에 기록)
+CHECK_PENALTIES = {"metadata": 20.0, "text": 30.0, "structure": 25.0, "reading": 15.0, "alt": 10.0}
+
+# SCORE_CHECKS 실행 여부를 나타내는 wcag_compliance 항목
+SCORE_WCAG_KEYS = ("title_metadata", "text_selectable", "structure_tree")
+
+# 결과 캐시 키 방식 (validator.cache_by 설정): 파일 내용 해시 또는 경로+수정 시각+크기
+CACHE_BY = ("content", "stat")
+
+# 파일 해시 계산 시 읽는 단위
+HASH_CHUNK_SIZE = 1 << 20
+
+# PDF를 메모리로 복사하지 않고 mmap으로 여는 파일 크기 기준 (validator.mmap_threshold 기본값)
+MMAP_THRESHOLD = 64 * 1024 * 1024
+
+# veraPDF 실행 방식 (validator.verapdf_mode 설정)
+# cli: 파일마다 실행, batch: validate_batch에서 전체 파일을 한 번에 실행, rest: veraPDF REST 서버 사용
+VERAPDF_MODES = ("cli", "batch", "rest")
+
+# veraPDF가 규칙별로 출력할 최대 실패 검사 수 (보고서 크기 축소, 규칙 요약은 그대로)
+VERAPDF_MAX_FAILURES_DISPLAYED = 10
+
+# batch 모드에서 한 번의 veraPDF 실행에 넘기는 파일 경로 길이 합의 상한
+# (Windows 명령줄 최대 길이 32767자보다 여유 있게, 넘으면 여러 번으로 나누어 실행)
+VERAPDF_MAX_COMMAND_LENGTH = 30000
+
+# PDF 판별 시 "%PDF-" 헤더를 찾는 앞부분 크기 (PDF 명세상 헤더 앞에 다른 바이트가 올 수 있음)
+PDF_HEADER_SEARCH_SIZE = 1024
+
+# 첫 페이지를 텍스트 선택 가능으로 판단하는 최소 문자 수 (공백 제외, 초과해야 통과)
+MIN_TEXT_CHARS = 10
+
+
+class _EarlyExit(Exception):
+    """텍스트 추출을 중간에 멈추기 위한 내부 예외"""
+
+
+class _PyMuPDFDocument:
+    """
+    PyMuPDF 기반 검증용 문서 (기본 백엔드)
+    
+    메타데이터와 카탈로그 항목은 필요한 키만 읽고, 텍스트는 MuPDF로 추출합니다.
+    """
+    
+    def __init__(self, pdf_path: str, data: Optional[Union[bytes, mmap.mmap]] = None):
+        # 이미 읽은 내용이 있으면 재사용 (mmap은 MuPDF가 직접 파일을 읽도록 경로로 열기)
+        if isinstance(data, bytes):
+            self.doc = fitz.open(stream=data, filetype="pdf")
+        else:
+            self.doc = fitz.open(pdf_path)
+        self.catalog = self.doc.pdf_catalog()
+        self._metadata: Optional[Dict[str, Any]] = None
+    
+    @property
+    def page_count(self) -> int:
+        return self.doc.page_count
+    
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        # doc.metadata는 접근할 때마다 Info 사전을 다시 읽으므로 한 번만 조회
+        if self._metadata is None:
+            self._metadata = self.doc.metadata or {}
+        return self._metadata
+    
+    def title(self) -> str:
+        return self.metadata.get("title") or ""
+    
+    def language(self) -> str:
+        # Info 사전의 /Lang (TaggedPDFGenerator가 기록) → 카탈로그 /Lang 순
+        info_type, info_ref = self.doc.xref_get_key(-1, "Info")
+        if info_type == "xref":
+            lang_type, lang = self.doc.xref_get_key(int(info_ref.split()[0]), "Lang")
+            if lang_type == "string" and lang.strip():
+                return lang
+        
+        lang_type, lang = self.doc.xref_get_key(self.catalog, "Lang")
+        return lang if lang_type == "string" else ""
+    
+    def has_first_page_text(self, min_chars: int = MIN_TEXT_CHARS) -> bool:
+        # MuPDF 추출은 C 수준에서 끝나므로 중간 종료 없이 전체 추출
+        text = self.doc.load_page(0).get_text("text") if self.doc.page_count else ""
+        return len(text.strip()) > min_chars
+    
+    def has_struct_tree(self) -> bool:
+        return self.doc.xref_get_key(self.catalog, "StructTreeRoot")[0] != "null"
+    
+    def is_marked(self) -> bool:
+        return self.doc.xref_get_key(self.catalog, "MarkInfo/Marked") == ("bool", "true")
+    
+    def close(self) -> None:
+        self.doc.close()
+
+
+class _PyPDFDocument:
+    """pypdf 기반 검증용 문서 (validator.backend: pypdf)"""
+    
+    def __init__(self, pdf_path: str, data: Optional[Union[bytes, mmap.mmap]] = None):
+        # 경로를 넘기면 pypdf가 파일을 다시 읽으므로, 이미 읽은 내용이 있으면 그대로 사용
+        # (mmap은 read/seek를 지원하므로 복사 없이 전달)
+        if data is None:
+            source = pdf_path
+        elif isinstance(data, bytes):
+            source = io.BytesIO(data)
+        else:
+            source = data
+        self.reader = PdfReader(source)
+        # 카탈로그는 한 번만 역참조하여 모든 검사에서 재사용
+        self.root = self.reader.trailer["/Root"]
+        self._metadata: Optional[Dict[str, Any]] = None
+        self._page_count: Optional[int] = None
+    
+    @property
+    def page_count(self) -> int:
+        # len(reader.pages)는 페이지 트리 전체를 펼치므로 /Pages의 /Count를 먼저 사용
+        if self._page_count is None:
+            try:
+                count = int(self.root["/Pages"].get_object().get("/Count"))
+            except (KeyError, TypeError, ValueError):
+                count = -1
+            self._page_count = count if count >= 0 else len(self.reader.pages)
+        return self._page_count
+    
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        # reader.metadata는 접근할 때마다 Info 사전을 새로 만들므로 한 번만 조회
+        if self._metadata is None:
+            self._metadata = self.reader.metadata or {}
+        return self._metadata
+    
+    def title(self) -> str:
+        return str(self.metadata.get("/Title", "") or "")
+    
+    def language(self) -> str:
+        # PdfObject 문자열 변환은 값마다 한 번만
+        lang = str(self.metadata.get("/Lang", "") or "")
+        if lang.strip():
+            return lang
+        return str(self.root.get("/Lang", "") or "")
+    
+    def has_first_page_text(self, min_chars: int = MIN_TEXT_CHARS) -> bool:
+        if not self.page_count:
+            return False
+        
+        # 공백을 제외한 문자가 min_chars를 넘는 즉시 추출 중단
+        seen = 0
+        
+        def _visitor(text, cm, tm, font_dict, font_size):
+            nonlocal seen
+            seen += len(text.strip())
+            if seen > min_chars:
+                raise _EarlyExit
+        
+        try:
+            text = self.reader.pages[0].extract_text(visitor_text=_visitor)
+        except _EarlyExit:
+            return True
+        return len(text.strip()) > min_chars
+    
+    def has_struct_tree(self) -> bool:
+        return "/StructTreeRoot" in self.root
+    
+    def is_marked(self) -> bool:
+        mark_info = self.root.get("/MarkInfo")
+        mark_info = mark_info.get_object() if mark_info is not None else {}
+        return isinstance(mark_info, dict) and bool(mark_info.get("/Marked", False))
+    
+    def close(self) -> None:
+        pass
+
+
+DocumentType = Union[_PyMuPDFDocument, _PyPDFDocument]
+
 
 class AccessibilityValidator:
     """
@@ -30,13 +230,37 @@ class AccessibilityValidator:
         self.wcag_level = self.config.get("wcag_level", "AA")
         self.strict_mode = self.config.get("strict_mode", False)
         self.external_tool = self.config.get("external_tool", "")
+        self.backend = self.config.get("backend", "pymupdf")
+        if self.backend not in BACKENDS:
+            raise ValueError(f"지원하지 않는 검증 백엔드: {self.backend} (지원: {', '.join(BACKENDS)})")
+        
+        # 검증 결과 캐시 (LRU, 같은 파일을 다시 검증하면 재사용, 기본값 0: 끔)
+        # 파이프라인 출력 파일은 매번 새 파일이라 캐시되지 않으므로, 같은 파일을 다시
+        # 검증하는 호출자만 켜도록 함 (content는 검증마다 파일 전체를 해시)
+        self.cache_size = self.config.get("cache_size", 0)
+        self.cache_by = self.config.get("cache_by", "stat")
+        if self.cache_by not in CACHE_BY:
+            raise ValueError(f"지원하지 않는 캐시 키 방식: {self.cache_by} (지원: {', '.join(CACHE_BY)})")
+        self._results: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+        
+        # 이 크기 이상의 파일은 메모리로 복사하지 않고 mmap으로 읽기 (0이면 항상 복사)
+        self.mmap_threshold = self.config.get("mmap_threshold", MMAP_THRESHOLD)
+        
+        # veraPDF JVM 시작 비용을 줄이기 위한 실행 방식
+        self.verapdf_mode = self.config.get("verapdf_mode", "cli")
+        if self.verapdf_mode not in VERAPDF_MODES:
+            raise ValueError(f"지원하지 않는 veraPDF 실행 방식: {self.verapdf_mode} (지원: {', '.join(VERAPDF_MODES)})")
+        self.verapdf_url = self.config.get("verapdf_url", "http://localhost:8080/api/validate/auto")
+        self.verapdf_timeout = self.config.get("verapdf_timeout", 120)
     
-    def validate(self, pdf_path: str) -> Dict[str, Any]:
+    def validate(self, pdf_path: str, checks: Optional[Iterable[str]] = None) -> Dict[str, Any]:
         """
         PDF 접근성 검증
         
         Args:
             pdf_path: 검증할 PDF 파일 경로
+            checks: 수행할 검사 (CHECKS 중 선택, None이면 전체).
+                건너뛴 검사는 감점하지 않으며 wcag_compliance에서 해당 항목이 빠집니다.
             
         Returns:
             {
@@ -44,73 +268,114 @@ class AccessibilityValidator:
                 "warnings": List[str],
                 "issues": List[str],
                 "score": float,
-                "wcag_compliance": Dict[str, bool]
+                "wcag_compliance": Dict[str, bool],
+                "failed_checks": List[str]
             }
         """
+        checks = set(CHECKS) if checks is None else set(checks)
+        unknown = checks - set(CHECKS)
+        if unknown:
+            raise ValueError(f"지원하지 않는 검사: {', '.join(sorted(unknown))} (지원: {', '.join(CHECKS)})")
+        
         logger.info(f"접근성 검증 시작: {pdf_path}")
         
         warnings = []
         issues = []
         wcag_compliance = {}
+        failed_checks = []
         score = 100.0
         
+        doc = None
+        data = None
+        external_executor = None
         try:
-            reader = PdfReader(pdf_path)
+            # 빈 파일이나 PDF가 아닌 파일은 파싱 없이 바로 거부
+            if not _quick_is_pdf(pdf_path):
+                logger.warning(f"PDF 파일이 아님: {pdf_path}")
+                return _error_result("PDF 파일이 아님 (빈 파일이거나 %PDF- 헤더 없음)")
+            
+            # 파일은 한 번만 읽어 내용 해시와 pypdf 파싱에 함께 사용
+            if self.backend == "pypdf" or (self.cache_size and self.cache_by == "content"):
+                data = self._read_pdf(pdf_path)
+            
+            cache_key = self._result_cache_key(pdf_path, checks, data)
+            if cache_key in self._results:
+                self._results.move_to_end(cache_key)
+                logger.info("접근성 검증 캐시 사용")
+                return _copy_result(self._results[cache_key])
+            
+            # 외부 검증 도구(veraPDF)는 별도 프로세스/서버에서 실행되므로 로컬 검사와 동시에 진행
+            external_future = None
+            if "external" in checks and self.external_tool:
+                external_executor = ThreadPoolExecutor(max_workers=1)
+                external_future = external_executor.submit(self._run_external_validator, pdf_path)
+            
+            doc = self._open(pdf_path, data)
             
             # 1. 메타데이터 확인
-            metadata_result = self._check_metadata(reader)
-            if not metadata_result["passed"]:
-                issues.extend(metadata_result["issues"])
-                warnings.extend(metadata_result["warnings"])
-                score -= 20.0
+            if "metadata" in checks:
+                metadata_result = self._check_metadata(doc)
+                if not metadata_result["passed"]:
+                    issues.extend(metadata_result["issues"])
+                    warnings.extend(metadata_result["warnings"])
+                    score -= CHECK_PENALTIES["metadata"]
+                    failed_checks.append("metadata")
+                wcag_compliance["title_metadata"] = metadata_result.get("has_title", False)
+                wcag_compliance["language_metadata"] = metadata_result.get("has_language", False)
             
             # 2. 텍스트 접근성 확인
-            text_result = self._check_text_accessibility(reader)
-            if not text_result["passed"]:
-                issues.extend(text_result["issues"])
-                warnings.extend(text_result["warnings"])
-                score -= 30.0
+            if "text" in checks:
+                text_result = self._check_text_accessibility(doc)
+                if not text_result["passed"]:
+                    issues.extend(text_result["issues"])
+                    warnings.extend(text_result["warnings"])
+                    score -= CHECK_PENALTIES["text"]
+                    failed_checks.append("text")
+                wcag_compliance["text_selectable"] = text_result.get("text_selectable", False)
             
             # 3. 구조 트리 확인 (기본 검사)
-            structure_result = self._check_structure_tree(reader)
-            if not structure_result["passed"]:
-                if self.strict_mode:
-                    issues.extend(structure_result["issues"])
-                else:
-                    warnings.extend(structure_result["issues"])
-                score -= 25.0
+            if "structure" in checks:
+                structure_result = self._check_structure_tree(doc)
+                if not structure_result["passed"]:
+                    if self.strict_mode:
+                        issues.extend(structure_result["issues"])
+                    else:
+                        warnings.extend(structure_result["issues"])
+                    score -= CHECK_PENALTIES["structure"]
+                    failed_checks.append("structure")
+                wcag_compliance["structure_tree"] = structure_result.get("has_structure", False)
             
             # 4. 읽기 순서 확인
-            reading_order_result = self._check_reading_order(reader)
-            if not reading_order_result["passed"]:
-                warnings.extend(reading_order_result["issues"])
-                score -= 15.0
+            if "reading" in checks:
+                reading_order_result = self._check_reading_order(doc)
+                if not reading_order_result["passed"]:
+                    warnings.extend(reading_order_result["issues"])
+                    score -= CHECK_PENALTIES["reading"]
+                    failed_checks.append("reading")
             
             # 5. 이미지 대체 텍스트 확인 (기본 검사)
-            alt_text_result = self._check_alt_text(reader)
-            if not alt_text_result["passed"]:
-                warnings.extend(alt_text_result["issues"])
-                score -= 10.0
-
+            if "alt" in checks:
+                alt_text_result = self._check_alt_text(doc)
+                if not alt_text_result["passed"]:
+                    warnings.extend(alt_text_result["issues"])
+                    score -= CHECK_PENALTIES["alt"]
+                    failed_checks.append("alt")
+                wcag_compliance["alt_text"] = alt_text_result.get("has_alt_text", False)
+            
             # 6. 외부 검증 도구 연동 (선택)
-            external_result = self._run_external_validator(pdf_path)
-            if external_result["issues"]:
-                if self.strict_mode:
-                    issues.extend(external_result["issues"])
+            if "external" in checks:
+                if external_future is not None:
+                    external_result = external_future.result()
                 else:
-                    warnings.extend(external_result["issues"])
+                    external_result = self._run_external_validator(pdf_path)
+                if external_result["issues"]:
+                    if self.strict_mode:
+                        issues.extend(external_result["issues"])
+                    else:
+                        warnings.extend(external_result["issues"])
             
             score = max(score, 0.0)
             
-            # WCAG 준수 결과
-            wcag_compliance = {
-                "title_metadata": metadata_result.get("has_title", False),
-                "language_metadata": metadata_result.get("has_language", False),
-                "text_selectable": text_result.get("text_selectable", False),
-                "structure_tree": structure_result.get("has_structure", False),
-                "alt_text": alt_text_result.get("has_alt_text", False)
-            }
-            
             passed = len(issues) == 0 and (score >= 70.0 or not self.strict_mode)
             
             result = {
@@ -119,29 +384,214 @@ class AccessibilityValidator:
                 "issues": issues,
                 "score": score,
                 "wcag_compliance": wcag_compliance,
-                "page_count": len(reader.pages)
+                "failed_checks": failed_checks,
+                "page_count": doc.page_count
             }
             
+            if cache_key is not None:
+                self._results[cache_key] = _copy_result(result)
+                if len(self._results) > self.cache_size:
+                    self._results.popitem(last=False)
+            
             logger.info(f"접근성 검증 완료: {'통과' if passed else '실패'} (점수: {score:.1f})")
             return result
             
         except Exception as e:
             logger.error(f"접근성 검증 실패: {e}", exc_info=True)
-            return {
-                "passed": False,
-                "warnings": [],
-                "issues": [f"검증 오류: {str(e)}"],
-                "score": 0.0,
-                "wcag_compliance": {},
-                "page_count": 0
-            }
+            return _error_result(f"검증 오류: {str(e)}")
+        finally:
+            if doc is not None:
+                doc.close()
+            if isinstance(data, mmap.mmap):
+                data.close()
+            if external_executor is not None:
+                # 로컬 검사가 실패한 경우 외부 검증 완료를 기다리지 않음
+                external_executor.shutdown(wait=False)
+    
+    def validate_batch(
+        self,
+        pdf_paths: List[str],
+        workers: Optional[int] = None,
+        checks: Optional[Iterable[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        여러 PDF를 프로세스 풀에서 병렬 검증
+        
+        각 워커가 PDF를 하나씩 순서대로 검증하므로 외부 검증 도구(veraPDF)도
+        워커당 한 번에 하나만 실행됩니다. verapdf_mode가 batch이면 워커는 외부 검사를
+        건너뛰고, 모든 파일을 한 번의 veraPDF 실행(명령줄 길이 제한을 넘으면 몇 번)으로
+        워커 검증과 동시에 검증해 결과에 합칩니다. 워커는 결과 캐시를 사용하지 않습니다.
+        
+        Args:
+            pdf_paths: 검증할 PDF 파일 경로 리스트
+            workers: 프로세스 수 (기본: CPU 수)
+            checks: 수행할 검사 (validate와 동일)
+            
+        Returns:
+            pdf_paths 순서의 validate() 결과 리스트
+        """
+        checks = set(CHECKS) if checks is None else set(checks)
+        batch_external = (
+            self.verapdf_mode == "batch"
+            and (self.external_tool or "").lower() == "verapdf"
+            and "external" in checks
+            and len(pdf_paths) > 0
+        )
+        if not batch_external:
+            return self._validate_local(pdf_paths, workers, checks)
+        
+        checks.discard("external")
+        
+        # veraPDF는 별도 프로세스이므로 워커 검증과 동시에 실행
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            external_future = executor.submit(self._run_verapdf_batch, pdf_paths)
+            results = self._validate_local(pdf_paths, workers, checks)
+            external_results = external_future.result()
+        
+        for result, external_result in zip(results, external_results):
+            if not external_result["issues"]:
+                continue
+            if self.strict_mode:
+                result["issues"].extend(external_result["issues"])
+            else:
+                result["warnings"].extend(external_result["issues"])
+            result["passed"] = len(result["issues"]) == 0 and (result["score"] >= 70.0 or not self.strict_mode)
+        
+        return results
+    
+    def _validate_local(
+        self,
+        pdf_paths: List[str],
+        workers: Optional[int],
+        checks: set
+    ) -> List[Dict[str, Any]]:
+        """
+        validate_batch의 파일별 검증 (프로세스 풀, 실패하면 순차 검증)
+        
+        Args:
+            pdf_paths: 검증할 PDF 파일 경로 리스트
+            workers: 프로세스 수 (None이면 CPU 수)
+            checks: 수행할 검사
+            
+        Returns:
+            pdf_paths 순서의 validate() 결과 리스트
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        workers = min(workers, len(pdf_paths))
+        
+        if workers <= 1:
+            return [self.validate(pdf_path, checks) for pdf_path in pdf_paths]
+        
+        # 워커 부하를 고르게 하기 위해 워커 수의 약 4배로 나누어 전달
+        chunksize = max(1, len(pdf_paths) // (4 * workers))
+        worker_config = {**self.config, "cache_size": 0}
+        
+        logger.info(f"일괄 접근성 검증: PDF {len(pdf_paths)}개, 프로세스 {workers}개")
+        
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                return list(executor.map(
+                    _validate_one, pdf_paths, repeat(worker_config), repeat(checks),
+                    chunksize=chunksize
+                ))
+        except Exception as e:
+            logger.warning(f"병렬 검증 실패, 순차 검증으로 전환: {e}")
+            return [self.validate(pdf_path, checks) for pdf_path in pdf_paths]
+    
+    def validate_metadata_only(self, pdf_path: str) -> Dict[str, Any]:
+        """
+        메타데이터(제목/언어)만 검증 (텍스트 추출, 외부 도구 실행 없음)
+        
+        Args:
+            pdf_path: 검증할 PDF 파일 경로
+            
+        Returns:
+            validate()와 같은 형식의 결과
+        """
+        return self.validate(pdf_path, checks={"metadata"})
+    
+    def clear_cache(self) -> None:
+        """검증 결과 캐시 비우기"""
+        self._results.clear()
+    
+    def _result_cache_key(
+        self,
+        pdf_path: str,
+        checks: set,
+        data: Optional[Union[bytes, mmap.mmap]] = None
+    ) -> Optional[tuple]:
+        """
+        검증 결과 캐시 키 생성 (캐시를 쓰지 않으면 None)
+        
+        cache_by가 content이면 파일 내용(SHA-256)으로, stat이면 경로와 수정 시각/크기로
+        구분합니다. 검증 설정은 인스턴스마다 고정이므로 키에 포함하지 않습니다.
+        
+        Args:
+            pdf_path: PDF 파일 경로
+            checks: 수행할 검사
+            data: 이미 읽은 파일 내용 (있으면 파일을 다시 읽지 않고 해시)
+            
+        Returns:
+            캐시 키 또는 None
+        """
+        if not self.cache_size:
+            return None
+        
+        if self.cache_by == "stat":
+            stat = os.stat(pdf_path)
+            file_key = (os.path.abspath(pdf_path), stat.st_mtime_ns, stat.st_size)
+        else:
+            digest = hashlib.sha256()
+            if data is not None:
+                digest.update(data)
+            else:
+                with open(pdf_path, "rb") as f:
+                    for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                        digest.update(chunk)
+            file_key = digest.hexdigest()
+        
+        return (file_key, frozenset(checks))
     
-    def _check_metadata(self, reader: PdfReader) -> Dict[str, Any]:
+    def _read_pdf(self, pdf_path: str) -> Union[bytes, mmap.mmap]:
+        """
+        PDF 파일 내용을 한 번에 읽기
+        
+        mmap_threshold 이상인 파일은 복사 없이 읽기 전용 mmap으로 엽니다.
+        
+        Args:
+            pdf_path: PDF 파일 경로
+            
+        Returns:
+            파일 내용 (bytes 또는 mmap, mmap은 호출한 쪽에서 닫아야 함)
+        """
+        with open(pdf_path, "rb", buffering=0) as f:
+            size = os.fstat(f.fileno()).st_size
+            if self.mmap_threshold and size >= self.mmap_threshold:
+                return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            return f.read()
+    
+    def _open(self, pdf_path: str, data: Optional[Union[bytes, mmap.mmap]] = None) -> DocumentType:
+        """
+        설정한 백엔드로 PDF 열기
+        
+        Args:
+            pdf_path: PDF 파일 경로
+            data: 이미 읽은 파일 내용 (_read_pdf 결과, 없으면 경로로 열기)
+            
+        Returns:
+            검증용 문서 (title/language/has_first_page_text/has_struct_tree/is_marked 제공)
+        """
+        if self.backend == "pypdf":
+            return _PyPDFDocument(pdf_path, data)
+        return _PyMuPDFDocument(pdf_path, data)
+    
+    def _check_metadata(self, doc: DocumentType) -> Dict[str, Any]:
         """
         메타데이터 검사
         
         Args:
-            reader: PdfReader 객체
+            doc: 검증용 문서 (_open 결과)
             
         Returns:
             검사 결과
@@ -154,31 +604,29 @@ class AccessibilityValidator:
             "warnings": []
         }
         
-        metadata = reader.metadata or {}
-        
         # 제목 확인
-        title = metadata.get("/Title", "")
-        if title and str(title).strip():
+        title = doc.title()
+        if title and title.strip():
             result["has_title"] = True
         else:
             result["issues"].append("제목 메타데이터 없음")
             result["passed"] = False
         
         # 언어 확인
-        lang = metadata.get("/Lang", "")
-        if lang and str(lang).strip():
+        lang = doc.language()
+        if lang and lang.strip():
             result["has_language"] = True
         else:
             result["warnings"].append("언어 메타데이터 없음")
         
         return result
     
-    def _check_text_accessibility(self, reader: PdfReader) -> Dict[str, Any]:
+    def _check_text_accessibility(self, doc: DocumentType) -> Dict[str, Any]:
         """
         텍스트 접근성 검사
         
         Args:
-            reader: PdfReader 객체
+            doc: 검증용 문서 (_open 결과)
             
         Returns:
             검사 결과
@@ -192,9 +640,8 @@ class AccessibilityValidator:
         
         try:
             # 첫 페이지에서 텍스트 추출 시도
-            if reader.pages:
-                text = reader.pages[0].extract_text()
-                if text and len(text.strip()) > 10:
+            if doc.page_count:
+                if doc.has_first_page_text():
                     result["text_selectable"] = True
                 else:
                     result["warnings"].append("텍스트 추출 어려움 (이미지 기반 PDF일 수 있음)")
@@ -205,17 +652,17 @@ class AccessibilityValidator:
         
         return result
     
-    def _check_structure_tree(self, reader: PdfReader) -> Dict[str, Any]:
+    def _check_structure_tree(self, doc: DocumentType) -> Dict[str, Any]:
         """
         구조 트리 검사
         
         Args:
-            reader: PdfReader 객체
+            doc: 검증용 문서 (_open 결과)
             
         Returns:
             검사 결과
             
-        Note: PyPDF는 구조 트리 접근이 제한적이므로 기본 검사만 수행
+        Note: 카탈로그의 StructTreeRoot/MarkInfo 존재 여부만 기본 검사
         """
         result = {
             "passed": False,
@@ -224,29 +671,26 @@ class AccessibilityValidator:
         }
         
         try:
-            # 구조 트리 확인 (PyPDF 제한으로 기본 검사)
+            # 구조 트리 확인 (기본 검사)
             # 실제 구현에서는 PAC 3 같은 도구를 사용해야 합니다.
-            root = reader.trailer.get("/Root", {})
-            if isinstance(root, dict):
-                if "/StructTreeRoot" in root:
-                    result["has_structure"] = True
-                    result["passed"] = True
-                else:
-                    result["issues"].append("구조 트리(StructTreeRoot) 없음")
-                mark_info = root.get("/MarkInfo", {})
-                if not isinstance(mark_info, dict) or not mark_info.get("/Marked", False):
-                    result["issues"].append("Marked PDF 플래그 없음")
+            if doc.has_struct_tree():
+                result["has_structure"] = True
+                result["passed"] = True
+            else:
+                result["issues"].append("구조 트리(StructTreeRoot) 없음")
+            if not doc.is_marked():
+                result["issues"].append("Marked PDF 플래그 없음")
         except Exception as e:
             result["issues"].append(f"구조 트리 확인 실패: {e}")
         
         return result
     
-    def _check_reading_order(self, reader: PdfReader) -> Dict[str, Any]:
+    def _check_reading_order(self, doc: DocumentType) -> Dict[str, Any]:
         """
         읽기 순서 검사
         
         Args:
-            reader: PdfReader 객체
+            doc: 검증용 문서 (_open 결과)
             
         Returns:
             검사 결과
@@ -262,12 +706,12 @@ class AccessibilityValidator:
         # 현재는 기본 통과로 처리
         return result
     
-    def _check_alt_text(self, reader: PdfReader) -> Dict[str, Any]:
+    def _check_alt_text(self, doc: DocumentType) -> Dict[str, Any]:
         """
         대체 텍스트 검사
         
         Args:
-            reader: PdfReader 객체
+            doc: 검증용 문서 (_open 결과)
             
         Returns:
             검사 결과
@@ -290,7 +734,7 @@ class AccessibilityValidator:
         """
         외부 접근성 검증 도구 실행 (선택).
 
-        지원: veraPDF (external_tool=verapdf)
+        지원: veraPDF (external_tool=verapdf, verapdf_mode=cli/batch이면 CLI, rest이면 REST 서버)
         """
         result = {"issues": []}
         tool = (self.external_tool or "").lower()
@@ -298,48 +742,198 @@ class AccessibilityValidator:
             return result
 
         if tool == "verapdf":
-            try:
-                completed = subprocess.run(
-                    ["verapdf", "--format", "json", pdf_path],
-                    check=False,
-                    capture_output=True,
-                    text=True
-                )
-                if completed.returncode != 0:
-                    result["issues"].append("veraPDF 실행 실패 또는 비정상 종료")
-                    return result
-                payload = json.loads(completed.stdout or "{}")
-                violations = payload.get("validationResult", {}).get("details", [])
-                if violations:
-                    result["issues"].append(f"veraPDF 위반 항목 {len(violations)}개")
-            except FileNotFoundError:
-                result["issues"].append("veraPDF 실행 파일을 찾을 수 없음")
-            except json.JSONDecodeError:
-                result["issues"].append("veraPDF 결과 파싱 실패")
-            except Exception as exc:
-                result["issues"].append(f"veraPDF 검증 오류: {exc}")
+            if self.verapdf_mode == "rest":
+                return self._run_verapdf_rest(pdf_path)
+            return self._run_verapdf_cli([pdf_path])[0]
         else:
             result["issues"].append(f"지원되지 않는 외부 검증 도구: {tool}")
 
         return result
     
-    def calculate_ai_friendliness_score(self, pdf_path: str) -> float:
+    def _run_verapdf_batch(self, pdf_paths: List[str]) -> List[Dict[str, Any]]:
+        """
+        명령줄 길이 제한(VERAPDF_MAX_COMMAND_LENGTH) 안에서 최소 횟수로 veraPDF CLI 실행
+
+        Args:
+            pdf_paths: PDF 파일 경로 리스트
+
+        Returns:
+            pdf_paths 순서의 {"issues": List[str]} 리스트
+        """
+        results = []
+        group = []
+        length = 0
+        for pdf_path in pdf_paths:
+            if group and length + len(pdf_path) + 1 > VERAPDF_MAX_COMMAND_LENGTH:
+                results.extend(self._run_verapdf_cli(group))
+                group = []
+                length = 0
+            group.append(pdf_path)
+            length += len(pdf_path) + 1
+        if group:
+            results.extend(self._run_verapdf_cli(group))
+        return results
+
+    def _run_verapdf_cli(self, pdf_paths: List[str]) -> List[Dict[str, Any]]:
+        """
+        veraPDF CLI를 한 번 실행해 여러 PDF 검증 (JVM 시작은 한 번만)
+
+        제한 시간은 파일당 verapdf_timeout초로, 파일 수만큼 늘어납니다.
+
+        Args:
+            pdf_paths: PDF 파일 경로 리스트
+
+        Returns:
+            pdf_paths 순서의 {"issues": List[str]} 리스트
+        """
+        results = [{"issues": []} for _ in pdf_paths]
+
+        def fail(message: str) -> List[Dict[str, Any]]:
+            for result in results:
+                result["issues"].append(message)
+            return results
+
+        try:
+            completed = subprocess.run(
+                [
+                    "verapdf", "--format", "json",
+                    "--maxfailuresdisplayed", str(VERAPDF_MAX_FAILURES_DISPLAYED),
+                    *pdf_paths
+                ],
+                check=False,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                timeout=self.verapdf_timeout * len(pdf_paths)
+            )
+            if completed.returncode != 0:
+                return fail("veraPDF 실행 실패 또는 비정상 종료")
+            # 보고서는 문자열로 디코딩하지 않고 바이트 그대로 파싱
+            payload = _loads_json(completed.stdout or b"{}")
+        except FileNotFoundError:
+            return fail("veraPDF 실행 파일을 찾을 수 없음")
+        except subprocess.TimeoutExpired:
+            return fail(f"veraPDF 시간 초과 ({self.verapdf_timeout * len(pdf_paths)}초)")
+        except json.JSONDecodeError:
+            return fail("veraPDF 결과 파싱 실패")
+        except Exception as exc:
+            return fail(f"veraPDF 검증 오류: {exc}")
+
+        report_jobs = payload.get("report", {}).get("jobs", [])
+        if len(pdf_paths) == 1:
+            # 파일 하나의 결과도 report.jobs로 출력하는 버전이 있으므로 두 형식 모두 처리
+            results[0]["issues"].extend(self._verapdf_issues(report_jobs[0] if report_jobs else payload))
+            return results
+
+        # 여러 파일이면 report.jobs의 파일 이름으로 결과를 나눔
+        jobs = {}
+        for job in report_jobs:
+            name = job.get("itemDetails", {}).get("name")
+            if name:
+                jobs[os.path.abspath(name)] = job
+        for pdf_path, result in zip(pdf_paths, results):
+            job = jobs.get(os.path.abspath(pdf_path))
+            if job is None:
+                result["issues"].append("veraPDF 결과 없음")
+            else:
+                result["issues"].extend(self._verapdf_issues(job))
+
+        return results
+
+    def _run_verapdf_rest(self, pdf_path: str) -> Dict[str, Any]:
+        """
+        실행 중인 veraPDF REST 서버로 PDF 검증 (verapdf_url)
+
+        Args:
+            pdf_path: PDF 파일 경로
+
+        Returns:
+            {"issues": List[str]}
+        """
+        result = {"issues": []}
+
+        try:
+            boundary = uuid.uuid4().hex
+            body = b"".join([
+                f"--{boundary}\r\n".encode("ascii"),
+                f'Content-Disposition: form-data; name="file"; filename="{Path(pdf_path).name}"\r\n'.encode("utf-8"),
+                b"Content-Type: application/pdf\r\n\r\n",
+                Path(pdf_path).read_bytes(),
+                f"\r\n--{boundary}--\r\n".encode("ascii")
+            ])
+            request = urllib.request.Request(
+                self.verapdf_url,
+                data=body,
+                headers={
+                    "Content-Type": f"multipart/form-data; boundary={boundary}",
+                    "Accept": "application/json"
+                }
+            )
+            with urllib.request.urlopen(request, timeout=self.verapdf_timeout) as response:
+                payload = _loads_json(response.read() or b"{}")
+
+            # REST 응답은 단일 작업 보고서 (report.jobs[0]) 또는 검증 결과
+            jobs = payload.get("report", {}).get("jobs")
+            result["issues"].extend(self._verapdf_issues(jobs[0] if jobs else payload))
+        except urllib.error.URLError as exc:
+            result["issues"].append(f"veraPDF REST 서버 연결 실패: {exc}")
+        except json.JSONDecodeError:
+            result["issues"].append("veraPDF 결과 파싱 실패")
+        except Exception as exc:
+            result["issues"].append(f"veraPDF 검증 오류: {exc}")
+
+        return result
+
+    def _verapdf_issues(self, report: Dict[str, Any]) -> List[str]:
+        """
+        veraPDF 검증 결과에서 위반 항목 요약
+
+        Args:
+            report: 파일 하나의 veraPDF 결과 (validationResult 포함)
+
+        Returns:
+            이슈 메시지 리스트
+        """
+        validation_result = report.get("validationResult", {})
+        if isinstance(validation_result, list):
+            validation_result = validation_result[0] if validation_result else {}
+
+        violations = validation_result.get("details", [])
+        if violations:
+            return [f"veraPDF 위반 항목 {len(violations)}개"]
+        return []
+    
+    def calculate_ai_friendliness_score(
+        self,
+        pdf_path: str,
+        validation_result: Optional[Dict[str, Any]] = None
+    ) -> float:
         """
         AI 친화성 점수 계산
         
         Args:
             pdf_path: PDF 파일 경로
+            validation_result: 같은 파일의 validate() 결과 (메타데이터/텍스트/구조 검사를
+                포함하면 파일을 다시 읽지 않고 재사용)
             
         Returns:
             점수 (0-100)
         """
-        validation_result = self.validate(pdf_path)
-        
-        # 기본 점수
-        score = validation_result.get("score", 0.0)
+        validation_result = validation_result or {}
+        wcag = validation_result.get("wcag_compliance", {})
+        failed_checks = validation_result.get("failed_checks")
+        if failed_checks is not None and all(key in wcag for key in SCORE_WCAG_KEYS):
+            # 다른 검사의 감점이 섞인 점수 대신 SCORE_CHECKS 감점만 다시 계산
+            # (wcag_compliance 값은 감점 여부와 다를 수 있으므로 failed_checks 기준)
+            score = 100.0 - sum(CHECK_PENALTIES[check] for check in SCORE_CHECKS if check in failed_checks)
+        else:
+            # 점수에 영향이 없는 검사(읽기 순서/대체 텍스트 기본 검사, 외부 도구)는 건너뜀
+            validation_result = self.validate(pdf_path, checks=SCORE_CHECKS)
+            
+            # 기본 점수
+            score = validation_result.get("score", 0.0)
+            wcag = validation_result.get("wcag_compliance", {})
         
         # AI 친화성 가중치 적용
-        wcag = validation_result.get("wcag_compliance", {})
         
         if wcag.get("structure_tree"):
             score += 10.0
@@ -352,3 +946,90 @@ class AccessibilityValidator:
         
         return min(score, 100.0)
 
+
+def _loads_json(data: Union[str, bytes]) -> Any:
+    """
+    JSON 파싱 (orjson이 있으면 사용, 오류는 json.JSONDecodeError)
+    
+    Args:
+        data: JSON 문자열 또는 바이트
+        
+    Returns:
+        파싱 결과
+    """
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _quick_is_pdf(pdf_path: str) -> bool:
+    """
+    파일 앞부분만 읽어 PDF인지 빠르게 판별
+    
+    Args:
+        pdf_path: 파일 경로
+        
+    Returns:
+        앞부분에 "%PDF-" 헤더가 있으면 True (빈 파일은 False)
+    """
+    with open(pdf_path, "rb") as f:
+        return b"%PDF-" in f.read(PDF_HEADER_SEARCH_SIZE)
+
+
+def _copy_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    캐시용 검증 결과 복사 (deepcopy 대신 변경 가능한 항목만 복사)
+    
+    Args:
+        result: validate() 결과 (리스트/딕셔너리 항목은 문자열과 불리언만 담음)
+        
+    Returns:
+        호출한 쪽이 수정해도 원본에 영향을 주지 않는 복사본
+    """
+    return {
+        **result,
+        "warnings": list(result["warnings"]),
+        "issues": list(result["issues"]),
+        "wcag_compliance": dict(result["wcag_compliance"]),
+        "failed_checks": list(result["failed_checks"])
+    }
+
+
+def _error_result(issue: str) -> Dict[str, Any]:
+    """
+    검증하지 못한 파일의 결과 (0점, 실패)
+    
+    Args:
+        issue: 문제 항목
+        
+    Returns:
+        validate()와 같은 형식의 결과
+    """
+    return {
+        "passed": False,
+        "warnings": [],
+        "issues": [issue],
+        "score": 0.0,
+        "wcag_compliance": {},
+        "failed_checks": [],
+        "page_count": 0
+    }
+
+
+def _validate_one(
+    pdf_path: str,
+    config: Dict[str, Any],
+    checks: Optional[Iterable[str]] = None
+) -> Dict[str, Any]:
+    """
+    일괄 검증용 워커 함수: PDF 하나를 검증
+    
+    Args:
+        pdf_path: PDF 파일 경로
+        config: 검증 설정
+        checks: 수행할 검사
+        
+    Returns:
+        validate() 결과
+    """
+    return AccessibilityValidator(config).validate(pdf_path, checks)
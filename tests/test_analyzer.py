@@ -0,0 +1,89 @@
+"""
+구조 분석기 테스트
+"""
+
+import pytest
+
+from src.analyzer.structure_analyzer import StructureAnalyzer
+
+
+@pytest.fixture
+def analyzer():
+    """API 호출 없이 사용할 StructureAnalyzer"""
+    return StructureAnalyzer(api_key="sk-test")
+
+
+class TestFallbackStructure:
+    """규칙 기반 Fallback 구조 테스트"""
+    
+    def test_tags_by_rule(self, analyzer):
+        """폰트/타입 규칙에 따른 태그 할당"""
+        elements = [
+            {"type": "text", "font_info": {"size": 24, "flags": 16}, "bbox": [0, 50, 100, 80]},
+            {"type": "text", "font_info": {"size": 16, "flags": 16}, "bbox": [0, 300, 100, 320]},
+            {"type": "text", "font_info": {"size": 14, "flags": 16}, "bbox": [0, 400, 100, 420]},
+            {"type": "text", "font_info": {"size": 11, "flags": 0}, "bbox": [0, 500, 100, 520]},
+            {"type": "image", "font_info": {}, "bbox": [0, 600, 100, 700]},
+            {"type": "table", "font_info": {}, "bbox": [0, 700, 100, 800]}
+        ]
+        
+        structure = analyzer._fallback_structure(elements)
+        tags = [structure["hierarchy"][f"element_{i}"]["tag"] for i in range(len(elements))]
+        
+        assert tags == ["H1", "H2", "H3", "P", "Figure", "Table"]
+        assert structure["hierarchy"]["element_0"]["level"] == 1
+        assert structure["hierarchy"]["element_3"]["level"] == 0
+        assert structure["reading_order"] == [f"element_{i}" for i in range(len(elements))]
+    
+    def test_only_first_h1(self, analyzer):
+        """H1 후보가 여러 개면 첫 번째만 H1, 나머지는 H2"""
+        elements = [
+            {"type": "text", "font_info": {"size": 24, "flags": 16}, "bbox": [0, 50, 100, 80]},
+            {"type": "text", "font_info": {"size": 24, "flags": 16}, "bbox": [0, 100, 100, 130]}
+        ]
+        
+        hierarchy = analyzer._fallback_structure(elements)["hierarchy"]
+        
+        assert hierarchy["element_0"]["tag"] == "H1"
+        assert hierarchy["element_1"]["tag"] == "H2"
+    
+    def test_empty_elements(self, analyzer):
+        """빈 요소 리스트"""
+        structure = analyzer._fallback_structure([])
+        assert structure["hierarchy"] == {}
+        assert structure["reading_order"] == []
+
+
+
+class TestAsyncClient:
+    """이벤트 루프별 AsyncOpenAI 클라이언트 테스트"""
+    
+    def test_new_client_per_event_loop(self, analyzer):
+        """같은 루프에서는 재사용하고, 루프가 바뀌면 새 클라이언트 사용"""
+        import asyncio
+        
+        async def get_twice():
+            first = analyzer._get_aclient()
+            assert analyzer._get_aclient() is first
+            return first
+        
+        first = asyncio.run(get_twice())
+        second = asyncio.run(get_twice())
+        
+        assert second is not first
+    
+    def test_aclose_releases_client(self, analyzer):
+        """aclose 후에는 같은 루프에서도 새 클라이언트 생성"""
+        import asyncio
+        
+        async def run():
+            first = analyzer._get_aclient()
+            await analyzer.aclose()
+            return first, analyzer._get_aclient()
+        
+        first, second = asyncio.run(run())
+        
+        assert second is not first
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,81 @@
+"""
+메인 파이프라인 테스트
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from src.main import PDFAutoTagger
+
+
+@pytest.fixture
+def sample_pdf(tmp_path):
+    """텍스트만 있는 샘플 PDF 생성"""
+    import fitz
+    
+    pdf_path = tmp_path / "sample.pdf"
+    doc = fitz.open()
+    for page_num in range(2):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Title {page_num}", fontsize=24)
+        page.insert_text((72, 200), f"Body text on page {page_num}", fontsize=11)
+    doc.save(str(pdf_path))
+    doc.close()
+    return str(pdf_path)
+
+
+@pytest.fixture
+def tagger():
+    """API 호출 대신 Fallback 구조를 돌려주는 PDFAutoTagger"""
+    tagger = PDFAutoTagger("sk-test")
+    
+    async def analyze(elements):
+        return tagger.analyzer._fallback_structure(elements)
+    
+    tagger.analyzer.analyze_structure_async = analyze
+    return tagger
+
+
+class TestProcess:
+    """PDFAutoTagger.process 동기 래퍼 테스트"""
+    
+    def test_repeated_calls(self, tagger, sample_pdf, tmp_path):
+        """호출마다 새 이벤트 루프에서 실행하고 구조 분석 클라이언트를 정리"""
+        with patch("src.main.TaggedPDFGenerator.generate", side_effect=lambda pdf, *args: pdf):
+            for _ in range(2):
+                result = tagger.process(sample_pdf, str(tmp_path / "out.pdf"))
+                assert result["status"] == "success"
+                assert tagger.analyzer._aclient is None
+    
+    def test_running_loop_rejected(self, tagger, sample_pdf, tmp_path):
+        """실행 중인 이벤트 루프에서는 process_async 사용을 안내하는 오류"""
+        async def call_sync():
+            tagger.process(sample_pdf, str(tmp_path / "out.pdf"))
+        
+        with pytest.raises(RuntimeError, match="process_async"):
+            asyncio.run(call_sync())
+
+
+class TestProcessBatch:
+    """PDFAutoTagger.process_batch 테스트"""
+    
+    def test_results_in_input_order(self, tagger, sample_pdf, tmp_path):
+        """파싱 실패가 섞여도 입력 순서대로 결과 반환"""
+        jobs = [
+            (sample_pdf, str(tmp_path / "out1.pdf")),
+            (str(tmp_path / "missing.pdf"), str(tmp_path / "out2.pdf")),
+            (sample_pdf, str(tmp_path / "out3.pdf"))
+        ]
+        
+        with patch("src.main.TaggedPDFGenerator.generate", side_effect=lambda pdf, *args: pdf):
+            results = asyncio.run(tagger.process_batch(jobs))
+        
+        assert [r["status"] for r in results] == ["success", "error", "success"]
+        assert results[0]["elements_processed"] == 4
+        assert results[0] == results[2]
+    
+    def test_empty_jobs(self, tagger):
+        """빈 작업 목록"""
+        assert asyncio.run(tagger.process_batch([])) == []
@@ -9,6 +9,35 @@ from unittest.mock import Mock, patch, MagicMock
 
 from src.parser.pdf_parser import PDFParser, PDFError, EncryptedPDFError
 from src.parser.content_extractor import ContentExtractor
+from src.parser.element_table import ElementTable
+
+
+@pytest.fixture
+def sample_pdf(tmp_path):
+    """텍스트만 있는 여러 페이지 샘플 PDF 생성"""
+    import fitz
+    
+    pdf_path = tmp_path / "sample.pdf"
+    doc = fitz.open()
+    for page_num in range(6):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Title {page_num}", fontsize=24)
+        page.insert_text((72, 200), f"Body text on page {page_num}", fontsize=11)
+    doc.save(str(pdf_path))
+    doc.close()
+    return str(pdf_path)
+
+
+@pytest.fixture(scope="session")
+def elements():
+    """필터/정렬 테스트용 요소 리스트 (테스트 간 공유, 수정하지 않음)"""
+    return [
+        {"type": "text", "page": 0, "bbox": [100, 200, 200, 250], "content": "Second"},
+        {"type": "text", "page": 0, "bbox": [100, 100, 200, 150], "content": "First"},
+        {"type": "image", "page": 1, "bbox": [100, 50, 200, 100], "content": ""},
+        {"type": "text", "page": 2, "bbox": [100, 50, 200, 100], "content": "Last page"},
+        {"type": "table", "page": 0, "bbox": [50, 150, 150, 200], "content": "Middle"}
+    ]
 
 
 class TestPDFParser:
@@ -72,60 +101,123 @@ class TestPDFParser:
         # 실제 PDF 파일이 없으면 스킵
         # TODO: 샘플 PDF 파일이 있을 때 실제 테스트 구현
         pass
+    
+    def test_parse_parallel_matches_sequential(self, sample_pdf, monkeypatch):
+        """병렬 파싱 결과가 순차 파싱과 동일하고 페이지 순서를 유지"""
+        monkeypatch.setattr("src.parser.pdf_parser.PARALLEL_MIN_PAGES", 4)
+        with PDFParser(sample_pdf) as parser:
+            sequential = parser.parse(workers=1)
+            parallel = parser.parse(workers=2)
+        
+        assert parallel == sequential
+        assert sequential["pages"] == 6
+        pages = [elem["page"] for elem in parallel["elements"]]
+        assert pages == sorted(pages)
+    
+    def test_parse_sequential_by_default(self, sample_pdf):
+        """workers를 지정하지 않거나 페이지 수가 적으면 프로세스 풀을 만들지 않음"""
+        from unittest.mock import patch
+        
+        with PDFParser(sample_pdf) as parser:
+            with patch("src.parser.pdf_parser.ProcessPoolExecutor") as mock_pool, \
+                    patch("src.parser.pdf_parser.os.cpu_count", return_value=8):
+                parser.parse()
+                parser.parse(workers=None)
+        
+        mock_pool.assert_not_called()
+    
+    def test_text_dict_cache(self, sample_pdf):
+        """같은 페이지의 get_text("dict") 결과를 재사용하고 close 시 비움"""
+        with PDFParser(sample_pdf) as parser:
+            first = parser.get_text_dict(0)
+            assert parser.get_text_dict(0) is first
+            assert parser.extract_text_blocks(0) == parser.extract_text_blocks(0)
+        
+        assert not parser._page_text_cache
 
 
 class TestContentExtractor:
     """ContentExtractor 클래스 테스트"""
     
-    def test_filter_by_type(self):
+    @pytest.mark.parametrize("element_type, expected", [
+        ("text", 3),
+        ("image", 1),
+        ("table", 1),
+        ("missing", 0)
+    ])
+    def test_filter_by_type(self, elements, element_type, expected):
         """타입별 필터링 테스트"""
-        elements = [
-            {"type": "text", "content": "Hello"},
-            {"type": "image", "content": ""},
-            {"type": "text", "content": "World"},
-            {"type": "table", "content": "Data"}
-        ]
-        
-        text_elements = ContentExtractor.filter_by_type(elements, "text")
-        assert len(text_elements) == 2
-        assert all(elem["type"] == "text" for elem in text_elements)
+        filtered = ContentExtractor.filter_by_type(elements, element_type)
         
-        image_elements = ContentExtractor.filter_by_type(elements, "image")
-        assert len(image_elements) == 1
-        assert image_elements[0]["type"] == "image"
+        assert len(filtered) == expected
+        assert all(elem["type"] == element_type for elem in filtered)
     
-    def test_filter_by_page(self):
+    @pytest.mark.parametrize("page_num, expected", [(0, 3), (1, 1), (2, 1), (5, 0)])
+    def test_filter_by_page(self, elements, page_num, expected):
         """페이지별 필터링 테스트"""
-        elements = [
-            {"page": 0, "content": "Page 0"},
-            {"page": 1, "content": "Page 1"},
-            {"page": 0, "content": "Page 0 again"},
-            {"page": 2, "content": "Page 2"}
-        ]
+        filtered = ContentExtractor.filter_by_page(elements, page_num)
+        
+        assert len(filtered) == expected
+        assert all(elem["page"] == page_num for elem in filtered)
+    
+    @pytest.mark.parametrize("element_type", ["text", "image", "table", "missing"])
+    def test_filter_by_type_with_index(self, elements, element_type):
+        """build_index 인덱스를 사용한 타입별 필터링이 일반 필터링과 동일"""
+        index = ContentExtractor.build_index(elements)
         
-        page0_elements = ContentExtractor.filter_by_page(elements, 0)
-        assert len(page0_elements) == 2
-        assert all(elem["page"] == 0 for elem in page0_elements)
+        assert ContentExtractor.filter_by_type(elements, element_type, index=index) == \
+            ContentExtractor.filter_by_type(elements, element_type)
     
-    def test_sort_by_position(self):
-        """위치 순서 정렬 테스트"""
+    @pytest.mark.parametrize("page_num", [0, 1, 5])
+    def test_filter_by_page_with_index(self, elements, page_num):
+        """build_index 인덱스를 사용한 페이지별 필터링이 일반 필터링과 동일"""
+        index = ContentExtractor.build_index(elements)
+        
+        assert ContentExtractor.filter_by_page(elements, page_num, index=index) == \
+            ContentExtractor.filter_by_page(elements, page_num)
+    
+    def test_sort_by_position(self, elements):
+        """위치 순서 정렬 테스트 (페이지 → Y 좌표 순)"""
+        sorted_elements = ContentExtractor.sort_by_position(elements)
+        
+        assert [e["content"] for e in sorted_elements] == ["First", "Middle", "Second", "", "Last page"]
+    
+    def test_sort_by_position_large(self):
+        """임계값 이상 입력(numpy 경로)도 sorted와 같은 안정 정렬 결과"""
+        count = ContentExtractor.NUMPY_SORT_THRESHOLD * 2
         elements = [
-            {"page": 0, "bbox": [100, 200, 200, 250], "content": "Second"},
-            {"page": 0, "bbox": [100, 100, 200, 150], "content": "First"},
-            {"page": 1, "bbox": [100, 50, 200, 100], "content": "Third page"},
-            {"page": 0, "bbox": [50, 150, 150, 200], "content": "Middle"}
+            {"page": (i * 7) % 3, "bbox": [(i * 5) % 4, (i * 11) % 9, 0, 0], "index": i}
+            for i in range(count)
         ]
         
         sorted_elements = ContentExtractor.sort_by_position(elements)
+        expected = sorted(elements, key=lambda e: (e["page"], e["bbox"][1], e["bbox"][0]))
+        
+        assert [e["index"] for e in sorted_elements] == [e["index"] for e in expected]
+
+
+class TestElementTable:
+    """ElementTable 열 지향 컨테이너 테스트"""
+    
+    def test_roundtrip_and_queries(self):
+        """to_dicts 왕복 및 ContentExtractor와 같은 필터/정렬 결과"""
+        elements = [
+            {"page": 1, "type": "text", "bbox": [50, 200, 100, 220], "content": "c", "font_info": {"size": 11}},
+            {"page": 0, "type": "table", "bbox": [10, 300, 200, 400], "content": "t", "data": [["a"]],
+             "rows": 1, "cols": 1, "font_info": {}},
+            {"page": 0, "type": "text", "bbox": [10, 100, 60, 120], "content": "a", "font_info": {"size": 24}},
+            {"page": 1, "type": "image", "bbox": [10, 200, 40, 260], "content": "", "xref": 5, "font_info": {}}
+        ]
         
-        # 페이지 0의 요소들이 Y 좌표 순으로 정렬되어야 함
-        page0_sorted = [e for e in sorted_elements if e["page"] == 0]
-        assert page0_sorted[0]["bbox"][1] <= page0_sorted[1]["bbox"][1]
-        assert page0_sorted[1]["bbox"][1] <= page0_sorted[2]["bbox"][1]
+        table = ElementTable.from_elements(elements)
         
-        # 페이지 순서도 유지되어야 함
-        assert sorted_elements[0]["page"] == 0
-        assert sorted_elements[-1]["page"] == 1
+        assert len(table) == 4
+        assert table.to_dicts() == elements
+        assert table.sort_by_position().to_dicts() == ContentExtractor.sort_by_position(elements)
+        assert table.filter_by_page(1).to_dicts() == ContentExtractor.filter_by_page(elements, 1)
+        assert table.filter_by_type("text").to_dicts() == ContentExtractor.filter_by_type(elements, "text")
+        assert table.bounds(0) == [10.0, 100.0, 200.0, 400.0]
+        assert ElementTable.from_elements([]).bounds() == [0.0, 0.0, 0.0, 0.0]
 
 
 if __name__ == "__main__":
@@ -0,0 +1,689 @@
+"""
+태그 매칭 및 Alt 텍스트 생성 테스트
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from src.parser.pdf_parser import PDFParser
+from src.tagger.alt_text_generator import ALT_TEXT_RULES, AltTextCache, AltTextGenerator, AsyncRateLimiter
+from src.tagger.tag_matcher import TagMatcher
+
+
+@pytest.fixture
+def image_pdf(tmp_path):
+    """같은 이미지를 두 페이지에서 재사용하고 다른 이미지를 하나 더 가진 샘플 PDF"""
+    import fitz
+    
+    pdf_path = tmp_path / "images.pdf"
+    doc = fitz.open()
+    
+    logo = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 32, 32), False)
+    logo.clear_with(200)
+    photo = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 48, 24), False)
+    photo.clear_with(50)
+    
+    page = doc.new_page()
+    page.insert_text((72, 72), "Annual report", fontsize=24)
+    logo_xref = page.insert_image(fitz.Rect(72, 100, 172, 200), stream=logo.tobytes("png"))
+    page.insert_text((72, 220), "The company logo shown above", fontsize=11)
+    
+    page = doc.new_page()
+    page.insert_image(fitz.Rect(72, 100, 172, 200), xref=logo_xref)
+    page.insert_image(fitz.Rect(72, 300, 272, 400), stream=photo.tobytes("png"))
+    
+    doc.save(str(pdf_path))
+    doc.close()
+    return str(pdf_path)
+
+
+@pytest.fixture
+def elements(image_pdf):
+    """샘플 PDF 파싱 결과"""
+    with PDFParser(image_pdf) as parser:
+        return parser.parse(workers=1)["elements"]
+
+
+class TestGenerateAltTexts:
+    """TagMatcher.generate_alt_texts 테스트"""
+    
+    def test_disabled_without_api_key(self, elements, image_pdf):
+        """API 키가 없으면 생성하지 않음"""
+        assert TagMatcher().generate_alt_texts(elements, pdf_path=image_pdf) == {}
+    
+    def test_concurrent_generation_dedups_images(self, elements, image_pdf):
+        """같은 xref 이미지는 한 번만 요청하고 모든 이미지 요소에 적용"""
+        calls = []
+        
+        async def fake_call(self, image_base64, prompt):
+            calls.append(image_base64)
+            number = len(calls)
+            await asyncio.sleep(0)
+            return f"테스트용 대체 텍스트입니다. 요청 번호 {number}번"
+        
+        image_ids = [f"element_{i}" for i, e in enumerate(elements) if e["type"] == "image"]
+        
+        with patch.object(AltTextGenerator, "_call_vision_api_async", fake_call):
+            alt_texts = TagMatcher().generate_alt_texts(elements, api_key="sk-test", pdf_path=image_pdf)
+        
+        assert len(image_ids) == 3
+        assert len(calls) == 2
+        assert sorted(alt_texts) == sorted(image_ids)
+        assert alt_texts[image_ids[0]] == alt_texts[image_ids[1]]
+        assert alt_texts[image_ids[0]] != alt_texts[image_ids[2]]
+    
+    def test_concurrency_shared_across_documents(self, elements, image_pdf):
+        """동시에 실행한 여러 문서의 요청을 합쳐 alt_text.concurrency개까지만 동시에 보냄"""
+        in_flight = [0]
+        peak = [0]
+        
+        async def fake_call(self, image_base64, prompt):
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+            await asyncio.sleep(0.01)
+            in_flight[0] -= 1
+            return "동시 실행 제한 테스트용 대체 텍스트입니다."
+        
+        tag_matcher = TagMatcher({"alt_text": {"concurrency": 1}})
+        
+        async def run():
+            return await asyncio.gather(*(
+                tag_matcher.generate_alt_texts_async(elements, api_key="sk-test", pdf_path=image_pdf)
+                for _ in range(3)
+            ))
+        
+        with patch.object(AltTextGenerator, "_call_vision_api_async", fake_call):
+            results = asyncio.run(run())
+            # 동기 래퍼로 다시 호출해도 (새 이벤트 루프) 동작
+            assert len(tag_matcher.generate_alt_texts(elements, api_key="sk-test", pdf_path=image_pdf)) == 3
+        
+        assert peak[0] == 1
+        assert all(len(alt_texts) == 3 for alt_texts in results)
+    
+    def test_requests_start_before_all_images_hashed(self, tmp_path):
+        """이미지 해시가 나오는 대로 요청을 시작 (모든 이미지 추출을 기다리지 않음)"""
+        import time
+        import fitz
+        
+        pdf_path = str(tmp_path / "many.pdf")
+        doc = fitz.open()
+        page = doc.new_page()
+        for i in range(4):
+            pixmap = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 16 + i, 16), False)
+            pixmap.clear_with(40 * i)
+            page.insert_image(fitz.Rect(72, 100 + 150 * i, 172, 200 + 150 * i), stream=pixmap.tobytes("png"))
+        doc.save(pdf_path)
+        doc.close()
+        
+        with PDFParser(pdf_path) as parser:
+            elements = parser.parse(workers=1)["elements"]
+        events = []
+        get_image_sha256 = AltTextGenerator.get_image_sha256
+        
+        def slow_sha256(self, image_element, pdf_path=None):
+            time.sleep(0.05)
+            events.append("hash")
+            return get_image_sha256(self, image_element, pdf_path)
+        
+        async def fake_call(self, image_base64, prompt):
+            events.append("call")
+            return "요청 시작 시점 테스트용 대체 텍스트입니다."
+        
+        with patch.object(AltTextGenerator, "get_image_sha256", slow_sha256), \
+                patch.object(AltTextGenerator, "_call_vision_api_async", fake_call):
+            alt_texts = TagMatcher().generate_alt_texts(elements, api_key="sk-test", pdf_path=pdf_path)
+        
+        assert len(alt_texts) == 4
+        assert events.count("call") == 4
+        assert events.index("call") < len(events) - 1 - events[::-1].index("hash")
+    
+    def test_same_content_different_xref_requested_once(self, tmp_path):
+        """xref가 달라도 이미지 내용이 같으면 한 번만 요청"""
+        import fitz
+        
+        pixmap = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 20, 20), False)
+        pixmap.clear_with(120)
+        png = pixmap.tobytes("png")
+        first_path = str(tmp_path / "first.pdf")
+        pdf_path = str(tmp_path / "duplicated.pdf")
+        
+        doc = fitz.open()
+        doc.new_page().insert_image(fitz.Rect(72, 100, 172, 200), stream=png)
+        doc.save(first_path)
+        doc.close()
+        
+        # 다시 열어 삽입하면 같은 이미지가 다른 xref로 한 번 더 저장됨
+        doc = fitz.open(first_path)
+        doc.new_page().insert_image(fitz.Rect(72, 100, 172, 200), stream=png)
+        doc.save(pdf_path)
+        doc.close()
+        
+        with PDFParser(pdf_path) as parser:
+            elements = parser.parse(workers=1)["elements"]
+        images = [e for e in elements if e["type"] == "image"]
+        assert len({image["xref"] for image in images}) == 2
+        calls = []
+        
+        async def fake_call(self, image_base64, prompt):
+            calls.append(image_base64)
+            return "중복 이미지 테스트용 대체 텍스트입니다."
+        
+        with patch.object(AltTextGenerator, "_call_vision_api_async", fake_call):
+            alt_texts = TagMatcher().generate_alt_texts(elements, api_key="sk-test", pdf_path=pdf_path)
+        
+        assert len(calls) == 1
+        assert len(alt_texts) == 2
+    
+    def test_disk_cache_skips_api_on_rerun(self, elements, image_pdf, tmp_path):
+        """기본 temperature에서도 두 번째 실행은 디스크 캐시로 API를 호출하지 않음"""
+        calls = []
+        
+        async def fake_call(self, image_base64, prompt):
+            calls.append(image_base64)
+            return "디스크 캐시 테스트용 대체 텍스트입니다."
+        
+        config = {"alt_text": {"cache_path": str(tmp_path / "cache" / "alt.sqlite")}}
+        
+        with patch.object(AltTextGenerator, "_call_vision_api_async", fake_call):
+            first = TagMatcher(config).generate_alt_texts(elements, api_key="sk-test", pdf_path=image_pdf)
+            second = TagMatcher(config).generate_alt_texts(elements, api_key="sk-test", pdf_path=image_pdf)
+        
+        assert len(calls) == 2
+        assert first == second
+    
+    def test_caption_below_image_skips_api(self, tmp_path):
+        """이미지 바로 아래에 캡션이 있으면 Vision API 대신 캡션 사용"""
+        import fitz
+        
+        pdf_path = str(tmp_path / "caption.pdf")
+        doc = fitz.open()
+        page = doc.new_page()
+        for i, top in enumerate([100, 300]):
+            pixmap = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 16 + i, 16), False)
+            pixmap.clear_with(100)
+            page.insert_image(fitz.Rect(72, top, 172, top + 100), stream=pixmap.tobytes("png"))
+        page.insert_text((72, 220), "Figure 1: Quarterly revenue by region", fontsize=11)
+        page.insert_text((72, 420), "Revenue grew in every region", fontsize=11)
+        doc.save(pdf_path)
+        doc.close()
+        
+        with PDFParser(pdf_path) as parser:
+            elements = parser.parse(workers=1)["elements"]
+        image_ids = [f"element_{i}" for i, e in enumerate(elements) if e["type"] == "image"]
+        calls = []
+        
+        async def fake_call(self, image_base64, prompt):
+            calls.append(image_base64)
+            return "Vision API로 생성한 대체 텍스트입니다."
+        
+        with patch.object(AltTextGenerator, "_call_vision_api_async", fake_call):
+            alt_texts = TagMatcher().generate_alt_texts(elements, api_key="sk-test", pdf_path=pdf_path)
+        
+        assert len(calls) == 1
+        assert alt_texts == {
+            image_ids[0]: "Figure 1: Quarterly revenue by region",
+            image_ids[1]: "Vision API로 생성한 대체 텍스트입니다."
+        }
+    
+    def test_unrelated_caption_not_used(self, tmp_path):
+        """멀리 아래의 표 캡션이나 다른 단의 그림 캡션은 이미지 캡션으로 쓰지 않음"""
+        import fitz
+        
+        pdf_path = str(tmp_path / "caption.pdf")
+        doc = fitz.open()
+        page = doc.new_page()
+        pixmap = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 16, 16), False)
+        pixmap.clear_with(100)
+        page.insert_image(fitz.Rect(72, 100, 172, 200), stream=pixmap.tobytes("png"))
+        page.insert_text((320, 220), "Figure 2: Revenue chart in the next column", fontsize=11)
+        page.insert_text((72, 420), "표 1: 지역별 분기 매출 비교 결과 요약", fontsize=11, fontname="korea")
+        doc.save(pdf_path)
+        doc.close()
+        
+        with PDFParser(pdf_path) as parser:
+            elements = parser.parse(workers=1)["elements"]
+        calls = []
+        
+        async def fake_call(self, image_base64, prompt):
+            calls.append(image_base64)
+            return "Vision API로 생성한 대체 텍스트입니다."
+        
+        with patch.object(AltTextGenerator, "_call_vision_api_async", fake_call):
+            alt_texts = TagMatcher().generate_alt_texts(elements, api_key="sk-test", pdf_path=pdf_path)
+        
+        assert len(calls) == 1
+        assert list(alt_texts.values()) == ["Vision API로 생성한 대체 텍스트입니다."]
+        
+        image = {"type": "image", "page": 0, "bbox": [72, 100, 172, 200]}
+        table_below = AltTextGenerator.build_context_index([
+            {"type": "text", "page": 0, "bbox": [72, 205, 300, 220], "content": "표 1: 지역별 분기 매출 비교 결과 요약"}
+        ])
+        figure_far_below = AltTextGenerator.build_context_index([
+            {"type": "text", "page": 0, "bbox": [72, 400, 300, 415], "content": "그림 1: 지역별 분기 매출 비교 결과 요약"}
+        ])
+        assert AltTextGenerator.find_caption(image, table_below) is None
+        assert AltTextGenerator.find_caption(image, figure_far_below) is None
+
+
+class TestAltTextCache:
+    """AltTextCache 테스트"""
+    
+    def test_key_depends_on_model_lang_and_temperature(self, tmp_path):
+        """모델/언어/temperature가 다르면 다른 키"""
+        key = AltTextCache.make_key("abc", "gpt-4o", "ko-KR", 0)
+        assert key == AltTextCache.make_key("abc", "gpt-4o", "ko-KR", 0.0)
+        assert key != AltTextCache.make_key("abc", "gpt-4o-mini", "ko-KR", 0)
+        assert key != AltTextCache.make_key("abc", "gpt-4o", "en-US", 0)
+        assert key != AltTextCache.make_key("abc", "gpt-4o", "ko-KR", 0.3)
+        
+        cache = AltTextCache(str(tmp_path / "alt.sqlite"))
+        assert cache.get(key) is None
+        cache.set(key, "대체 텍스트")
+        assert cache.get(key) == "대체 텍스트"
+        cache.close()
+    
+    def test_separate_keys_per_temperature(self, tmp_path):
+        """temperature > 0에서도 캐시를 쓰되, temperature가 다르면 다른 키"""
+        cache = AltTextCache(str(tmp_path / "alt.sqlite"))
+        warm = AltTextGenerator(api_key="sk-test", temperature=0.3, cache=cache)
+        greedy = AltTextGenerator(api_key="sk-test", temperature=0, cache=cache)
+        
+        assert warm.cache is cache
+        assert warm._cache_key("abc") != greedy._cache_key("abc")
+        cache.close()
+
+
+class TestImageExtraction:
+    """AltTextGenerator 이미지 추출 테스트"""
+    
+    def test_document_opened_once(self, elements, image_pdf):
+        """여러 이미지를 추출해도 PDF는 한 번만 열림"""
+        import fitz
+        
+        generator = AltTextGenerator(api_key="sk-test")
+        images = [dict(e) for e in elements if e["type"] == "image"]
+        
+        with patch("fitz.open", wraps=fitz.open) as mock_open:
+            results = [generator._extract_image_base64(image, image_pdf) for image in images]
+        generator.close()
+        
+        assert mock_open.call_count == 1
+        assert all(url.startswith("data:image/png;base64,") for url, _ in results)
+        assert results[0][1] == results[1][1] != results[2][1]
+    
+    def test_sha256_hashes_raw_bytes_only(self, elements, image_pdf):
+        """중복 제거용 해시는 축소/인코딩 없이 원본 바이트로만 계산하고 해시만 보관"""
+        generator = AltTextGenerator(api_key="sk-test", max_edge=40)
+        logo, _, photo = [dict(e) for e in elements if e["type"] == "image"]
+        
+        with patch.object(AltTextGenerator, "_downscale_image") as mock_downscale, \
+                patch("src.tagger.alt_text_generator.base64.b64encode") as mock_encode:
+            hashes = [generator.get_image_sha256(image, image_pdf) for image in (logo, photo)]
+        
+        mock_downscale.assert_not_called()
+        mock_encode.assert_not_called()
+        assert all(isinstance(value, str) for doc_hashes in generator._image_hashes.values() for value in doc_hashes.values())
+        assert [generator._extract_image_base64(image, image_pdf)[1] for image in (logo, photo)] == hashes
+        generator.close()
+    
+    def test_async_extraction_off_event_loop(self, elements, image_pdf):
+        """비동기 생성 시 이미지 추출은 이벤트 루프 밖의 작업 스레드 하나에서 실행"""
+        import threading
+        
+        extract_image_bytes = AltTextGenerator._extract_image_bytes
+        threads = set()
+        
+        def spy_extract_image_bytes(self, doc, xref):
+            threads.add(threading.get_ident())
+            return extract_image_bytes(self, doc, xref)
+        
+        async def fake_call(self, image_base64, prompt):
+            return "작업 스레드 테스트용 대체 텍스트입니다."
+        
+        with patch.object(AltTextGenerator, "_extract_image_bytes", spy_extract_image_bytes), \
+                patch.object(AltTextGenerator, "_call_vision_api_async", fake_call):
+            alt_texts = TagMatcher().generate_alt_texts(elements, api_key="sk-test", pdf_path=image_pdf)
+        
+        assert len(alt_texts) == 3
+        assert len(threads) == 1 and threading.get_ident() not in threads
+    
+    def test_open_documents_bounded(self, image_pdf, tmp_path, monkeypatch):
+        """열어 둔 문서 수가 한도를 넘으면 가장 오래 쓰지 않은 문서를 닫음"""
+        import shutil
+        
+        monkeypatch.setattr("src.tagger.alt_text_generator.MAX_OPEN_DOCS", 2)
+        paths = [shutil.copy(image_pdf, tmp_path / f"copy{i}.pdf") for i in range(3)]
+        paths = [str(path) for path in paths]
+        generator = AltTextGenerator(api_key="sk-test")
+        
+        first = generator._get_document(paths[0])
+        generator._get_document(paths[1])
+        generator._get_document(paths[0])
+        generator._get_document(paths[2])
+        
+        assert list(generator._docs) == [paths[0], paths[2]]
+        assert generator._get_document(paths[0]) is first and not first.is_closed
+        generator.close()
+        assert first.is_closed
+    
+    def test_downscale_large_images(self, elements, image_pdf):
+        """긴 변이 max_edge를 넘는 이미지만 축소하여 JPEG로 전송"""
+        import base64
+        import io
+        from PIL import Image
+        
+        generator = AltTextGenerator(api_key="sk-test", max_edge=40)
+        logo, _, photo = [dict(e) for e in elements if e["type"] == "image"]
+        
+        logo_url, _ = generator._extract_image_base64(logo, image_pdf)
+        photo_url, _ = generator._extract_image_base64(photo, image_pdf)
+        generator.close()
+        
+        assert logo_url.startswith("data:image/png;base64,")
+        assert photo_url.startswith("data:image/jpeg;base64,")
+        photo_bytes = base64.b64decode(photo_url.split(",", 1)[1])
+        assert Image.open(io.BytesIO(photo_bytes)).size == (40, 20)
+
+
+class TestAsyncRateLimiter:
+    """AsyncRateLimiter 토큰 버킷 테스트"""
+    
+    def test_waits_for_refill(self, monkeypatch):
+        """버킷이 비면 부족한 양이 채워질 때까지 대기"""
+        clock = [0.0]
+        waits = []
+        
+        async def fake_sleep(seconds):
+            waits.append(seconds)
+            clock[0] += seconds
+        
+        monkeypatch.setattr("src.tagger.alt_text_generator.time.monotonic", lambda: clock[0])
+        monkeypatch.setattr("src.tagger.alt_text_generator.asyncio.sleep", fake_sleep)
+        
+        async def run():
+            limiter = AsyncRateLimiter(max_requests_per_minute=2, max_tokens_per_minute=6000)
+            await limiter.acquire(5000)
+            await limiter.acquire(1000)
+            await limiter.acquire(600)
+        
+        asyncio.run(run())
+        
+        # 세 번째 요청: 요청 1건(30초) vs 토큰 600개(6초) 중 긴 쪽만큼 대기
+        assert waits == [pytest.approx(30.0)]
+
+
+    def test_shared_across_concurrent_calls(self, elements, image_pdf, monkeypatch):
+        """동시에 실행한 generate_alt_texts_async 호출이 TagMatcher의 버킷 하나를 함께 사용"""
+        clock = [0.0]
+        waits = []
+        limiters = set()
+        
+        async def fake_sleep(seconds):
+            waits.append(seconds)
+            clock[0] += seconds
+        
+        async def fake_call(self, image_base64, prompt):
+            limiters.add(id(self.rate_limiter))
+            await self.rate_limiter.acquire()
+            return "속도 제한 공유 테스트용 대체 텍스트입니다."
+        
+        monkeypatch.setattr("src.tagger.alt_text_generator.time.monotonic", lambda: clock[0])
+        monkeypatch.setattr("src.tagger.alt_text_generator.asyncio.sleep", fake_sleep)
+        tag_matcher = TagMatcher({"alt_text": {"rpm": 2}})
+        
+        async def run():
+            return await asyncio.gather(*(
+                tag_matcher.generate_alt_texts_async(elements, api_key="sk-test", pdf_path=image_pdf)
+                for _ in range(2)
+            ))
+        
+        with patch.object(AltTextGenerator, "_call_vision_api_async", fake_call):
+            results = asyncio.run(run())
+        
+        # 문서당 서로 다른 이미지 2개, 두 문서 합쳐 4건: 분당 2건이므로 뒤의 2건은 30초씩 대기
+        assert limiters == {id(tag_matcher.alt_text_rate_limiter)}
+        assert sum(waits) == pytest.approx(60.0)
+        assert all(len(alt_texts) == 3 for alt_texts in results)
+    
+    def test_reused_across_event_loops(self, monkeypatch):
+        """동기 래퍼처럼 asyncio.run을 여러 번 호출해도 같은 리미터의 버킷을 이어서 사용"""
+        clock = [0.0]
+        original_sleep = asyncio.sleep
+        
+        async def fake_sleep(seconds):
+            clock[0] += seconds
+            await original_sleep(0)
+        
+        monkeypatch.setattr("src.tagger.alt_text_generator.time.monotonic", lambda: clock[0])
+        monkeypatch.setattr("src.tagger.alt_text_generator.asyncio.sleep", fake_sleep)
+        limiter = AsyncRateLimiter(max_requests_per_minute=1)
+        
+        async def run():
+            # 한 요청이 잠금을 잡고 대기하는 동안 나머지는 잠금을 기다림
+            await asyncio.gather(limiter.acquire(), limiter.acquire(), limiter.acquire())
+        
+        asyncio.run(run())
+        asyncio.run(run())
+        
+        # 첫 요청만 즉시, 나머지 5건은 60초씩 (두 번째 실행도 이어진 버킷 사용)
+        assert clock[0] == pytest.approx(300.0)
+
+
+class TestBatchAltText:
+    """AltTextGenerator.generate_alt_text_batch 테스트"""
+    
+    @pytest.fixture
+    def images(self, elements):
+        """서로 다른 두 이미지 요소"""
+        logo, _, photo = [dict(e) for e in elements if e["type"] == "image"]
+        return [logo, photo]
+    
+    def test_single_request_for_batch(self, images, elements, image_pdf):
+        """이미지 여러 개를 한 요청으로 보내고 JSON 배열 응답을 순서대로 반환"""
+        calls = []
+        
+        async def fake_call(self, image_base64, prompt):
+            calls.append(image_base64)
+            return '```json\n["첫 번째 이미지의 대체 텍스트입니다.", "두 번째 이미지의 대체 텍스트입니다."]\n```'
+        
+        generator = AltTextGenerator(api_key="sk-test")
+        with patch.object(AltTextGenerator, "_call_vision_api_async", fake_call):
+            results = asyncio.run(generator.generate_alt_text_batch(images, elements, image_pdf))
+        generator.close()
+        
+        assert len(calls) == 1 and len(calls[0]) == 2
+        assert results == ["첫 번째 이미지의 대체 텍스트입니다.", "두 번째 이미지의 대체 텍스트입니다."]
+    
+    def test_fallback_to_single_requests(self, images, elements, image_pdf):
+        """응답 형식이 맞지 않으면 이미지별 요청으로 전환"""
+        calls = []
+        
+        in_flight = [0]
+        peak = [0]
+        
+        async def fake_call(self, image_base64, prompt):
+            calls.append(image_base64)
+            if isinstance(image_base64, list):
+                return "JSON이 아닌 응답"
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+            await asyncio.sleep(0.01)
+            in_flight[0] -= 1
+            return "이미지별 요청으로 생성한 대체 텍스트입니다."
+        
+        generator = AltTextGenerator(api_key="sk-test")
+        with patch.object(AltTextGenerator, "_call_vision_api_async", fake_call):
+            results = asyncio.run(generator.generate_alt_text_batch(images, elements, image_pdf))
+        generator.close()
+        
+        assert len(calls) == 3
+        assert peak[0] == 1  # 호출한 쪽의 동시 실행 슬롯 하나 안에서 순서대로
+        assert results == ["이미지별 요청으로 생성한 대체 텍스트입니다."] * 2
+    
+    def test_no_fallback_when_rate_limited(self, images, elements, image_pdf):
+        """일괄 요청이 속도 제한으로 실패하면 이미지별 요청 없이 기본값 사용"""
+        from types import SimpleNamespace
+        from openai import RateLimitError
+        
+        calls = []
+        
+        async def fake_call(self, image_base64, prompt):
+            calls.append(image_base64)
+            response = SimpleNamespace(status_code=429, headers={}, request=None)
+            raise RateLimitError("rate limited", response=response, body=None)
+        
+        generator = AltTextGenerator(api_key="sk-test")
+        with patch.object(AltTextGenerator, "_call_vision_api_async", fake_call):
+            results = asyncio.run(generator.generate_alt_text_batch(images, elements, image_pdf))
+        generator.close()
+        
+        assert len(calls) == 1
+        assert results == [generator._generate_default_alt_text(image, elements) for image in images]
+
+
+class TestRuleBasedMatching:
+    """규칙 기반 매칭 테스트"""
+    
+    def test_bulk_matches_per_element(self):
+        """일괄 매칭 결과가 요소별 매칭과 동일"""
+        elements = [
+            {"type": "text", "content": "문서 제목", "bbox": [0, 50, 100, 80], "font_info": {"size": 24, "flags": 16}},
+            {"type": "text", "content": "소제목", "bbox": [0, 300, 100, 320], "font_info": {"size": 16, "flags": 16}},
+            {"type": "text", "content": "작은 소제목", "bbox": [0, 400, 100, 420], "font_info": {"size": 14, "flags": 20}},
+            {"type": "text", "content": "이것은 다섯 단어 이상의 본문 문장입니다", "font_info": {"size": 11, "flags": 0}},
+            {"type": "text", "content": "짧은 본문", "font_info": {"size": 11}},
+            {"type": "text", "content": "기타", "font_info": {}},
+            {"type": "image", "bbox": [0, 0, 10, 10]},
+            {"type": "table", "data": [["a", "b"], ["c", "d"]]},
+            {"type": "table", "data": [["a"]]},
+        ]
+        suggested = ["H1", "H1", "H2", "H3", "H2", "L", "Figure", "P", "Table"]
+        matcher = TagMatcher({})
+        
+        expected = [matcher._rule_based_matching(e, s) for e, s in zip(elements, suggested)]
+        assert matcher._rule_based_matching_bulk(elements, suggested) == expected
+        assert matcher._rule_based_matching_bulk(elements * 40, suggested * 40) == expected * 40
+
+
+class TestCollectContext:
+    """주변 문맥 수집 테스트"""
+    
+    def test_context_index_matches_scan(self):
+        """미리 만든 색인과 전체 스캔 결과가 동일"""
+        context = [
+            {"type": "text", "page": 0, "content": f"문단 {i}", "bbox": [0, y, 100, y + 10]}
+            for i, y in enumerate([300, 50, 120, 200, 400, 500, 250])
+        ]
+        context.append({"type": "text", "page": 1, "content": "다른 페이지", "bbox": [0, 10, 100, 20]})
+        image = {"type": "image", "page": 0, "bbox": [0, 220, 100, 240]}
+        generator = AltTextGenerator(api_key="sk-test")
+        
+        index = generator.build_context_index(context)
+        
+        assert index[0][0] == [50, 120, 200, 250, 300, 400, 500]
+        assert generator._collect_context(context, image, index) == "문단 1\n문단 2\n문단 3\n문단 6"
+        assert generator._collect_context(context, image) == generator._collect_context(context, image, index)
+
+
+class TestPrompt:
+    """Vision 요청 프롬프트 테스트"""
+    
+    def test_rules_sent_once_as_system_message(self):
+        """작성 규칙은 system 메시지에만 포함"""
+        generator = AltTextGenerator(api_key="sk-test")
+        prompt = generator._create_alt_text_prompt("보고서", "ko-KR", "주변 문맥")
+        request = generator._build_request("data:image/png;base64,", prompt)
+        
+        system, user = request["messages"]
+        assert system["content"] == ALT_TEXT_RULES
+        assert ALT_TEXT_RULES not in user["content"][0]["text"]
+        assert "주변 문맥" in user["content"][0]["text"]
+
+
+class TestStreamingResponse:
+    """Vision API 스트리밍 응답 테스트"""
+    
+    @staticmethod
+    def make_chunks(texts):
+        from types import SimpleNamespace
+        
+        return [
+            SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+            for text in texts
+        ]
+    
+    def test_stops_after_enough_text(self):
+        """필요한 길이를 받으면 나머지 청크를 읽지 않고 스트림을 닫음"""
+        chunks = self.make_chunks(["가" * 100, None, "나" * 100, "다" * 100, "라" * 100])
+        state = {"read": 0, "closed": False}
+        
+        class FakeStream:
+            def __aiter__(self):
+                return self
+            
+            async def __anext__(self):
+                if state["read"] == len(chunks):
+                    raise StopAsyncIteration
+                state["read"] += 1
+                return chunks[state["read"] - 1]
+            
+            async def close(self):
+                state["closed"] = True
+        
+        async def fake_create(**kwargs):
+            assert kwargs["stream"] is True
+            return FakeStream()
+        
+        generator = AltTextGenerator(api_key="sk-test")
+        with patch.object(generator.aclient.chat.completions, "create", fake_create):
+            alt_text = asyncio.run(generator._call_vision_api_async("data:image/png;base64,", "prompt"))
+        
+        assert alt_text == "가" * 100 + "나" * 100 + "다" * 100
+        assert state == {"read": 4, "closed": True}
+        assert generator._postprocess_alt_text(alt_text) == "가" * 100 + "나" * 97 + "..."
+    
+    def test_retries_rate_limit_with_retry_after(self, monkeypatch):
+        """속도 제한 오류는 Retry-After 이상 기다린 뒤 다시 요청"""
+        from types import SimpleNamespace
+        from openai import RateLimitError
+        
+        waits = []
+        attempts = []
+        chunks = self.make_chunks(["재시도 후 생성한 대체 텍스트입니다."])
+        
+        class FakeStream:
+            def __init__(self):
+                self.chunks = iter(chunks)
+            
+            def __aiter__(self):
+                return self
+            
+            async def __anext__(self):
+                try:
+                    return next(self.chunks)
+                except StopIteration:
+                    raise StopAsyncIteration
+            
+            async def close(self):
+                pass
+        
+        async def fake_create(**kwargs):
+            attempts.append(kwargs)
+            if len(attempts) == 1:
+                response = SimpleNamespace(status_code=429, headers={"retry-after": "2"}, request=None)
+                raise RateLimitError("rate limited", response=response, body=None)
+            return FakeStream()
+        
+        async def fake_sleep(seconds):
+            waits.append(seconds)
+        
+        monkeypatch.setattr("src.tagger.alt_text_generator.asyncio.sleep", fake_sleep)
+        generator = AltTextGenerator(api_key="sk-test")
+        with patch.object(generator.aclient.chat.completions, "create", fake_create):
+            alt_text = asyncio.run(generator._call_vision_api_async("data:image/png;base64,", "prompt"))
+        
+        assert alt_text == "재시도 후 생성한 대체 텍스트입니다."
+        assert len(attempts) == 2
+        assert waits == [2.0]
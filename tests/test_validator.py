@@ -0,0 +1,403 @@
+"""
+접근성 검증기 테스트
+"""
+
+import pytest
+
+from src.validator.accessibility_validator import AccessibilityValidator
+
+
+@pytest.fixture
+def tagged_pdf(tmp_path):
+    """제목/언어 메타데이터, StructTreeRoot, MarkInfo를 가진 샘플 PDF"""
+    from pypdf import PdfWriter
+    from pypdf.generic import BooleanObject, DictionaryObject, NameObject
+    import fitz
+    
+    text_path = tmp_path / "text.pdf"
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), "Accessible document body text", fontsize=11)
+    doc.save(str(text_path))
+    doc.close()
+    
+    pdf_path = tmp_path / "tagged.pdf"
+    writer = PdfWriter(clone_from=str(text_path))
+    writer.add_metadata({"/Title": "접근성 보고서", "/Lang": "ko-KR"})
+    writer._root_object[NameObject("/MarkInfo")] = DictionaryObject({
+        NameObject("/Marked"): BooleanObject(True)
+    })
+    writer._root_object[NameObject("/StructTreeRoot")] = writer._add_object(DictionaryObject({
+        NameObject("/Type"): NameObject("/StructTreeRoot")
+    }))
+    writer.write(str(pdf_path))
+    return str(pdf_path)
+
+
+@pytest.fixture
+def untagged_pdf(tmp_path):
+    """메타데이터와 구조 트리가 없는 샘플 PDF"""
+    import fitz
+    
+    pdf_path = tmp_path / "untagged.pdf"
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), "Plain document body text", fontsize=11)
+    doc.save(str(pdf_path))
+    doc.close()
+    return str(pdf_path)
+
+
+class TestValidate:
+    """AccessibilityValidator.validate 테스트"""
+    
+    @pytest.mark.parametrize("backend", ["pymupdf", "pypdf"])
+    def test_tagged_pdf(self, tagged_pdf, backend):
+        """태그된 PDF는 모든 기본 검사 통과"""
+        result = AccessibilityValidator({"backend": backend}).validate(tagged_pdf)
+        
+        assert result["passed"]
+        assert result["score"] == 100.0
+        assert result["warnings"] == [] and result["issues"] == []
+        assert all(result["wcag_compliance"].values())
+        assert result["page_count"] == 1
+    
+    @pytest.mark.parametrize("backend", ["pymupdf", "pypdf"])
+    def test_untagged_pdf(self, untagged_pdf, backend):
+        """메타데이터와 구조 트리가 없으면 감점"""
+        result = AccessibilityValidator({"backend": backend}).validate(untagged_pdf)
+        
+        assert not result["passed"]
+        assert result["score"] == 55.0
+        assert result["issues"] == ["제목 메타데이터 없음"]
+        assert result["warnings"] == ["언어 메타데이터 없음", "구조 트리(StructTreeRoot) 없음", "Marked PDF 플래그 없음"]
+    
+    @pytest.mark.parametrize("backend", ["pymupdf", "pypdf"])
+    @pytest.mark.parametrize("cache_by", ["content", "stat"])
+    def test_mmap_matches_in_memory(self, tagged_pdf, untagged_pdf, backend, cache_by):
+        """mmap으로 읽어도 메모리로 읽은 결과와 같음"""
+        for pdf_path in (tagged_pdf, untagged_pdf):
+            expected = AccessibilityValidator({"backend": backend}).validate(pdf_path)
+            mapped = AccessibilityValidator({
+                "backend": backend, "cache_size": 32, "cache_by": cache_by, "mmap_threshold": 1
+            }).validate(pdf_path)
+            
+            assert mapped == expected
+    
+    @pytest.mark.parametrize("content", [b"", b"PK\x03\x04 not a pdf"])
+    def test_non_pdf_rejected(self, tmp_path, content):
+        """빈 파일이나 PDF가 아닌 파일은 파싱 없이 거부"""
+        path = tmp_path / "input.pdf"
+        path.write_bytes(content)
+        
+        result = AccessibilityValidator().validate(str(path))
+        
+        assert not result["passed"]
+        assert result["score"] == 0.0
+        assert result["issues"] == ["PDF 파일이 아님 (빈 파일이거나 %PDF- 헤더 없음)"]
+    
+    def test_header_after_leading_bytes(self, tagged_pdf, tmp_path):
+        """헤더 앞에 다른 바이트가 있어도 PDF로 검증"""
+        path = tmp_path / "prefixed.pdf"
+        path.write_bytes(b"\x00" * 16 + open(tagged_pdf, "rb").read())
+        
+        assert AccessibilityValidator().validate(str(path))["passed"]
+    
+    def test_pypdf_page_count_without_page_tree(self, tagged_pdf):
+        """pypdf 백엔드는 텍스트 검사 없이 페이지 트리를 펼치지 않음"""
+        from src.validator.accessibility_validator import _PyPDFDocument
+        
+        doc = _PyPDFDocument(tagged_pdf)
+        
+        assert doc.page_count == 1
+        assert doc.reader.flattened_pages is None
+    
+    def test_unknown_backend(self):
+        """지원하지 않는 백엔드는 거부"""
+        with pytest.raises(ValueError):
+            AccessibilityValidator({"backend": "pdfminer"})
+    
+    @pytest.mark.parametrize("backend", ["pymupdf", "pypdf"])
+    @pytest.mark.parametrize("text, selectable", [
+        ("Accessible document body text", True),
+        ("Fig. 1", False),
+    ])
+    def test_text_selectable_threshold(self, tmp_path, backend, text, selectable):
+        """공백을 제외한 첫 페이지 문자가 10자를 넘어야 텍스트 선택 가능"""
+        import fitz
+        
+        pdf_path = tmp_path / "text.pdf"
+        doc = fitz.open()
+        doc.new_page().insert_text((72, 72), text, fontsize=11)
+        doc.save(str(pdf_path))
+        doc.close()
+        
+        result = AccessibilityValidator({"backend": backend}).validate(str(pdf_path), checks=["text"])
+        
+        assert result["wcag_compliance"]["text_selectable"] is selectable
+
+
+class TestChecksSelection:
+    """검사 선택 테스트"""
+    
+    def test_metadata_only(self, untagged_pdf):
+        """메타데이터만 검사하면 다른 항목은 감점/보고하지 않음"""
+        result = AccessibilityValidator().validate_metadata_only(untagged_pdf)
+        
+        assert result["score"] == 80.0
+        assert result["issues"] == ["제목 메타데이터 없음"]
+        assert result["warnings"] == ["언어 메타데이터 없음"]
+        assert result["wcag_compliance"] == {"title_metadata": False, "language_metadata": False}
+    
+    def test_score_skips_external_tool(self, tagged_pdf):
+        """AI 친화성 점수 계산은 외부 검증 도구를 실행하지 않음"""
+        from unittest.mock import patch
+        
+        validator = AccessibilityValidator({"external_tool": "verapdf"})
+        with patch("src.validator.accessibility_validator.subprocess.run") as mock_run:
+            score = validator.calculate_ai_friendliness_score(tagged_pdf)
+        
+        assert score == 100.0
+        mock_run.assert_not_called()
+    
+    def test_score_reuses_validation_result(self, tagged_pdf, untagged_pdf):
+        """validate() 결과를 넘기면 파일을 다시 열지 않고 같은 점수 계산"""
+        from unittest.mock import patch
+        
+        for pdf_path in (tagged_pdf, untagged_pdf):
+            validator = AccessibilityValidator({"cache_size": 0})
+            expected = validator.calculate_ai_friendliness_score(pdf_path)
+            validation_result = validator.validate(pdf_path)
+            
+            with patch.object(validator, "_open") as mock_open:
+                assert validator.calculate_ai_friendliness_score(pdf_path, validation_result) == expected
+            mock_open.assert_not_called()
+    
+    @pytest.mark.parametrize("backend", ["pymupdf", "pypdf"])
+    def test_score_reuses_zero_page_result(self, tmp_path, backend):
+        """페이지가 없는 PDF도 validate() 결과 재사용 여부와 관계없이 같은 점수"""
+        from pypdf import PdfWriter
+        
+        pdf_path = tmp_path / "empty.pdf"
+        writer = PdfWriter()
+        writer.add_metadata({"/Title": "빈 문서"})
+        writer.write(str(pdf_path))
+        
+        validator = AccessibilityValidator({"backend": backend, "cache_size": 0})
+        expected = validator.calculate_ai_friendliness_score(str(pdf_path))
+        validation_result = validator.validate(str(pdf_path))
+        
+        assert validation_result["page_count"] == 0
+        assert validator.calculate_ai_friendliness_score(str(pdf_path), validation_result) == expected
+    
+    def test_unknown_check(self, tagged_pdf):
+        """지원하지 않는 검사 이름은 거부"""
+        with pytest.raises(ValueError):
+            AccessibilityValidator().validate(tagged_pdf, checks={"metadata", "fonts"})
+
+
+class TestResultCache:
+    """검증 결과 캐시 테스트"""
+    
+    def test_same_content_reuses_result(self, tagged_pdf, tmp_path):
+        """내용이 같은 파일은 경로가 달라도 다시 검증하지 않음"""
+        import shutil
+        from unittest.mock import patch
+        
+        copy_path = str(shutil.copy(tagged_pdf, tmp_path / "copy.pdf"))
+        validator = AccessibilityValidator({"cache_size": 32, "cache_by": "content"})
+        
+        with patch.object(AccessibilityValidator, "_open", wraps=validator._open) as mock_open:
+            first = validator.validate(tagged_pdf)
+            first["issues"].append("호출자가 수정한 항목")
+            second = validator.validate(copy_path)
+            validator.validate(tagged_pdf, checks={"metadata"})
+        
+        assert mock_open.call_count == 2
+        assert second["issues"] == []
+    
+    def test_stat_key_detects_changes(self, tagged_pdf, untagged_pdf, tmp_path):
+        """stat 키 방식은 파일이 바뀌면 다시 검증"""
+        import os
+        import shutil
+        
+        path = str(tmp_path / "changing.pdf")
+        shutil.copy(tagged_pdf, path)
+        validator = AccessibilityValidator({"cache_size": 32, "cache_by": "stat"})
+        
+        assert validator.validate(path)["score"] == 100.0
+        shutil.copy(untagged_pdf, path)
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert validator.validate(path)["score"] == 55.0
+    
+    def test_disabled_by_default(self, tagged_pdf):
+        """기본값은 캐시하지 않으며 파일 내용을 해시하려고 미리 읽지 않음"""
+        from unittest.mock import patch
+        
+        validator = AccessibilityValidator()
+        with patch.object(validator, "_read_pdf") as mock_read:
+            validator.validate(tagged_pdf)
+        
+        mock_read.assert_not_called()
+        assert len(validator._results) == 0
+
+
+class TestValidateBatch:
+    """AccessibilityValidator.validate_batch 테스트"""
+    
+    def test_results_in_input_order(self, tagged_pdf, untagged_pdf, tmp_path):
+        """프로세스 풀 결과가 입력 순서와 일치하고 실패한 파일은 오류 결과"""
+        paths = [untagged_pdf, str(tmp_path / "missing.pdf"), tagged_pdf]
+        
+        results = AccessibilityValidator().validate_batch(paths, workers=2)
+        
+        assert [r["score"] for r in results] == [55.0, 0.0, 100.0]
+        assert results[1]["issues"][0].startswith("검증 오류")
+    
+    def test_empty(self):
+        """빈 목록은 빈 결과"""
+        assert AccessibilityValidator().validate_batch([]) == []
+
+
+class TestVeraPDF:
+    """veraPDF 연동 테스트"""
+    
+    def test_batch_mode_runs_once(self, tagged_pdf, untagged_pdf):
+        """batch 모드는 모든 파일을 한 번의 veraPDF 실행으로 검증"""
+        import json
+        import subprocess
+        from unittest.mock import patch
+        
+        report = {"report": {"jobs": [
+            {"itemDetails": {"name": tagged_pdf}, "validationResult": {"details": []}},
+            {"itemDetails": {"name": untagged_pdf}, "validationResult": {"details": [{"rule": "7.1"}, {"rule": "7.2"}]}}
+        ]}}
+        completed = subprocess.CompletedProcess([], 0, stdout=json.dumps(report).encode("utf-8"))
+        validator = AccessibilityValidator({"external_tool": "verapdf", "verapdf_mode": "batch"})
+        
+        with patch("src.validator.accessibility_validator.subprocess.run", return_value=completed) as mock_run:
+            results = validator.validate_batch([tagged_pdf, untagged_pdf], workers=1)
+        
+        mock_run.assert_called_once()
+        assert mock_run.call_args[0][0][-2:] == [tagged_pdf, untagged_pdf]
+        assert results[0]["warnings"] == []
+        assert results[1]["warnings"][-1] == "veraPDF 위반 항목 2개"
+    
+    def test_batch_mode_splits_long_command(self, tagged_pdf, untagged_pdf, monkeypatch):
+        """경로 길이 합이 명령줄 제한을 넘으면 나누어 실행하고 제한 시간은 파일 수만큼"""
+        import json
+        import subprocess
+        from unittest.mock import patch
+        from src.validator import accessibility_validator
+        
+        monkeypatch.setattr(accessibility_validator, "VERAPDF_MAX_COMMAND_LENGTH", len(tagged_pdf) + len(untagged_pdf) + 2)
+        
+        def fake_run(command, **kwargs):
+            jobs = [{"itemDetails": {"name": name}, "validationResult": {"details": [{"rule": "7.1"}]}} for name in command[5:]]
+            return subprocess.CompletedProcess(command, 0, stdout=json.dumps({"report": {"jobs": jobs}}).encode("utf-8"))
+        
+        validator = AccessibilityValidator({"external_tool": "verapdf", "verapdf_mode": "batch", "verapdf_timeout": 5})
+        pdf_paths = [tagged_pdf, untagged_pdf, tagged_pdf]
+        
+        with patch("src.validator.accessibility_validator.subprocess.run", side_effect=fake_run) as mock_run:
+            results = validator.validate_batch(pdf_paths, workers=1)
+        
+        assert [call[0][0][5:] for call in mock_run.call_args_list] == [[tagged_pdf, untagged_pdf], [tagged_pdf]]
+        assert [call[1]["timeout"] for call in mock_run.call_args_list] == [10, 5]
+        assert all(result["warnings"][-1] == "veraPDF 위반 항목 1개" for result in results)
+    
+    def test_cli_overlaps_local_checks(self, tagged_pdf):
+        """veraPDF 실행 중에 로컬 검사를 진행"""
+        import json
+        import subprocess
+        import threading
+        from unittest.mock import patch
+        
+        verapdf_started = threading.Event()
+        validator = AccessibilityValidator({"external_tool": "verapdf"})
+        check_structure_tree = validator._check_structure_tree
+        
+        def fake_check_structure_tree(doc):
+            # 로컬 검사를 모두 마친 뒤에 veraPDF를 실행하면 여기서 시간 초과
+            assert verapdf_started.wait(timeout=5)
+            return check_structure_tree(doc)
+        
+        def fake_run(command, **kwargs):
+            verapdf_started.set()
+            report = {"validationResult": {"details": [{"rule": "7.1"}]}}
+            return subprocess.CompletedProcess(command, 0, stdout=json.dumps(report).encode("utf-8"))
+        
+        with patch.object(validator, "_check_structure_tree", side_effect=fake_check_structure_tree), \
+                patch("src.validator.accessibility_validator.subprocess.run", side_effect=fake_run):
+            result = validator.validate(tagged_pdf)
+        
+        assert result["warnings"] == ["veraPDF 위반 항목 1개"]
+    
+    def test_rest_mode(self, tagged_pdf):
+        """rest 모드는 실행 중인 veraPDF 서버에 파일을 전송"""
+        import json
+        import threading
+        from http.server import BaseHTTPRequestHandler, HTTPServer
+        
+        received = []
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                received.append(self.rfile.read(int(self.headers["Content-Length"])))
+                body = json.dumps({"report": {"jobs": [{"validationResult": [{"details": [{"rule": "7.1"}]}]}]}})
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.end_headers()
+                self.wfile.write(body.encode("utf-8"))
+            
+            def log_message(self, *args):
+                pass
+        
+        server = HTTPServer(("127.0.0.1", 0), Handler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            validator = AccessibilityValidator({
+                "external_tool": "verapdf",
+                "verapdf_mode": "rest",
+                "verapdf_url": f"http://127.0.0.1:{server.server_port}/api/validate/auto"
+            })
+            result = validator.validate(tagged_pdf)
+        finally:
+            server.shutdown()
+            server.server_close()
+        
+        assert len(received) == 1 and b"%PDF" in received[0]
+        assert result["warnings"] == ["veraPDF 위반 항목 1개"]
+    
+    @pytest.mark.parametrize("has_orjson", [True, False])
+    def test_cli_report_parsing(self, tagged_pdf, monkeypatch, has_orjson):
+        """CLI 결과는 실패 검사 출력 수를 제한해 요청하고, 형식 오류는 이슈로 보고"""
+        import subprocess
+        from unittest.mock import patch
+        
+        if has_orjson:
+            pytest.importorskip("orjson")
+        monkeypatch.setattr("src.validator.accessibility_validator.HAS_ORJSON", has_orjson)
+        validator = AccessibilityValidator({"external_tool": "verapdf"})
+        
+        completed = subprocess.CompletedProcess([], 0, stdout=b'{"validationResult": {"details": [1, 2, 3]}}')
+        with patch("src.validator.accessibility_validator.subprocess.run", return_value=completed) as mock_run:
+            assert validator._run_external_validator(tagged_pdf) == {"issues": ["veraPDF 위반 항목 3개"]}
+        assert "--maxfailuresdisplayed" in mock_run.call_args[0][0]
+        
+        completed = subprocess.CompletedProcess([], 0, stdout=b"not json")
+        with patch("src.validator.accessibility_validator.subprocess.run", return_value=completed):
+            assert validator._run_external_validator(tagged_pdf) == {"issues": ["veraPDF 결과 파싱 실패"]}
+    
+    def test_cli_timeout(self, tagged_pdf):
+        """제한 시간을 넘기면 이슈로 보고"""
+        import subprocess
+        from unittest.mock import patch
+        
+        validator = AccessibilityValidator({"external_tool": "verapdf", "verapdf_timeout": 5})
+        with patch(
+            "src.validator.accessibility_validator.subprocess.run",
+            side_effect=subprocess.TimeoutExpired("verapdf", 5)
+        ) as mock_run:
+            assert validator._run_external_validator(tagged_pdf) == {"issues": ["veraPDF 시간 초과 (5초)"]}
+        assert mock_run.call_args[1]["timeout"] == 5